@@ -18,8 +18,7 @@ class TrackerProjectsListView(
     serializer_class = ProjectGenericSerializer
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_projects()
         return super(TrackerProjectsListView, self).get_queryset()
 
@@ -27,7 +27,7 @@ class DocumentSerializer(
         fields = '__all__'
 
     def get_size(self, obj):
-        return obj.document.size
+        return obj.file_size
 
     def get_extension(self, obj):
         return obj.get_file_extension()[1:]
@@ -97,8 +97,7 @@ class DocumentAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         self.view = self.get_view
@@ -133,8 +132,7 @@ class DocumentEditSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         self.view = self.get_view
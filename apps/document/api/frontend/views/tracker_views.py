@@ -21,8 +21,7 @@ class TrackerDocumentMixin(
     """
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             document = profile.get_document(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, document)
             return document
@@ -189,8 +188,7 @@ class TrackerDocumentDeleteView(
         super(TrackerDocumentDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_document(instance)
 
 
@@ -213,8 +211,7 @@ class TrackerProjectDocumentDeleteView(
         super(TrackerProjectDocumentDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_document(instance)
 
 
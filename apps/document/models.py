@@ -12,7 +12,7 @@ from django.utils.text import slugify
 from django.utils.translation import ugettext_lazy as _
 
 from apps.media.models import Folder
-from web.core.models import UserModel, DateModel, StatusModel, OrderedModel, CleanModel
+from web.core.models import UserModel, DateModel, StatusModel, OrderedModel, CleanModel, FileMetadataModel
 from web.api.views import get_media_root
 
 from django.core.files.storage import FileSystemStorage
@@ -44,7 +44,9 @@ def document_limit_choices_to():
 
 
 @python_2_unicode_compatible
-class Document(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
+class Document(FileMetadataModel, CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
+    metadata_file_field = 'document'
+
     content_type = models.ForeignKey(
         ContentType,
         on_delete=models.CASCADE,
@@ -9,9 +9,9 @@ from django.contrib.contenttypes.models import ContentType
 from django.conf import settings
 
 from . import models as document_models
-from apps.notify import models as notify_models
+from apps.notify.utils import create_notify_event
 from web.core.middleware.thread_local import get_current_profile
-from web.core.utils import get_html_message, get_bell_notification_status, get_email_notification_status
+from web.core.utils import get_html_message
 
 
 def document_notification(sender, instance):
@@ -62,32 +62,10 @@ def document_notification(sender, instance):
         body = get_html_message(content, final_content, endpoint)
         type = ContentType.objects.get(model=instance.content_type.name.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
+        create_notify_event(
             sender=profile, subject=subject, body=body,
             content_type=type, object_id=instance.object_id,
-            creator=profile.user, last_modifier=profile.user
-        )
-
-        recipient_objs = []
-
-        for staff in company_staff:
-            bell_status = get_bell_notification_status(
-                staff, instance.content_type.name
-            )
-            email_status = get_email_notification_status(
-                staff, instance.content_type.name
-            )
-
-            if bell_status or email_status:
-                recipient_objs.append(notify_models.NotificationRecipient(
-                    notification=notify_obj, is_email=email_status,
-                    is_notify=bell_status, recipient=staff,
-                    creator=profile.user, last_modifier=profile.user)
-                )
-
-        notify_models.NotificationRecipient.objects.bulk_create(
-            recipient_objs,
-            batch_size=100
+            recipients=company_staff, event=instance.content_type.name
         )
     except Exception as e:
         print(e)
@@ -20,14 +20,43 @@ from apps.quotation import models as quotation_models
 from web.drf import exceptions as django_api_exception
 from web.api.views import JWTPayloadMixin, ArrayFieldInMultipartMixin, get_media_root
 from web.api.serializers import DynamicFieldsModelSerializer
+from web.core.media_urls import get_media_url_builder
 from django.utils.text import slugify
 from apps.document.api.frontend.serializers import DocumentSerializer
 
 
+class PhotoRenditionMixin(object):
+    """
+    Rendition urls of the photos. photo_64 inlines the whole original
+    image and it's only serialized for the legacy clients asking for it
+    with the photo_64 query param.
+    """
+
+    def get_rendition_field_names(self, field_names):
+        request = self.context.get('request')
+        if request is not None and 'renditions' in field_names and 'photo_64' not in field_names \
+                and request.query_params.get('photo_64'):
+            return list(field_names) + ['photo_64']
+        return field_names
+
+    def get_renditions(self, obj):
+        builder = get_media_url_builder(self.context.get('request'))
+        return {rendition: builder.build(url) for rendition, url in obj.get_rendition_urls().items()}
+
+    def get_photo_64(self, obj):
+        f = open(obj.photo.path, 'rb')
+        image = File(f)
+        data = base64.b64encode(image.read())
+        f.close()
+        return data
+
+
 class PhotoSerializer(
+    PhotoRenditionMixin,
     DynamicFieldsModelSerializer):
     extension = serializers.SerializerMethodField()
     photo_64 = serializers.SerializerMethodField()
+    renditions = serializers.SerializerMethodField()
     photo = serializers.SerializerMethodField()
     size = serializers.SerializerMethodField()
     relative_path = serializers.SerializerMethodField()
@@ -72,40 +101,25 @@ class PhotoSerializer(
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
         if view:
-            return view.photo_response_include_fields
+            return self.get_rendition_field_names(view.photo_response_include_fields)
         return super(PhotoSerializer, self).get_field_names(*args, **kwargs)
 
-    def get_photo_64(self, obj):
-        f = open(obj.photo.path, 'rb')
-        image = File(f)
-        data = base64.b64encode(image.read())
-        f.close()
-        return data
-
     def get_photo(self, obj):
-        try:
-            photo_url = obj.photo.url
-            protocol = self.context['request'].is_secure()
-            if protocol:
-                protocol = 'https://'
-            else:
-                protocol = 'http://'
-            host = self.context['request'].get_host()
-            media_url = protocol + host + photo_url
-        except:
-            media_url = None
+        media_url = get_media_url_builder(self.context.get('request')).file_url(obj.photo)
 
         return media_url
 
     def get_size(self, obj):
-        return obj.photo.size
+        return obj.file_size
 
 
 class PhotoAddSerializer(
+    PhotoRenditionMixin,
     JWTPayloadMixin,
     ArrayFieldInMultipartMixin,
     DynamicFieldsModelSerializer):
     photo_64 = serializers.SerializerMethodField(read_only=True)
+    renditions = serializers.SerializerMethodField(read_only=True)
     extension = serializers.SerializerMethodField(read_only=True)
     size = serializers.SerializerMethodField(read_only=True)
 
@@ -133,13 +147,12 @@ class PhotoAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         self.view = self.get_view
         if self.view:
-            return self.view.photo_request_include_fields
+            return self.get_rendition_field_names(self.view.photo_request_include_fields)
         return super(PhotoAddSerializer, self).get_field_names(*args, **kwargs)
 
     def create(self, validated_data):
@@ -157,15 +170,8 @@ class PhotoAddSerializer(
                 _("{}".format(err.msg if hasattr(err, 'msg') else err))
             )
 
-    def get_photo_64(self, obj):
-        f = open(obj.photo.path, 'rb')
-        image = File(f)
-        data = base64.b64encode(image.read())
-        f.close()
-        return data
-
     def get_size(self, obj):
-        return obj.photo.size
+        return obj.file_size
 
     def get_extension(self, obj):
         return obj.get_file_extension()[1:]
@@ -188,6 +194,7 @@ def get_upload_folder_path2(instance, subpath, folder, is_public, create=False,
 
 
 class   PhotoMoveSerializer(
+    PhotoRenditionMixin,
     JWTPayloadMixin,
     ArrayFieldInMultipartMixin,
     DynamicFieldsModelSerializer):
@@ -217,37 +224,31 @@ class   PhotoMoveSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         self.view = self.get_view
         if self.view:
-            return self.view.photo_request_include_fields
+            return self.get_rendition_field_names(self.view.photo_request_include_fields)
         return super(PhotoMoveSerializer, self).get_field_names(*args, **kwargs)
 
     def get_to(self, obj):
         return self.request.data['to']
 
-    def get_photo_64(self, obj):
-        f = open(obj.photo.path, 'rb')
-        image = File(f)
-        data = base64.b64encode(image.read())
-        f.close()
-        return data
-
     def get_size(self, obj):
-        return obj.photo.size
+        return obj.file_size
 
     def get_extension(self, obj):
         return obj.get_file_extension()[1:]
 
 
 class PhotoEditSerializer(
+    PhotoRenditionMixin,
     JWTPayloadMixin,
     ArrayFieldInMultipartMixin,
     DynamicFieldsModelSerializer):
     photo_64 = serializers.SerializerMethodField(read_only=True)
+    renditions = serializers.SerializerMethodField(read_only=True)
     extension = serializers.SerializerMethodField(read_only=True)
     size = serializers.SerializerMethodField()
 
@@ -260,13 +261,12 @@ class PhotoEditSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         self.view = self.get_view
         if self.view:
-            return self.view.photo_request_include_fields
+            return self.get_rendition_field_names(self.view.photo_request_include_fields)
         return super(PhotoEditSerializer, self).get_field_names(*args, **kwargs)
 
     def update(self, instance, validated_data):
@@ -275,15 +275,8 @@ class PhotoEditSerializer(
         video = self.profile.edit_photo(validated_data)
         return video
 
-    def get_photo_64(self, obj):
-        f = open(obj.photo.path, 'rb')
-        image = File(f)
-        data = base64.b64encode(image.read())
-        f.close()
-        return data
-
     def get_size(self, obj):
-        return obj.photo.size
+        return obj.file_size
 
     def get_extension(self, obj):
         return obj.get_file_extension()[1:]
@@ -301,7 +294,7 @@ class VideoSerializer(
         fields = '__all__'
 
     def get_size(self, obj):
-        return obj.video.size
+        return obj.file_size
 
     def get_extension(self, obj):
         return obj.get_file_extension()
@@ -372,8 +365,7 @@ class VideoAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         self.view = self.get_view
@@ -415,8 +407,7 @@ class VideoEditSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         self.view = self.get_view
@@ -450,8 +441,7 @@ class FolderSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     full_path = ""
 
@@ -529,8 +519,7 @@ class FolderAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         self.view = self.get_view
@@ -571,8 +560,7 @@ class FolderEditSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         self.view = self.get_view
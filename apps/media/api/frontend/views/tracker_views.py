@@ -36,8 +36,7 @@ class TrackerPhotoMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             photo = profile.get_photo(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, photo)
             return photo
@@ -89,7 +88,7 @@ class TrackerPhotoAddView(
         ]
         self.photo_response_include_fields = [
             'id', 'title', 'pub_date', 'photo', 'is_public',
-            'tags', 'note', 'photo_64', 'extension', 'folder'
+            'tags', 'note', 'renditions', 'extension', 'folder'
         ]
         super(TrackerPhotoAddView, self).__init__(*args, **kwargs)
 
@@ -118,7 +117,7 @@ class TrackerPhotoMoveView(
         ]
         self.photo_response_include_fields = [
             'id', 'title', 'pub_date', 'photo', 'is_public',
-            'tags', 'note', 'photo_64', 'extension', 'folder'
+            'tags', 'note', 'renditions', 'extension', 'folder'
         ]
         super(TrackerPhotoMoveView, self).__init__(*args, **kwargs)
 
@@ -161,7 +160,7 @@ class TrackerVideoMoveView(
         ]
         self.photo_response_include_fields = [
             'id', 'title', 'pub_date', 'photo', 'is_public',
-            'tags', 'note', 'photo_64', 'extension', 'folder'
+            'tags', 'note', 'renditions', 'extension', 'folder'
         ]
         super(TrackerVideoMoveView, self).__init__(*args, **kwargs)
 
@@ -204,7 +203,7 @@ class TrackerDocumentMoveView(
         ]
         self.photo_response_include_fields = [
             'id', 'title', 'pub_date', 'photo', 'is_public',
-            'tags', 'note', 'photo_64', 'extension', 'folder'
+            'tags', 'note', 'renditions', 'extension', 'folder'
         ]
         super(TrackerDocumentMoveView, self).__init__(*args, **kwargs)
 
@@ -247,7 +246,7 @@ class TrackerPhotoEditView(
         ]
         self.photo_response_include_fields = [
             'id', 'title', 'pub_date', 'photo', 'extension',
-            'tags', 'note', 'is_public', 'photo_64', 'extension', 'folder'
+            'tags', 'note', 'is_public', 'renditions', 'extension', 'folder'
         ]
         super(TrackerPhotoEditView, self).__init__(*args, **kwargs)
 
@@ -272,8 +271,7 @@ class TrackerPhotoDeleteView(
         super(TrackerPhotoDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_photo(instance)
 
 
@@ -296,8 +294,7 @@ class TrackerVideoMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             video = profile.get_video(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, video)
             return video
@@ -321,8 +318,7 @@ class TrackerFolderMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             folder = profile.get_folder(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, folder)
             return folder
@@ -428,8 +424,7 @@ class TrackerVideoDeleteView(
         super(TrackerVideoDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_video(instance)
 
 
@@ -658,8 +653,7 @@ class TrackerFolderList(
         super(TrackerFolderList, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         if 'type' in self.kwargs and self.kwargs['type'] != 'company':
             list_method = 'list_{}_folders'.format(self.kwargs['type'])
             project = Project.objects.get(id=self.kwargs['pk'])
@@ -685,7 +679,7 @@ class TrackerFolderDetailView(
         ]
         self.photo_response_include_fields = [
             'id', 'title', 'pub_date', 'photo', 'is_public',
-            'tags', 'note', 'photo_64', 'extension', 'folder'
+            'tags', 'note', 'renditions', 'extension', 'folder'
         ]
         self.video_response_include_fields = [
             'id', 'title', 'pub_date', 'video',
@@ -729,8 +723,7 @@ class TrackerFolderStructureList(
         super(TrackerFolderStructureList, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         if 'type' in self.kwargs and self.kwargs['type'] != 'company':
             list_method = 'list_{}_folders'.format(self.kwargs['type'])
             project = Project.objects.get(id=self.kwargs['pk'])
@@ -872,7 +865,7 @@ class TrackerFolderEditView(
         ]
         self.photo_response_include_fields = [
             'id', 'title', 'pub_date', 'photo', 'is_public',
-            'tags', 'note', 'photo_64', 'extension', 'folder'
+            'tags', 'note', 'renditions', 'extension', 'folder'
         ]
         super(TrackerFolderEditView, self).__init__(*args, **kwargs)
 
@@ -892,6 +885,5 @@ class TrackerFolderDeleteView(
         super(TrackerFolderDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_folder(instance)
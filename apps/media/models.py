@@ -4,7 +4,7 @@ import os
 import pathlib
 
 from django.conf import settings
-from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.fields import ArrayField, JSONField
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.files.storage import FileSystemStorage
@@ -13,7 +13,7 @@ from django.utils.encoding import python_2_unicode_compatible
 from django.utils.text import slugify
 from django.utils.translation import ugettext_lazy as _
 
-from web.core.models import UserModel, DateModel, StatusModel, OrderedModel, CleanModel
+from web.core.models import UserModel, DateModel, StatusModel, OrderedModel, CleanModel, FileMetadataModel
 from web.api.views import get_media_root
 
 photo_fs = FileSystemStorage(location=settings.BASE_DIR, base_url="/")
@@ -107,7 +107,9 @@ class Folder(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
         get_latest_by = "date_create"
 
 @python_2_unicode_compatible
-class Photo(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
+class Photo(FileMetadataModel, CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
+    metadata_file_field = 'photo'
+
     content_type = models.ForeignKey(
         ContentType,
         on_delete=models.CASCADE,
@@ -133,6 +135,10 @@ class Photo(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
         upload_to=get_upload_photo_path,
         verbose_name=_('image')
     )
+    renditions = JSONField(
+        default=dict, blank=True, editable=False,
+        verbose_name=_('renditions'),
+    )
     is_public = models.BooleanField(
         default=False,
         verbose_name=_('is public')
@@ -164,6 +170,10 @@ class Photo(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
         )
         ordering = ['-date_last_modify']
         get_latest_by = "date_create"
+        indexes = [
+            # KeysetPagination
+            models.Index(fields=['date_create', 'id'], name='photo_date_id_idx'),
+        ]
 
     def __str__(self):
         return '{} {}: {}'.format(
@@ -176,9 +186,17 @@ class Photo(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
         name, extension = os.path.splitext(self.photo.name)
         return extension
 
+    def get_rendition_urls(self):
+        return {
+            rendition: self.photo.storage.url(name)
+            for rendition, name in (self.renditions or {}).items()
+        }
+
 
 @python_2_unicode_compatible
-class Video(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
+class Video(FileMetadataModel, CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
+    metadata_file_field = 'video'
+
     content_type = models.ForeignKey(
         ContentType,
         on_delete=models.CASCADE,
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import logging
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from . import models as media_models
+
+logger = logging.getLogger('exceptions')
+
+RENDITION_EXTENSIONS = {
+    'WEBP': 'webp',
+    'JPEG': 'jpg',
+}
+
+
+def get_rendition_name(photo_name, rendition):
+    """
+    Storage name of a rendition, in the renditions folder of the photo
+    """
+    folder, filename = os.path.split(photo_name)
+    return os.path.join(
+        folder, settings.MEDIA_PHOTO_RENDITION_DIR, '{}_{}.{}'.format(
+            os.path.splitext(filename)[0], rendition,
+            RENDITION_EXTENSIONS[settings.MEDIA_PHOTO_RENDITION_FORMAT]
+        )
+    )
+
+
+def render_image(image, size):
+    image = image.copy()
+    image.thumbnail(size, Image.LANCZOS)
+    if settings.MEDIA_PHOTO_RENDITION_FORMAT == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA')
+    content = BytesIO()
+    image.save(
+        content, format=settings.MEDIA_PHOTO_RENDITION_FORMAT,
+        quality=settings.MEDIA_PHOTO_RENDITION_QUALITY
+    )
+    return ContentFile(content.getvalue())
+
+
+def delete_photo_renditions(photo):
+    storage = photo.photo.storage
+    for name in (photo.renditions or {}).values():
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.error('photo {} rendition {}: {}'.format(photo.id, name, e))
+
+
+def create_photo_renditions(photo):
+    """
+    Generate the MEDIA_PHOTO_RENDITIONS of the photo, replacing the
+    previous ones, and store their names on the photo
+    :return: the renditions {name: storage name}
+    """
+    storage = photo.photo.storage
+    delete_photo_renditions(photo)
+    renditions = {}
+    try:
+        with storage.open(photo.photo.name, 'rb') as file:
+            image = ImageOps.exif_transpose(Image.open(file))
+            for rendition, size in settings.MEDIA_PHOTO_RENDITIONS.items():
+                name = get_rendition_name(photo.photo.name, rendition)
+                renditions[rendition] = storage.save(name, render_image(image, size))
+    except Exception as e:
+        logger.error('photo {} renditions: {}'.format(photo.id, e))
+    media_models.Photo.objects.filter(id=photo.id).update(renditions=renditions)
+    photo.renditions = renditions
+    return renditions
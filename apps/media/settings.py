@@ -11,3 +11,18 @@ MEDIA_VIDEO_CONTENT_TYPE_LIMIT_CHOICES_TO = [
     {'app_label': 'profile', 'model': 'company'},
     {'app_label': 'quotation', 'model': 'bom'},
 ]
+
+# renditions generated by the worker on photo upload, name: (max width, max height)
+MEDIA_PHOTO_RENDITIONS = {
+    'thumbnail': (128, 128),
+    'small': (480, 480),
+    'large': (1280, 1280),
+}
+
+# WEBP or JPEG
+MEDIA_PHOTO_RENDITION_FORMAT = 'WEBP'
+
+MEDIA_PHOTO_RENDITION_QUALITY = 80
+
+# folder of the renditions, next to the original photo
+MEDIA_PHOTO_RENDITION_DIR = 'renditions'
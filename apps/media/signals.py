@@ -3,15 +3,18 @@
 import os
 
 from django.utils.translation import ugettext_lazy as _
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.contenttypes.models import ContentType
 from django.conf import settings
 
 from . import models as media_models
-from apps.notify import models as notify_models
+from .renditions import delete_photo_renditions
+from .tasks import generate_photo_renditions
+from apps.notify.utils import create_notify_event
 from web.core.middleware.thread_local import get_current_profile
-from web.core.utils import get_html_message, get_bell_notification_status, get_email_notification_status
+from web.core.utils import get_html_message
 
 
 @receiver([post_save, post_delete], sender=media_models.Photo)
@@ -64,32 +67,21 @@ def media_notification(sender, instance, **kwargs):
         body = get_html_message(content, final_content, endpoint)
         type = ContentType.objects.get(model=instance.content_type.name.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
+        create_notify_event(
             sender=profile, subject=subject, body=body,
             content_type=type, object_id=instance.object_id,
-            creator=profile.user, last_modifier=profile.user
+            recipients=company_staff, event=instance.content_type.name
         )
+    except Exception as e:
+        print(e)
 
-        recipient_objs = []
 
-        for staff in company_staff:
-            bell_status = get_bell_notification_status(
-                staff, instance.content_type.name
-            )
-            email_status = get_email_notification_status(
-                staff, instance.content_type.name
-            )
+@receiver(post_save, sender=media_models.Photo)
+def photo_renditions_save(sender, instance, **kwargs):
+    if getattr(instance, '_metadata_file_changed', False) and instance.photo:
+        transaction.on_commit(lambda: generate_photo_renditions.delay(instance.id))
 
-            if bell_status or email_status:
-                recipient_objs.append(notify_models.NotificationRecipient(
-                    notification=notify_obj, is_email=email_status,
-                    is_notify=bell_status, recipient=staff,
-                    creator=profile.user, last_modifier=profile.user)
-                )
 
-        notify_models.NotificationRecipient.objects.bulk_create(
-            recipient_objs,
-            batch_size=100
-        )
-    except Exception as e:
-        print(e)
+@receiver(post_delete, sender=media_models.Photo)
+def photo_renditions_delete(sender, instance, **kwargs):
+    delete_photo_renditions(instance)
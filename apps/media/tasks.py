@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from celery import task
+
+from . import models as media_models
+from .renditions import create_photo_renditions
+
+
+@task()
+def generate_photo_renditions(photo_id):
+    photo = media_models.Photo.objects.filter(id=photo_id).first()
+    if photo is not None and photo.photo:
+        create_photo_renditions(photo)
@@ -16,8 +16,8 @@ from apps.profile.api.frontend import serializers as profile_serializers
 from web.drf import exceptions as django_api_exception
 from web.api.views import JWTPayloadMixin
 from web.api.serializers import DynamicFieldsModelSerializer
-from ...models import MessageFileAssignment, MessageProfileAssignment
-from ...signals import get_filetype
+from web.core.media_urls import get_media_url_builder
+from ...models import MessageFileAssignment
 
 
 class MessageFileAssignmentSerializer(DynamicFieldsModelSerializer):
@@ -45,8 +45,7 @@ class TalkSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
 
     def get_field_names(self, *args, **kwargs):
@@ -59,14 +58,12 @@ class TalkSerializer(
         view = self.get_view
         if view:
             self.request = view.request
-            payload = view.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = view.get_profile()
             # if obj.content_type.name == 'project':
             #     project_id = obj.object_id
             # else:
             #     company_id = obj.object_id
-            counter = MessageProfileAssignment.objects.filter(profile=self.profile, read=False, message__talk=obj).count()
-            return counter
+            return self.profile.get_unread_messages_count(obj)
         return 0
 
 class MessageSerializer(
@@ -83,10 +80,11 @@ class MessageSerializer(
 
     def get_read(self, obj):
         mpa_list = []
-        mpa = MessageProfileAssignment.objects.filter(message=obj)
+        # prefetched by the message lists
+        mpa = obj.messageprofileassignment_set.all()
         for mp in mpa:
             mpa_list.append({
-                'profile': mp.profile.id,
+                'profile': mp.profile_id,
                 'read': mp.read
             })
         return mpa_list
@@ -94,29 +92,19 @@ class MessageSerializer(
     def get_files(self, obj):
         media_list = []
         request = self.context['request']
-        medias = MessageFileAssignment.objects.filter(message=obj)
+        medias = obj.messagefileassignment_set.all()
         for media in medias:
-            try:
-                photo_url = media.media.url
-                protocol = request.is_secure()
-                if protocol:
-                    protocol = 'https://'
-                else:
-                    protocol = 'http://'
-                host = request.get_host()
-                media_url = protocol + host + photo_url
-            except:
-                media_url = None
+            media_url = get_media_url_builder(request).file_url(media.media)
             name, extension = os.path.splitext(media.media.name)
             if extension == '.mp3':
                 type = 'audio/mp3'
             else:
-                type = get_filetype(media.media)
+                type = media.file_mime_type or None
             media_list.append(
                 {
                     "id": media.id,
                     "media_url": media_url,
-                    "size": media.media.size,
+                    "size": media.file_size,
                     "name": name.split('/')[-1],
                     "extension": extension,
                     "type": type,
@@ -181,24 +169,14 @@ class MessageAddSerializer(
 
     def get_media_set(self, obj):
         media_list = []
-        medias = MessageFileAssignment.objects.filter(message=obj)
+        medias = obj.messagefileassignment_set.all()
         for media in medias:
-            try:
-                photo_url = media.media.url
-                protocol = self.context['request'].is_secure()
-                if protocol:
-                    protocol = 'https://'
-                else:
-                    protocol = 'http://'
-                host = self.context['request'].get_host()
-                media_url = protocol + host + photo_url
-            except:
-                media_url = None
+            media_url = get_media_url_builder(self.context.get('request')).file_url(media.media)
             name, extension = os.path.splitext(media.media.name)
             media_list.append(
                 {
                     "media_url": media_url,
-                    "size": media.media.size,
+                    "size": media.file_size,
                     "name": name.split('/')[-1],
                     "extension": extension,
                     "message": media.message.id,
@@ -227,8 +205,7 @@ class MessageAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         self.view = self.get_view
@@ -9,6 +9,8 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 
 from web.api.permissions import RoleAccessPermission
+from web.api.filters import coerce_boolean
+from web.api.pagination import KeysetPagination
 from web.api.views import QuerysetMixin, JWTPayloadMixin, WhistleGenericViewMixin
 from .. import serializers
 from web.drf import exceptions as django_api_exception
@@ -21,8 +23,7 @@ class TrackerMessageMixin(
     """
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             document = profile.get_message(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, document)
             return document
@@ -46,6 +47,7 @@ class TrackerMessageListView(
     Get all messages
     """
     serializer_class = serializers.MessageSerializer
+    cursor_pagination_class = KeysetPagination
 
     def __init__(self, *args, **kwargs):
         self.message_response_include_fields = [
@@ -63,9 +65,17 @@ class TrackerMessageListView(
         super(TrackerMessageListView, self).__init__( *args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
-        self.queryset = profile.list_received_messages()
+        profile = self.get_profile()
+        read = self.request.query_params.get('read')
+        try:
+            read = coerce_boolean(read) if read else None
+        except ValueError:
+            raise django_api_exception.FilterAPINotAllowed(
+                status.HTTP_400_BAD_REQUEST, self.request, _('Invalid value for read')
+            )
+        self.queryset = profile.list_received_messages(read=read).select_related(
+            'talk__content_type', 'sender__company'
+        ).prefetch_related('messagefileassignment_set', 'messageprofileassignment_set')
         return super(TrackerMessageListView, self).get_queryset()
 
 
@@ -165,8 +175,7 @@ class TrackerMessageDeleteView(
         super(TrackerMessageDeleteView, self).__init__( *args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_message(instance)
 
 
@@ -177,8 +186,7 @@ class TrackerTalkMixin(
     """
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             document = profile.get_talk(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, document)
             return document
@@ -209,8 +217,7 @@ class TrackerTalkListView(
         super(TrackerTalkListView, self).__init__( *args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_all_talks()
         return super(TrackerTalkListView, self).get_queryset()
 
@@ -239,8 +246,7 @@ class TrackerTalkReadAllView(
         super(TrackerTalkReadAllView, self).__init__( *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         talk = self.get_object()
         talk.read_all(profile)
         return Response(status=status.HTTP_200_OK, data="Successfully read")
@@ -260,6 +266,5 @@ class TrackerTalkDeleteView(
         super(TrackerTalkDeleteView, self).__init__( *args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_talk(instance)
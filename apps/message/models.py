@@ -7,11 +7,13 @@ from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models import F
 from django.utils.crypto import get_random_string
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 
-from web.core.models import UserModel, DateModel, StatusModel, OrderedModel, CleanModel
+from web.core.models import UserModel, DateModel, StatusModel, OrderedModel, CleanModel, FileMetadataModel
+from web.functions import subquery_count, subquery_sum
 
 def get_upload_message_file_path(instance, filename):
     talk = instance.message.talk.id
@@ -54,6 +56,10 @@ class Talk(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
         )
         ordering = ['date_create']
         get_latest_by = "date_create"
+        indexes = [
+            # OwnerProfile.get_talks_filter
+            models.Index(fields=['content_type', 'object_id'], name='talk_object_idx'),
+        ]
 
     def __str__(self):
         return '{}: {}: {}'.format(self.code, self.content_type, self.object_id)
@@ -73,7 +79,19 @@ class Talk(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
         return self.content_type.model
 
     def read_all(self, profile):
-        MessageProfileAssignment.objects.filter(profile=profile, read=False).update(read=True)
+        """
+        Mark the unread messages of the talk as read for the profile
+        with a single UPDATE and send one websocket event
+        :return: number of messages read
+        """
+        from .signals import send_talk_read_all
+
+        count = MessageProfileAssignment.objects.filter(
+            profile=profile, read=False, message__talk=self
+        ).update(read=True)
+        if count:
+            send_talk_read_all(self, profile.id, count)
+        return count
 
 
 @python_2_unicode_compatible
@@ -109,6 +127,12 @@ class Message(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
         )
         ordering = ['date_create']
         get_latest_by = "date_create"
+        indexes = [
+            # KeysetPagination
+            models.Index(fields=['date_create', 'id'], name='message_date_id_idx'),
+            # OwnerProfile.list_received_messages
+            models.Index(fields=['talk', 'date_create'], name='message_talk_date_idx'),
+        ]
 
     def __str__(self):
         return '{} - {}: {}'.format(self.body, self.talk, self.sender)
@@ -117,8 +141,76 @@ class Message(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
     def get_messages(cls):
         return cls.objects.all()
 
+
+@python_2_unicode_compatible
+class MessageCounter(models.Model):
+    """
+    Messages of the talks of a company, project or profile, kept by the
+    Message signals when MESSAGE_COUNTER_CACHE is on
+    """
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        verbose_name=_('content type'),
+    )
+    object_id = models.PositiveIntegerField()
+    messages_count = models.IntegerField(default=0, verbose_name=_('messages'))
+
+    class Meta:
+        verbose_name = _('message counter')
+        verbose_name_plural = _('message counters')
+        unique_together = (
+            ('content_type', 'object_id',),
+        )
+
+    def __str__(self):
+        return '{}: {}: {}'.format(self.content_type, self.object_id, self.messages_count)
+
+    @classmethod
+    def count_messages(cls, content_type_id, object_id):
+        return Message.objects.filter(
+            talk__content_type_id=content_type_id, talk__object_id=object_id
+        ).count()
+
+    @classmethod
+    def add_messages(cls, content_type_id, object_id, count):
+        # a new counter starts from the messages saved so far
+        counter, created = cls.objects.get_or_create(
+            content_type_id=content_type_id, object_id=object_id,
+            defaults={'messages_count': lambda: cls.count_messages(content_type_id, object_id)}
+        )
+        if not created:
+            cls.objects.filter(pk=counter.pk).update(messages_count=F('messages_count') + count)
+
+    @classmethod
+    def get_messages_count(cls, obj):
+        """
+        Messages of the talks of the company, project or profile
+        """
+        content_type = ContentType.objects.get_for_model(obj)
+        if settings.MESSAGE_COUNTER_CACHE:
+            count = cls.objects.filter(
+                content_type=content_type, object_id=obj.pk
+            ).values_list('messages_count', flat=True).first()
+            if count is not None:
+                return count
+        return cls.count_messages(content_type.id, obj.pk)
+
+    @classmethod
+    def get_messages_count_annotation(cls, model):
+        """
+        Expression of the messages of the talks of the outer company,
+        project or profile rows, see with_counts
+        """
+        content_type = ContentType.objects.get_for_model(model)
+        if settings.MESSAGE_COUNTER_CACHE:
+            return subquery_sum(cls.objects.filter(content_type=content_type), 'object_id', 'messages_count')
+        return subquery_count(Message.objects.filter(talk__content_type=content_type), 'talk__object_id')
+
 @python_2_unicode_compatible
-class MessageFileAssignment(OrderedModel):
+class MessageFileAssignment(FileMetadataModel, OrderedModel):
+    metadata_file_field = 'media'
+
     media = models.FileField(blank=True, default="", upload_to=get_upload_message_file_path)
     message = models.ForeignKey(Message, on_delete=models.CASCADE)
 
@@ -134,4 +226,8 @@ class MessageProfileAssignment(OrderedModel):
 
     class Meta:
         verbose_name = _('message profile assignment')
-        verbose_name_plural = _('message profile assignments')
\ No newline at end of file
+        verbose_name_plural = _('message profile assignments')
+        indexes = [
+            # read state and unread counts of the profile
+            models.Index(fields=['profile', 'read'], name='message_profile_read_idx'),
+        ]
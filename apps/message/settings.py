@@ -5,3 +5,7 @@ MESSAGE_TALK_CONTENT_TYPE_LIMIT_CHOICES_TO = [
     {'app_label': 'profile', 'model': 'company'},
     {'app_label': 'profile', 'model': 'profile'},
 ]
+
+# messages of the companies, projects and profiles read from MessageCounter,
+# kept by the Message signals; run rebuild_message_counters when turning it on
+MESSAGE_COUNTER_CACHE = False
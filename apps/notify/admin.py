@@ -56,3 +56,72 @@ class NotifyAdmin(UserAdminMixin, admin.ModelAdmin):
 
 
 admin.site.register(models.Notify, NotifyAdmin)
+
+
+class NotifyEventAdmin(admin.ModelAdmin):
+    list_display = (
+        'sender', 'subject', 'event',
+        'content_type', 'object_id', 'date_create', 'date_processed', 'attempts'
+    )
+    list_filter = ('event',)
+    readonly_fields = ('date_create', 'date_last_modify', 'date_processed', 'attempts', 'error',)
+    raw_id_fields = ('sender',)
+
+
+admin.site.register(models.NotifyEvent, NotifyEventAdmin)
+
+
+class PushRetryAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient', 'subject', 'attempts',
+        'date_next_attempt', 'error',
+    )
+    readonly_fields = ('date_create', 'date_last_modify',)
+    raw_id_fields = ('recipient',)
+
+
+admin.site.register(models.PushRetry, PushRetryAdmin)
+
+
+class PushCounterAdmin(admin.ModelAdmin):
+    list_display = (
+        'date', 'sent', 'failed', 'retried',
+        'dropped', 'batches',
+    )
+
+
+admin.site.register(models.PushCounter, PushCounterAdmin)
+
+
+class PushDeviceAdmin(admin.ModelAdmin):
+    list_display = (
+        'profile', 'platform', 'is_active',
+        'date_create', 'date_last_modify',
+    )
+    list_filter = ('platform', 'is_active',)
+    search_fields = ('token',)
+    readonly_fields = ('date_create', 'date_last_modify',)
+    raw_id_fields = ('profile',)
+
+
+admin.site.register(models.PushDevice, PushDeviceAdmin)
+
+
+class NotificationCounterAdmin(admin.ModelAdmin):
+    list_display = ('profile', 'event', 'new', 'read', 'trash',)
+    list_filter = ('event',)
+    raw_id_fields = ('profile',)
+
+
+admin.site.register(models.NotificationCounter, NotificationCounterAdmin)
+
+
+class NotificationRecipientArchiveAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient_id', 'subject', 'is_notify', 'reading_date',
+        'status', 'date_create', 'date_archive',
+    )
+    search_fields = ('recipient_id', 'subject',)
+
+
+admin.site.register(models.NotificationRecipientArchive, NotificationRecipientArchiveAdmin)
@@ -97,8 +97,7 @@ class NotificationRecipientReadSerializer(
         if context:
             request = kwargs['context']['request']
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -123,8 +122,7 @@ class NotificationRecipientReadAllSerializer(
         if context:
             request = kwargs['context']['request']
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -133,7 +131,39 @@ class NotificationRecipientReadAllSerializer(
         return super(NotificationRecipientReadAllSerializer, self).get_field_names(*args, **kwargs)
 
     def post(self, validated_data):
-        notification_recipients = self.profile.list_notification_receipient_new()
-        for instance in notification_recipients:
-            notification_recipient = self.profile.edit_notification_receipient(instance)
+        self.profile.read_all_notification_receipient()
         return {}
+
+
+class PushDeviceSerializer(
+        DynamicFieldsModelSerializer,
+        JWTPayloadMixin):
+    class Meta:
+        model = models.PushDevice
+        fields = '__all__'
+        # the token is re-assigned to the current profile if already registered
+        extra_kwargs = {'token': {'validators': []}}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        context = kwargs.get('context', None)
+        if context:
+            self.request = kwargs['context']['request']
+            self.profile = self.get_profile()
+
+    def get_field_names(self, *args, **kwargs):
+        view = self.get_view
+        if view:
+            return view.push_device_request_include_fields
+        return super(PushDeviceSerializer, self).get_field_names(*args, **kwargs)
+
+    def create(self, validated_data):
+        push_device, created = models.PushDevice.objects.update_or_create(
+            token=validated_data['token'],
+            defaults={
+                'profile': self.profile,
+                'platform': validated_data.get('platform', ''),
+                'is_active': True,
+            }
+        )
+        return push_device
@@ -39,6 +39,11 @@ tracker_urlpatterns = [
         tracker_views.TrackerNotificationRecipientReadAllView.as_view(),
         name='tracker_notification_recipient_read'
     ),
+    url(
+        r'^notification/device/register/$',
+        tracker_views.TrackerPushDeviceRegisterView.as_view(),
+        name='tracker_push_device_register'
+    ),
 ]
 
 urlpatterns = user_urlpatterns + generic_urlpatterns + tracker_urlpatterns
@@ -8,22 +8,35 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 
 from web.api.views import JWTPayloadMixin, WhistleGenericViewMixin
+from web.api.filters import QuerySchema
+from web.api.pagination import KeysetPagination
 from web.api.permissions import RoleAccessPermission
 from web.api.views import QuerysetMixin
 from web.drf import exceptions as django_api_exception
 from .. import serializers
 from .... import models
 
+# the lists are filtered by recipient, (recipient, date_create) is indexed
+NOTIFICATION_RECIPIENT_QUERY_SCHEMA = QuerySchema(
+    filters={
+        'status': ('exact',),
+        'is_notify': ('exact',),
+        'is_email': ('exact',),
+        'reading_date': ('isnull', 'gte', 'lte'),
+        'date_create': ('gte', 'lte'),
+        'notification__content_type': ('exact', 'in'),
+        'notification__object_id': ('exact', 'in'),
+        'notification__sender': ('exact', 'in'),
+    },
+    ordering=('date_create', 'id'),
+)
+
 
 class TrackerNotificationMixin(
         JWTPayloadMixin):
     """
     Company Project Mixin
     """
-    def get_profile(self):
-        payload = self.get_payload()
-        return self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
-
     def get_object(self):
         try:
             profile = self.get_profile()
@@ -53,8 +66,7 @@ class TrackerNotificationRecipientCountDetailView(
     permission_roles = settings.MEMBERS
 
     def get(self, request, *args, **kwargs):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         count = profile.list_notification_receipient_count()
         return Response(count)
 
@@ -69,6 +81,8 @@ class TrackerNotificationRecipientListView(
     permission_classes = (RoleAccessPermission,)
     permission_roles = settings.MEMBERS
     serializer_class = serializers.NotificationRecipientSerializer
+    cursor_pagination_class = KeysetPagination
+    query_schema = NOTIFICATION_RECIPIENT_QUERY_SCHEMA
 
     def __init__(self, *args, **kwargs):
         self.notification_recipient_response_include_fields = [
@@ -88,8 +102,7 @@ class TrackerNotificationRecipientListView(
         super(TrackerNotificationRecipientListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         generic = 'list_notification_receipient_' + self.kwargs.get('type')
         self.queryset = getattr(profile, generic)()
         return super(TrackerNotificationRecipientListView, self).get_queryset()
@@ -105,6 +118,8 @@ class TrackerNotificationRecipientEventListView(
     permission_classes = (RoleAccessPermission,)
     permission_roles = settings.MEMBERS
     serializer_class = serializers.NotificationRecipientSerializer
+    cursor_pagination_class = KeysetPagination
+    query_schema = NOTIFICATION_RECIPIENT_QUERY_SCHEMA
 
     def __init__(self, *args, **kwargs):
         self.notification_recipient_response_include_fields = [
@@ -121,8 +136,7 @@ class TrackerNotificationRecipientEventListView(
         super(TrackerNotificationRecipientEventListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_notification_receipient_event(self.kwargs.get('type'))
         return super(TrackerNotificationRecipientEventListView, self).get_queryset()
 
@@ -177,18 +191,33 @@ class TrackerNotificationRecipientReadAllView(
         super(TrackerNotificationRecipientReadAllView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        self.profile = self.get_profile()
         generic = 'list_notification_receipient_new'
         self.queryset = getattr(self.profile, generic)()
         return super(TrackerNotificationRecipientReadAllView, self).get_queryset()
 
     def create(self, request, *args, **kwargs):
-        notification_recipients = self.get_queryset()
-        for instance in notification_recipients:
-            notification_recipient = self.profile.edit_notification_receipient(instance)
+        self.profile = self.get_profile()
+        self.profile.read_all_notification_receipient()
         return Response("ok", status.HTTP_200_OK)
 
+class TrackerPushDeviceRegisterView(
+        JWTPayloadMixin,
+        generics.CreateAPIView):
+    """
+    Register a push notification device of the profile
+    """
+    permission_classes = (RoleAccessPermission,)
+    permission_roles = settings.MEMBERS
+    serializer_class = serializers.PushDeviceSerializer
+
+    def __init__(self, *args, **kwargs):
+        self.push_device_request_include_fields = [
+            'id', 'token', 'platform'
+        ]
+        super(TrackerPushDeviceRegisterView, self).__init__(*args, **kwargs)
+
+
 class TrackerNotificationDeleteView(
         JWTPayloadMixin,
         generics.RetrieveDestroyAPIView):
@@ -215,6 +244,5 @@ class TrackerNotificationDeleteView(
         super(TrackerNotificationDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_notification_receipient(instance)
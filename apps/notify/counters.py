@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from . import models as notify_models
+
+COUNTER_BUCKETS = ('new', 'read', 'trash')
+
+
+def get_counter_event(notify_obj):
+    return ContentType.objects.get_for_id(notify_obj.content_type_id).model
+
+
+def update_notification_counters(deltas):
+    """
+    Apply a {(profile_id, event): {bucket: delta}} dict to the counters.
+    Keys sharing the same event and deltas are updated with one query.
+    """
+    groups = defaultdict(list)
+    for (profile_id, event), delta in deltas.items():
+        delta = tuple(sorted((bucket, value) for bucket, value in delta.items() if value))
+        if delta:
+            groups[(event, delta)].append(profile_id)
+
+    for (event, delta), profile_ids in groups.items():
+        # decrements never create counters, e.g. while a profile is being deleted
+        if any(value > 0 for bucket, value in delta):
+            notify_models.NotificationCounter.objects.bulk_create([
+                notify_models.NotificationCounter(profile_id=profile_id, event=event)
+                for profile_id in profile_ids
+            ], ignore_conflicts=True)
+        notify_models.NotificationCounter.objects.filter(
+            profile_id__in=profile_ids, event=event
+        ).update(**{bucket: F(bucket) + value for bucket, value in delta})
+
+
+def move_notification_counter(notify_recipient, old_bucket, new_bucket):
+    if old_bucket == new_bucket:
+        return
+    delta = {}
+    if old_bucket:
+        delta[old_bucket] = -1
+    if new_bucket:
+        delta[new_bucket] = 1
+    update_notification_counters({
+        (notify_recipient.recipient_id, get_counter_event(notify_recipient.notification)): delta
+    })
+
+
+def add_notification_counters(notify_obj, notify_recipients):
+    """
+    Count a batch of recipients of the same notify created with bulk_create
+    """
+    event = get_counter_event(notify_obj)
+    deltas = {}
+    for notify_recipient in notify_recipients:
+        bucket = notify_recipient.get_counter_bucket()
+        notify_recipient._counter_bucket = bucket
+        if bucket:
+            deltas.setdefault((notify_recipient.recipient_id, event), defaultdict(int))[bucket] += 1
+    update_notification_counters(deltas)
+
+
+def rebuild_notification_counters(profile_ids=None):
+    """
+    Recompute the counters from the NotificationRecipient rows,
+    for all the profiles or only for the given ones
+    """
+    notify_recipients = notify_models.NotificationRecipient.objects.filter(is_notify=True)
+    counters = notify_models.NotificationCounter.objects.all()
+    if profile_ids is not None:
+        notify_recipients = notify_recipients.filter(recipient_id__in=profile_ids)
+        counters = counters.filter(profile_id__in=profile_ids)
+
+    rows = notify_recipients.values(
+        'recipient_id', 'notification__content_type__model'
+    ).annotate(
+        new=Count('id', filter=Q(status=True, reading_date__isnull=True)),
+        read=Count('id', filter=Q(status=True, reading_date__isnull=False)),
+        trash=Count('id', filter=Q(status=False)),
+    ).order_by()
+
+    with transaction.atomic():
+        counters.delete()
+        notify_models.NotificationCounter.objects.bulk_create([
+            notify_models.NotificationCounter(
+                profile_id=row['recipient_id'], event=row['notification__content_type__model'],
+                new=row['new'], read=row['read'], trash=row['trash']
+            ) for row in rows
+        ], batch_size=1000)
+    return len(rows)
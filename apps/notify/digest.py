@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import logging
+import os
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import Q
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils import translation
+from django.utils.translation import ugettext as _
+
+from . import models as notify_models
+
+logger = logging.getLogger('email')
+
+DIGEST_TEMPLATE = 'notify/notify/email/notification_digest_{}.{}'
+
+
+def get_pending_emails():
+    """
+    Notification recipients waiting for an email, the ones of the
+    profiles without an email address are skipped
+    """
+    return notify_models.NotificationRecipient.objects.filter(
+        is_email=True, is_email_sent=False
+    ).exclude(Q(recipient__email__isnull=True) | Q(recipient__email=''))
+
+
+class EmailDigestSender(object):
+    """
+    Send the pending notification emails grouped in one digest per recipient.
+    Pending rows are read by recipient in chunks of NOTIFY_EMAIL_DIGEST_CHUNK_SIZE,
+    the digest templates are loaded once per language and all the messages go
+    through a single mail connection. Sent rows are flagged with one UPDATE
+    per chunk of rows.
+    """
+
+    def __init__(self, connection=None):
+        self.connection = connection or get_connection()
+        self.templates = {}
+
+    def get_templates(self, language):
+        if language not in self.templates:
+            try:
+                self.templates[language] = (
+                    get_template(DIGEST_TEMPLATE.format(language, 'txt')),
+                    get_template(DIGEST_TEMPLATE.format(language, 'html')),
+                )
+            except TemplateDoesNotExist:
+                self.templates[language] = self.get_templates('en')
+        return self.templates[language]
+
+    def get_pending(self, last_key):
+        """
+        Chunk of pending rows after the (recipient_id, id) key, ordered by
+        recipient
+        """
+        queryset = get_pending_emails()
+        if last_key is not None:
+            recipient_id, last_id = last_key
+            queryset = queryset.filter(
+                Q(recipient_id__gt=recipient_id) | Q(recipient_id=recipient_id, id__gt=last_id)
+            )
+        return list(
+            queryset.select_related(
+                'recipient__company', 'notification__content_type'
+            ).order_by('recipient_id', 'id')[:settings.NOTIFY_EMAIL_DIGEST_CHUNK_SIZE]
+        )
+
+    def get_digests(self):
+        """
+        Pending rows of each recipient, the rows of a recipient split
+        between two chunks are joined in one digest
+        """
+        last_key = None
+        digest = []
+        while True:
+            notify_recipients = self.get_pending(last_key)
+            if not notify_recipients:
+                break
+            last_key = (notify_recipients[-1].recipient_id, notify_recipients[-1].id)
+            for notify_recipient in notify_recipients:
+                if digest and digest[0].recipient_id != notify_recipient.recipient_id:
+                    yield digest
+                    digest = []
+                digest.append(notify_recipient)
+        if digest:
+            yield digest
+
+    def build_message(self, notify_recipients):
+        recipient = notify_recipients[0].recipient
+        language = recipient.language if recipient.language else 'en'
+        text_template, html_template = self.get_templates(language)
+        context = {
+            'logo_url': os.path.join(
+                settings.PROTOCOL + '://',
+                settings.BASE_URL,
+                'assets/images/logos/fuse.svg'
+            ),
+            "first_name": recipient.first_name,
+            "last_name": recipient.last_name,
+            "company_name": recipient.company.name if recipient.company else '',
+            "notifications": [
+                {
+                    "subject": notify_recipient.notification.subject,
+                    "endpoint": notify_recipient.notification.get_email_endpoint(),
+                } for notify_recipient in notify_recipients
+            ],
+            'base_url': settings.BASE_URL,
+            "protocol": settings.PROTOCOL,
+        }
+        if len(notify_recipients) == 1:
+            subject = notify_recipients[0].notification.subject
+        else:
+            with translation.override(language):
+                subject = _('%(count)s new notifications') % {'count': len(notify_recipients)}
+        message = EmailMultiAlternatives(
+            subject=_('Whistle ') + subject,
+            body=text_template.render(context),
+            from_email=settings.NOTIFY_NOTIFY_NO_REPLY_EMAIL,
+            to=[recipient.email],
+            connection=self.connection,
+        )
+        message.attach_alternative(html_template.render(context), 'text/html')
+        return message
+
+    def send_digest(self, digest):
+        try:
+            return bool(self.connection.send_messages([self.build_message(digest)]))
+        except Exception as e:
+            logger.error('email digest to profile {}: {}'.format(digest[0].recipient_id, e))
+            return False
+
+    def mark_sent(self, sent_ids):
+        if sent_ids:
+            notify_models.NotificationRecipient.objects.filter(
+                id__in=sent_ids
+            ).update(is_email_sent=True)
+
+    def send(self, limit=None):
+        """
+        Send the pending digests, at most limit emails if given.
+        Return the number of emails and of notification recipients sent
+        """
+        emails = rows = 0
+        sent_ids = []
+        self.connection.open()
+        try:
+            for digest in self.get_digests():
+                if limit is not None and emails >= limit:
+                    break
+                if not self.send_digest(digest):
+                    continue
+                emails += 1
+                sent_ids += [notify_recipient.id for notify_recipient in digest]
+                if len(sent_ids) >= settings.NOTIFY_EMAIL_DIGEST_CHUNK_SIZE:
+                    self.mark_sent(sent_ids)
+                    rows += len(sent_ids)
+                    sent_ids = []
+        finally:
+            # the emails already sent are flagged even after an error
+            self.mark_sent(sent_ids)
+            rows += len(sent_ids)
+            self.connection.close()
+        return emails, rows
@@ -6,7 +6,9 @@ import os
 from django.contrib.contenttypes.models import ContentType
 from django.core.mail import send_mail
 from django.conf import settings
+from django.contrib.postgres.fields import JSONField
 from django.db import models
+from django.db.models import Q
 from django.template.loader import render_to_string
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
@@ -70,6 +72,14 @@ class Notify(CleanModel, UserModel, DateModel, OrderedModel):
     def get_notifications(cls):
         return cls.objects.all()
 
+    def get_email_endpoint(self):
+        endpoint = os.path.join(settings.PROTOCOL+':/', settings.BASE_URL, 'dashboard')
+        if self.content_type.name in ['project', 'task', 'team', 'activity']:
+            endpoint = os.path.join(settings.PROTOCOL+':/', settings.BASE_URL, 'project/%s' % self.object_id)
+        elif self.content_type.name == 'bom':
+            endpoint = os.path.join(settings.PROTOCOL+':/', settings.BASE_URL, 'preventivi')
+        return endpoint
+
 
 @python_2_unicode_compatible
 class NotificationRecipient(UserModel, DateModel, StatusModel):
@@ -113,19 +123,57 @@ class NotificationRecipient(UserModel, DateModel, StatusModel):
         unique_together = (('recipient', 'notification',),)
         ordering = ['-date_create']
         get_latest_by = "date_create"
+        indexes = [
+            # list_notification_receipient / list_notification_receipient_event
+            models.Index(fields=['recipient', '-date_create'], name='notify_rcp_date_idx'),
+            # list_notification_receipient_new/read/trash
+            models.Index(
+                fields=['recipient', '-date_create'], name='notify_rcp_new_idx',
+                condition=Q(status=True, reading_date__isnull=True)
+            ),
+            models.Index(
+                fields=['recipient', '-date_create'], name='notify_rcp_read_idx',
+                condition=Q(status=True, reading_date__isnull=False)
+            ),
+            models.Index(
+                fields=['recipient', '-date_create'], name='notify_rcp_trash_idx',
+                condition=Q(status=False)
+            ),
+            # retention job
+            models.Index(fields=['date_create'], name='notify_rcp_create_idx'),
+            # email digests
+            models.Index(
+                fields=['recipient', 'id'], name='notify_rcp_email_idx',
+                condition=Q(is_email=True, is_email_sent=False)
+            ),
+        ]
 
     def __str__(self):
         return '{}: {}'.format(self.recipient, self.notification)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(NotificationRecipient, cls).from_db(db, field_names, values)
+        instance._counter_bucket = instance.get_counter_bucket()
+        return instance
+
+    def get_counter_bucket(self):
+        """
+        NotificationCounter column that counts this row
+        """
+        if not self.is_notify:
+            return None
+        if not self.status:
+            return 'trash'
+        if self.reading_date is None:
+            return 'new'
+        return 'read'
+
     def send_notify_email(self):
         if not self.is_email_sent and self.is_email:
             from_mail = settings.NOTIFY_NOTIFY_NO_REPLY_EMAIL
 
-            endpoint = os.path.join(settings.PROTOCOL+':/', settings.BASE_URL, 'dashboard')
-            if self.notification.content_type.name in ['project', 'task', 'team', 'activity']:
-                endpoint = os.path.join(settings.PROTOCOL+':/', settings.BASE_URL, 'project/%s' % self.notification.object_id)
-            elif self.notification.content_type.name == 'bom':
-                endpoint = os.path.join(settings.PROTOCOL+':/', settings.BASE_URL, 'preventivi')
+            endpoint = self.notification.get_email_endpoint()
 
             context = {
                 'logo_url': os.path.join(
@@ -163,3 +211,306 @@ class NotificationRecipient(UserModel, DateModel, StatusModel):
                 self.save()
             except Exception as e:
                 print(e)
+
+
+@python_2_unicode_compatible
+class NotifyEvent(DateModel):
+    """
+    Compact record of a notification event, written inside the request
+    transaction. Notify/NotificationRecipient rows and push delivery are
+    created later by the `process_notify_events` worker. The events failed
+    NOTIFY_EVENT_MAX_ATTEMPTS times stay unprocessed as dead letters.
+    """
+    sender = models.ForeignKey(
+        Profile,
+        on_delete=models.CASCADE,
+        related_name='notify_events',
+        verbose_name=_('sender'),
+    )
+    subject = models.CharField(
+        max_length=255,
+        verbose_name=_('subject'),
+    )
+    body = models.TextField(
+        blank=True,
+        verbose_name=_('body'),
+    )
+    push_body = models.TextField(
+        blank=True,
+        verbose_name=_('push body'),
+        help_text=_('Body of the push notification, empty if no push has to be sent'),
+    )
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='notify_events',
+    )
+    object_id = models.PositiveIntegerField()
+    event = models.CharField(
+        max_length=50,
+        verbose_name=_('event'),
+        help_text=_('Notification preference typology'),
+    )
+    recipients = JSONField(
+        default=list,
+        verbose_name=_('recipients'),
+        help_text=_('Candidate recipient profile ids'),
+    )
+    date_processed = models.DateTimeField(
+        blank=True, null=True,
+        db_index=True,
+        verbose_name=_('date processed'),
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('attempts'),
+        help_text=_('Failed fanouts of the event'),
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name=_('error'),
+    )
+
+    class Meta:
+        verbose_name = _('notify event')
+        verbose_name_plural = _('notify events')
+        ordering = ['id']
+        get_latest_by = "date_create"
+
+    def __str__(self):
+        return '{}: {} ({})'.format(self.sender, self.subject, self.event)
+
+
+@python_2_unicode_compatible
+class PushRetry(DateModel):
+    """
+    Push notification rejected by FCM, resent by the `retry_push_notifications`
+    worker with exponential backoff.
+    """
+    recipient = models.ForeignKey(
+        Profile,
+        on_delete=models.CASCADE,
+        related_name='push_retries',
+        verbose_name=_('recipient'),
+    )
+    subject = models.CharField(
+        max_length=255,
+        verbose_name=_('subject'),
+    )
+    body = models.TextField(
+        verbose_name=_('body'),
+    )
+    token = models.CharField(
+        max_length=255, blank=True,
+        verbose_name=_('token'),
+        help_text=_('Device registration token, empty for the profile topic'),
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('attempts'),
+    )
+    date_next_attempt = models.DateTimeField(
+        db_index=True,
+        verbose_name=_('date next attempt'),
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name=_('error'),
+    )
+
+    class Meta:
+        verbose_name = _('push retry')
+        verbose_name_plural = _('push retries')
+        ordering = ['date_next_attempt', 'id']
+
+    def __str__(self):
+        return '{}: {} ({})'.format(self.recipient, self.subject, self.attempts)
+
+
+@python_2_unicode_compatible
+class PushCounter(models.Model):
+    """
+    Daily push delivery counters
+    """
+    date = models.DateField(
+        unique=True,
+        verbose_name=_('date'),
+    )
+    sent = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('sent'),
+    )
+    failed = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('failed'),
+    )
+    retried = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('retried'),
+    )
+    dropped = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('dropped'),
+    )
+    batches = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('batches'),
+    )
+
+    class Meta:
+        verbose_name = _('push counter')
+        verbose_name_plural = _('push counters')
+        ordering = ['-date']
+
+    def __str__(self):
+        return '{}: {} sent, {} failed'.format(self.date, self.sent, self.failed)
+
+
+@python_2_unicode_compatible
+class PushDevice(DateModel):
+    """
+    Device registered by a profile to receive push notifications
+    """
+    PLATFORM_CHOICES = (
+        ('android', 'Android'),
+        ('ios', 'iOS'),
+        ('web', 'Web'),
+    )
+    profile = models.ForeignKey(
+        Profile,
+        on_delete=models.CASCADE,
+        related_name='push_devices',
+        verbose_name=_('profile'),
+    )
+    token = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name=_('token'),
+        help_text=_('FCM registration token'),
+    )
+    platform = models.CharField(
+        max_length=10,
+        choices=PLATFORM_CHOICES,
+        blank=True,
+        verbose_name=_('platform'),
+    )
+    is_active = models.BooleanField(
+        default=True,
+        verbose_name=_('is active'),
+    )
+
+    class Meta:
+        verbose_name = _('push device')
+        verbose_name_plural = _('push devices')
+        ordering = ['-date_last_modify']
+        indexes = [
+            models.Index(fields=['profile', 'is_active']),
+        ]
+
+    def __str__(self):
+        return '{}: {}'.format(self.profile, self.platform or self.token[:16])
+
+
+@python_2_unicode_compatible
+class NotificationCounter(models.Model):
+    """
+    Bell notifications of a profile counted per event and state,
+    maintained on NotificationRecipient create/read/trash/delete
+    """
+    profile = models.ForeignKey(
+        Profile,
+        on_delete=models.CASCADE,
+        related_name='notification_counters',
+        verbose_name=_('profile'),
+    )
+    event = models.CharField(
+        max_length=100,
+        verbose_name=_('event'),
+        help_text=_('Content type model of the notifications'),
+    )
+    new = models.IntegerField(
+        default=0,
+        verbose_name=_('new'),
+    )
+    read = models.IntegerField(
+        default=0,
+        verbose_name=_('read'),
+    )
+    trash = models.IntegerField(
+        default=0,
+        verbose_name=_('trash'),
+    )
+
+    class Meta:
+        verbose_name = _('notification counter')
+        verbose_name_plural = _('notification counters')
+        unique_together = (('profile', 'event',),)
+
+    def __str__(self):
+        return '{} {}: {}/{}/{}'.format(self.profile, self.event, self.new, self.read, self.trash)
+
+
+@python_2_unicode_compatible
+class NotificationRecipientArchive(models.Model):
+    """
+    NotificationRecipient rows older than NOTIFY_RETENTION_DAYS, moved here
+    by the `archive_notifications` worker together with a copy of their
+    notify. Ids are kept as plain integers as the original rows are deleted.
+    """
+    recipient_id = models.PositiveIntegerField(
+        db_index=True,
+        verbose_name=_('recipient'),
+    )
+    notification_id = models.PositiveIntegerField(
+        verbose_name=_('notification'),
+    )
+    sender_id = models.PositiveIntegerField(
+        verbose_name=_('sender'),
+    )
+    subject = models.CharField(
+        max_length=255,
+        verbose_name=_('subject'),
+    )
+    body = models.TextField(
+        blank=True,
+        verbose_name=_('body'),
+    )
+    content_type_id = models.PositiveIntegerField(
+        verbose_name=_('content type'),
+    )
+    object_id = models.PositiveIntegerField()
+    is_email = models.BooleanField(
+        default=False,
+        verbose_name=_('is email')
+    )
+    is_notify = models.BooleanField(
+        default=False,
+        verbose_name=_('is notify')
+    )
+    is_email_sent = models.BooleanField(
+        default=False,
+        verbose_name=_('is email sent')
+    )
+    reading_date = models.DateTimeField(
+        blank=True, null=True,
+        verbose_name=_('reading date')
+    )
+    status = models.IntegerField(
+        default=1,
+        verbose_name=_('status'),
+    )
+    date_create = models.DateTimeField(
+        verbose_name=_('date create'),
+    )
+    date_archive = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('date archive'),
+    )
+
+    class Meta:
+        verbose_name = _('archived notification recipient')
+        verbose_name_plural = _('archived notification recipients')
+        ordering = ['-date_create']
+
+    def __str__(self):
+        return '{}: {}'.format(self.recipient_id, self.subject)
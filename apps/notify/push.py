@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import datetime
+import json
+import logging
+import os
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from firebase_admin import exceptions as firebase_exceptions, messaging
+
+from . import models as notify_models
+
+logger = logging.getLogger('exceptions')
+
+# FCM errors that are not worth a retry
+PUSH_PERMANENT_ERRORS = (
+    messaging.UnregisteredError,
+    messaging.SenderIdMismatchError,
+    firebase_exceptions.InvalidArgumentError,
+)
+
+
+def get_push_topic(recipient_id):
+    return 'user{}-{}'.format(os.environ.get('ENV_NAME'), recipient_id)
+
+
+def build_push_message(recipient_id, subject, body, token=None, redirect_url=None, tag=None):
+    """
+    FCM message of a push notification addressed to a registered device,
+    or to the topic of the profile if no token is given.
+    redirect_url and tag (the group of the android notifications) default
+    to the ones of the push body, if any
+    """
+    body = json.loads(body)
+    redirect_url = redirect_url or body.get('redirect_url') or settings.NOTIFY_PUSH_REDIRECT_URL
+    tag = tag or body.get('tag')
+    return messaging.Message(
+        notification=messaging.Notification(
+            title=subject,
+            body=body['content'],
+            image=body['big_picture'] if 'big_picture' in body else None,
+        ),
+        android=messaging.AndroidConfig(
+            ttl=datetime.timedelta(seconds=3600),
+            priority='high',
+            collapse_key=tag,
+            notification=messaging.AndroidNotification(
+                icon='ic_stat_onesignal_default',
+                color='#f45342',
+                visibility='public',
+                priority='high',
+                sound='edilcloud.mp3',
+                tag=tag
+            ),
+        ),
+        apns=messaging.APNSConfig(
+            payload=messaging.APNSPayload(
+                aps=messaging.Aps(
+                    sound='edilcloud.caf',
+                    content_available='1',
+                    thread_id=tag,
+                    custom_data={
+                        "custom_data": body['content'],
+                        "redirect_url": redirect_url
+                    }
+                )
+            ),
+        ),
+        data={
+            "custom_data": body['content'],
+            "redirect_url": redirect_url
+        },
+        token=token or None,
+        topic=None if token else get_push_topic(recipient_id),
+    )
+
+
+def update_push_counters(**kwargs):
+    """
+    Add the given values to the push counters of the day
+    """
+    kwargs = {key: value for key, value in kwargs.items() if value}
+    if not kwargs:
+        return
+    today = datetime.date.today()
+    values = {key: F(key) + value for key, value in kwargs.items()}
+    with transaction.atomic():
+        if notify_models.PushCounter.objects.filter(date=today).update(**values):
+            return
+        try:
+            with transaction.atomic():
+                notify_models.PushCounter.objects.create(date=today, **kwargs)
+        except IntegrityError:
+            # the row of the day was created by a concurrent worker
+            notify_models.PushCounter.objects.filter(date=today).update(**values)
+
+
+def get_push_counters(date=None):
+    counter = notify_models.PushCounter.objects.filter(
+        date=date or datetime.date.today()
+    ).first()
+    if counter is None:
+        return dict(sent=0, failed=0, retried=0, dropped=0, batches=0)
+    return dict(
+        sent=counter.sent, failed=counter.failed, retried=counter.retried,
+        dropped=counter.dropped, batches=counter.batches
+    )
+
+
+def get_push_devices(recipient_ids):
+    """
+    Active device tokens of a set of profiles, grouped by profile id
+    """
+    devices = {}
+    for profile_id, token in notify_models.PushDevice.objects.filter(
+            profile_id__in=recipient_ids, is_active=True).values_list('profile_id', 'token'):
+        devices.setdefault(profile_id, []).append(token)
+    return devices
+
+
+def get_push_retry_delay(attempts):
+    return datetime.timedelta(
+        seconds=settings.NOTIFY_PUSH_RETRY_BASE_DELAY * 2 ** max(attempts - 1, 0)
+    )
+
+
+class PushService(object):
+    """
+    Collect push notifications and send them with the FCM batch API, at most
+    NOTIFY_PUSH_BATCH_SIZE messages per HTTP call. Recipients are routed to
+    their registered devices, or to their profile topic when none is known.
+    The authorized session of the firebase app is reused by every batch;
+    rejected messages are stored as PushRetry rows.
+    """
+
+    def __init__(self):
+        self.pushes = []
+
+    def add(self, recipient_id, subject, body, token=None, retry=None):
+        self.pushes.append((recipient_id, subject, body, token, retry))
+
+    def route(self, pushes):
+        devices = get_push_devices(
+            [push[0] for push in pushes if push[3] is None and push[4] is None]
+        )
+        routed = []
+        for recipient_id, subject, body, token, retry in pushes:
+            if token is None and retry is None:
+                for device_token in devices.get(recipient_id, ['']):
+                    routed.append((recipient_id, subject, body, device_token, retry))
+            else:
+                routed.append((recipient_id, subject, body, token or '', retry))
+        return routed
+
+    def send_batch(self, pushes):
+        messages = []
+        valid_pushes = []
+        responses = []
+        for push in pushes:
+            try:
+                messages.append(build_push_message(*push[:4]))
+                valid_pushes.append(push)
+            except Exception as e:
+                responses.append((push, e))
+        if messages:
+            try:
+                batch_response = messaging.send_all(messages)
+                responses += [
+                    (push, None if response.success else response.exception)
+                    for push, response in zip(valid_pushes, batch_response.responses)
+                ]
+            except Exception as e:
+                responses += [(push, e) for push in valid_pushes]
+        return responses
+
+    def flush(self):
+        pushes, self.pushes = self.route(self.pushes), []
+        expired_tokens = []
+        counters = dict(sent=0, failed=0, retried=0, dropped=0, batches=0)
+        new_retries = []
+        batch_size = settings.NOTIFY_PUSH_BATCH_SIZE
+        now = datetime.datetime.now()
+        for index in range(0, len(pushes), batch_size):
+            counters['batches'] += 1
+            for push, error in self.send_batch(pushes[index:index + batch_size]):
+                recipient_id, subject, body, token, retry = push
+                if retry is not None:
+                    counters['retried'] += 1
+                if error is None:
+                    counters['sent'] += 1
+                    if retry is not None:
+                        retry.delete()
+                    continue
+                counters['failed'] += 1
+                attempts = (retry.attempts if retry is not None else 0) + 1
+                if token and isinstance(error, messaging.UnregisteredError):
+                    expired_tokens.append(token)
+                if isinstance(error, PUSH_PERMANENT_ERRORS) or isinstance(error, (KeyError, ValueError)) \
+                        or attempts > settings.NOTIFY_PUSH_RETRY_MAX_ATTEMPTS:
+                    counters['dropped'] += 1
+                    logger.error('push to profile {} dropped: {}'.format(recipient_id, error))
+                    if retry is not None:
+                        retry.delete()
+                    continue
+                if retry is None:
+                    retry = notify_models.PushRetry(
+                        recipient_id=recipient_id, subject=subject, body=body, token=token
+                    )
+                    new_retries.append(retry)
+                retry.attempts = attempts
+                retry.error = str(error)
+                retry.date_next_attempt = now + get_push_retry_delay(attempts)
+                if retry.pk:
+                    retry.save()
+        notify_models.PushRetry.objects.bulk_create(new_retries)
+        if expired_tokens:
+            notify_models.PushDevice.objects.filter(token__in=expired_tokens).update(is_active=False)
+        update_push_counters(**counters)
+        return counters
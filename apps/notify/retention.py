@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import datetime
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from . import models as notify_models
+from .counters import update_notification_counters
+
+
+def get_retention_cutoff(days=None):
+    return datetime.datetime.now() - datetime.timedelta(
+        days=days if days is not None else settings.NOTIFY_RETENTION_DAYS
+    )
+
+
+def archive_notification_recipients_batch(cutoff, batch_size):
+    """
+    Move one batch of recipients created before the cutoff to the archive
+    table and take them off the badge counters.
+    :return: number of rows archived
+    """
+    with transaction.atomic():
+        notify_recipients = list(
+            notify_models.NotificationRecipient.objects.filter(
+                date_create__lt=cutoff
+            ).select_for_update(of=('self',), skip_locked=True).select_related(
+                'notification__content_type'
+            ).order_by('date_create')[:batch_size]
+        )
+        if not notify_recipients:
+            return 0
+
+        deltas = defaultdict(lambda: defaultdict(int))
+        archives = []
+        for notify_recipient in notify_recipients:
+            notify_obj = notify_recipient.notification
+            bucket = notify_recipient.get_counter_bucket()
+            if bucket:
+                deltas[(notify_recipient.recipient_id, notify_obj.content_type.model)][bucket] -= 1
+            archives.append(notify_models.NotificationRecipientArchive(
+                recipient_id=notify_recipient.recipient_id,
+                notification_id=notify_obj.id,
+                sender_id=notify_obj.sender_id,
+                subject=notify_obj.subject,
+                body=notify_obj.body,
+                content_type_id=notify_obj.content_type_id,
+                object_id=notify_obj.object_id,
+                is_email=notify_recipient.is_email,
+                is_notify=notify_recipient.is_notify,
+                is_email_sent=notify_recipient.is_email_sent,
+                reading_date=notify_recipient.reading_date,
+                status=notify_recipient.status,
+                date_create=notify_recipient.date_create,
+            ))
+        notify_models.NotificationRecipientArchive.objects.bulk_create(archives)
+        # the counters are moved for the whole batch below, the per-row
+        # post_delete receivers are bypassed on purpose
+        queryset = notify_models.NotificationRecipient.objects.filter(
+            id__in=[notify_recipient.id for notify_recipient in notify_recipients]
+        )
+        queryset._raw_delete(queryset.db)
+        update_notification_counters(deltas)
+    return len(notify_recipients)
+
+
+def delete_orphan_notifies(cutoff, batch_size):
+    """
+    Delete the notifies created before the cutoff that have no recipients left
+    """
+    deleted = 0
+    while True:
+        notify_ids = list(
+            notify_models.Notify.objects.filter(
+                date_create__lt=cutoff, notification_recipient__isnull=True
+            ).values_list('id', flat=True)[:batch_size]
+        )
+        if not notify_ids:
+            return deleted
+        notify_models.Notify.objects.filter(id__in=notify_ids).delete()
+        deleted += len(notify_ids)
+
+
+def delete_processed_notify_events(cutoff, batch_size):
+    """
+    Delete the notify events processed before the cutoff, the dead letters
+    (never processed) are kept
+    """
+    deleted = 0
+    while True:
+        event_ids = list(
+            notify_models.NotifyEvent.objects.filter(
+                date_processed__lt=cutoff
+            ).values_list('id', flat=True)[:batch_size]
+        )
+        if not event_ids:
+            return deleted
+        notify_models.NotifyEvent.objects.filter(id__in=event_ids).delete()
+        deleted += len(event_ids)
+
+
+def archive_notifications(days=None, batch_size=None):
+    """
+    Archive the recipients older than the retention window in batches,
+    each one in its own transaction, then drop the orphan notifies and
+    the processed notify events
+    :return: (archived recipients, deleted notifies, deleted notify events)
+    """
+    cutoff = get_retention_cutoff(days)
+    batch_size = batch_size or settings.NOTIFY_ARCHIVE_BATCH_SIZE
+    archived = 0
+    while True:
+        count = archive_notification_recipients_batch(cutoff, batch_size)
+        if not count:
+            break
+        archived += count
+    return (
+        archived, delete_orphan_notifies(cutoff, batch_size),
+        delete_processed_notify_events(cutoff, batch_size)
+    )
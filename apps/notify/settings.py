@@ -23,3 +23,28 @@ NOTIFY_CONTENT_TYPE_LIMIT_CHOICES_TO = [
     {'app_label': 'quotation', 'model': 'offer'},
     {'app_label': 'quotation', 'model': 'bom'},
 ]
+
+# Number of notify events fanned out per worker transaction
+NOTIFY_EVENT_BATCH_SIZE = 50
+# Failed fanouts after which a notify event is left as a dead letter
+NOTIFY_EVENT_MAX_ATTEMPTS = 5
+
+# Rows per INSERT when NotificationRecipient rows are bulk created
+NOTIFY_RECIPIENT_BULK_SIZE = 500
+
+# Messages per FCM batch call (FCM accepts at most 500)
+NOTIFY_PUSH_BATCH_SIZE = 500
+
+# Page opened by the push notifications without a redirect_url
+NOTIFY_PUSH_REDIRECT_URL = 'https://app.edilcloud.io/apps/todo/all/notification'
+
+# Seconds before the first push retry, doubled at every attempt
+NOTIFY_PUSH_RETRY_BASE_DELAY = 60
+NOTIFY_PUSH_RETRY_MAX_ATTEMPTS = 6
+
+# Pending notification emails read per digest chunk
+NOTIFY_EMAIL_DIGEST_CHUNK_SIZE = 1000
+
+# Notification recipients older than this are moved to the archive table
+NOTIFY_RETENTION_DAYS = 180
+NOTIFY_ARCHIVE_BATCH_SIZE = 1000
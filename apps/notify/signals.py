@@ -6,20 +6,24 @@ from asgiref.sync import async_to_sync
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from . import models as notify_models
+from .counters import move_notification_counter
+from .push import PushService
 from channels.layers import get_channel_layer
 import firebase_admin
-from firebase_admin import credentials, messaging
+from firebase_admin import credentials
 from ..project.models import Project
-import datetime
+from ..ws.utils import get_notify_group_name
+from web.core.media_urls import get_media_url_builder
+from web.core.middleware.thread_local import get_current_request
 
 cred = credentials.Certificate("./serviceAccountKey.json")
 firebase_admin.initialize_app(cred)
 
 
-def event_triger(msg):
+def event_triger(msg, profile_id):
     channel_layer = get_channel_layer()
     async_to_sync(channel_layer.group_send)(
-        'notify_notify_channel',
+        get_notify_group_name(profile_id),
         {
             'type': 'notify_message',
             'message': msg
@@ -50,119 +54,102 @@ def get_sender_photo(sender):
     main = sender.get_main_profile()
     if main is None:
         return ""
-    if main.photo:
-        media_url = 'https://back.edilcloud.io' + main.photo.url
-    else:
-        media_url = None
-    return media_url
-
-
-def send_push_notification(notify_obj, recipient, subject, body):
-    body = json.loads(body)
-    print(body['content'])
-    #
-    # payload = {
-    #     "app_id": "0fbdf0cf-d9f5-4363-809f-4735b1bba268",
-    #     "include_player_ids": list_players_recipients,
-    #     "android_group": "project_" + str(body['project_id']),
-    #     "contents": {
-    #         "en": body['content']
-    #     },
-    #     "content-available": 1,
-    #     "headings": {
-    #         "en": subject
-    #     },
-    #     "big_picture": body['big_picture'] if 'big_picture' in body else None,
-    #     "android_channel_id": "4b0b1a93-ec1c-4381-b928-713507c635fe",
-    #     "wp_wns_sound": "message",
-    #     "android_sound": "message",
-    #     "data": {
-    #         "custom_data": body['content'],
-    #         "redirect_url": "https://test.edilcloud.io" + body['url']
-    #     },
-    #     "small_icon": "ic_stat_onesignal_default"
-    # }
-    # The topic name can be optionally prefixed with "/topics/".
-    import os
-    topic = 'user{}-{}'.format(os.environ.get('ENV_NAME'), recipient.id)
-    print('to topic: {}'.format(topic))
-    print('name: {}, surname: {} from company: {}'.format(recipient.first_name, recipient.last_name,
-                                                          recipient.company.name))
-
-    # See documentation on defining a message payload.
-    message = messaging.Message(
-        notification=messaging.Notification(
-            title=subject,
-            body=body['content'],
-            image=body['big_picture'] if 'big_picture' in body else None,
-        ),
-        android=messaging.AndroidConfig(
-            ttl=datetime.timedelta(seconds=3600),
-            priority='high',
-            notification=messaging.AndroidNotification(
-                icon='ic_stat_onesignal_default',
-                color='#f45342',
-                visibility='public',
-                priority='high',
-                sound='edilcloud.mp3'
-            ),
-        ),
-        apns=messaging.APNSConfig(
-            payload=messaging.APNSPayload(
-                aps=messaging.Aps(
-                    sound='edilcloud.caf',
-                    content_available='1',
-                    custom_data={
-                        "custom_data": body['content'],
-                        "redirect_url": "https://app.edilcloud.io/apps/todo/all/notification"
-                    }
-                )
-            ),
-        ),
-        data={
-            "custom_data": body['content'],
-            "redirect_url": "https://app.edilcloud.io/apps/todo/all/notification"
-        },
-        topic=topic,
-    )
-
-    # Send a message to the devices subscribed to the provided topic.
-    response = messaging.send(message)
-    # Response is a message ID string.
-    print('Successfully sent message:', response)
+    return get_media_url_builder(get_current_request()).file_url(main.photo)
+
+
+def get_notify_sender(notify_obj):
+    sender = notify_obj.sender
+    return {
+        "id": sender.id,
+        "first_name": sender.first_name,
+        "last_name": sender.last_name,
+        "photo": get_sender_photo(sender),
+        "role": sender.role,
+        "company": {
+            "id": sender.company.id,
+            "name": sender.company.name,
+            "category": {}
+        }
+    }
 
 
-@receiver([post_save, post_delete], sender=notify_models.NotificationRecipient)
-def notify_notification(sender, instance, **kwargs):
-    notify_obj = instance.notification
-    recipient = instance
+def get_notify_message(notify_obj, notify_recipient, sender=None):
     try:
         body = json.loads(notify_obj.body)
     except Exception as e:
         body = {}
-    if recipient.reading_date is None:
-        event_triger({
-            "message": {
-                "id": instance.id,
-                "notification_id": notify_obj.id,
-                "content_type": notify_obj.content_type.name,
-                "object_id": notify_obj.object_id,
-                "body": body,
-                "dest": {
-                    "id": recipient.recipient.pk
-                },
-                "sender": {
-                    "id": notify_obj.sender.id,
-                    "first_name": notify_obj.sender.first_name,
-                    "last_name": notify_obj.sender.last_name,
-                    "photo": get_sender_photo(notify_obj.sender),
-                    "role": notify_obj.sender.role,
-                    "company": {
-                        "id": notify_obj.sender.company.id,
-                        "name": notify_obj.sender.company.name,
-                        "category": {}
-                    }
-                },
-                "subject": notify_obj.subject
+    return {
+        "message": {
+            "id": notify_recipient.id,
+            "notification_id": notify_obj.id,
+            "content_type": notify_obj.content_type.name,
+            "object_id": notify_obj.object_id,
+            "body": body,
+            "dest": {
+                "id": notify_recipient.recipient_id
+            },
+            "sender": sender or get_notify_sender(notify_obj),
+            "subject": notify_obj.subject
+        }
+    }
+
+
+def send_notify_messages(notify_obj, notify_recipients):
+    """
+    Websocket side-effect of a batch of recipients created with bulk_create,
+    the sender payload is built once for the whole batch
+    """
+    sender = get_notify_sender(notify_obj)
+    for notify_recipient in notify_recipients:
+        if notify_recipient.reading_date is None:
+            event_triger(
+                get_notify_message(notify_obj, notify_recipient, sender),
+                notify_recipient.recipient_id
+            )
+
+
+def send_push_notifications(notify_obj, recipients, subject, body):
+    """
+    Push the notification to all the recipients with FCM batch calls
+    """
+    push_service = PushService()
+    for recipient in recipients:
+        push_service.add(recipient.id, subject, body)
+    return push_service.flush()
+
+
+def send_notify_read_all(profile_id, count, reading_date):
+    """
+    Single websocket event for a bulk read of the notifications of a profile
+    """
+    event_triger({
+        "message": {
+            "read_all": True,
+            "count": count,
+            "reading_date": reading_date.isoformat(),
+            "dest": {
+                "id": profile_id
             }
-        })
+        }
+    }, profile_id)
+
+
+@receiver([post_save, post_delete], sender=notify_models.NotificationRecipient)
+def notify_notification(sender, instance, **kwargs):
+    if instance.reading_date is None:
+        event_triger(get_notify_message(instance.notification, instance), instance.recipient_id)
+
+
+@receiver(post_save, sender=notify_models.NotificationRecipient)
+def notify_counter_save(sender, instance, created, **kwargs):
+    old_bucket = None if created else getattr(instance, '_counter_bucket', None)
+    new_bucket = instance.get_counter_bucket()
+    move_notification_counter(instance, old_bucket, new_bucket)
+    instance._counter_bucket = new_bucket
+
+
+@receiver(post_delete, sender=notify_models.NotificationRecipient)
+def notify_counter_delete(sender, instance, **kwargs):
+    move_notification_counter(
+        instance, getattr(instance, '_counter_bucket', instance.get_counter_bucket()), None
+    )
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+import datetime
+import logging
+
+from celery import task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from . import models as notify_models
+from .digest import EmailDigestSender
+from .push import PushService
+from .retention import archive_notifications as archive_old_notifications
+from .utils import NotificationRecipientBuilder
+
+logger = logging.getLogger('exceptions')
+
+
+def fanout_notify_event(notify_event):
+    """
+    Create the Notify and its NotificationRecipient rows of an event
+    and deliver them to the recipients
+    """
+    sender = notify_event.sender
+    notify_obj = notify_models.Notify.objects.create(
+        sender=sender, subject=notify_event.subject, body=notify_event.body,
+        content_type=notify_event.content_type, object_id=notify_event.object_id,
+        creator=sender.user, last_modifier=sender.user
+    )
+    NotificationRecipientBuilder(notify_obj, notify_event.event).create(
+        notify_event.recipients, push_body=notify_event.push_body
+    )
+    return notify_obj
+
+
+@task()
+def process_notify_events():
+    """
+    Drain the pending notify events in id (i.e. commit) order.
+    The head of the queue is locked with SELECT ... FOR UPDATE, so concurrent
+    workers wait for each other and a recipient never receives an event
+    before a previous one. The websocket and push sends run once the batch
+    is committed. A failed event stays pending, with its attempts counted,
+    and is retried by the next run until NOTIFY_EVENT_MAX_ATTEMPTS.
+    """
+    failed_ids = []
+    while True:
+        with transaction.atomic():
+            notify_events = list(
+                notify_models.NotifyEvent.objects.select_for_update().filter(
+                    date_processed__isnull=True, attempts__lt=settings.NOTIFY_EVENT_MAX_ATTEMPTS
+                ).exclude(id__in=failed_ids).select_related('sender__user', 'content_type').order_by('id')[
+                    :settings.NOTIFY_EVENT_BATCH_SIZE
+                ]
+            )
+            if not notify_events:
+                return
+            processed_ids = []
+            for notify_event in notify_events:
+                try:
+                    with transaction.atomic():
+                        fanout_notify_event(notify_event)
+                    processed_ids.append(notify_event.id)
+                except Exception as e:
+                    logger.error('notify event {}: {}'.format(notify_event.id, e))
+                    failed_ids.append(notify_event.id)
+                    notify_models.NotifyEvent.objects.filter(id=notify_event.id).update(
+                        attempts=F('attempts') + 1, error=str(e)
+                    )
+            notify_models.NotifyEvent.objects.filter(
+                id__in=processed_ids
+            ).update(date_processed=datetime.datetime.now())
+
+
+@task()
+def retry_push_notifications():
+    """
+    Resend the due push notifications of the retry queue
+    """
+    push_service = PushService()
+    with transaction.atomic():
+        retries = notify_models.PushRetry.objects.select_for_update(skip_locked=True).filter(
+            date_next_attempt__lte=datetime.datetime.now()
+        )[:settings.NOTIFY_PUSH_BATCH_SIZE]
+        for retry in retries:
+            push_service.add(
+                retry.recipient_id, retry.subject, retry.body, retry.token, retry
+            )
+        return push_service.flush()
+
+
+@task()
+def send_email_digests():
+    """
+    Send the pending notification emails as one digest per recipient
+    """
+    emails, rows = EmailDigestSender().send()
+    return {'emails': emails, 'notifications': rows}
+
+
+@task()
+def archive_notifications():
+    """
+    Move the notification recipients older than the retention window to the
+    archive and purge the old processed notify events
+    """
+    archived, deleted, deleted_events = archive_old_notifications()
+    return {'archived': archived, 'deleted_notifies': deleted, 'deleted_notify_events': deleted_events}
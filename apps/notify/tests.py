@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from firebase_admin import exceptions as firebase_exceptions
+from unittest import mock
+
+from apps.profile.models import Company, Profile
+from . import models as notify_models
+from .push import PushService, get_push_counters, get_push_topic
+
+
+class FakeSendResponse(object):
+    def __init__(self, exception=None):
+        self.exception = exception
+        self.success = exception is None
+
+
+class FakeBatchResponse(object):
+    def __init__(self, responses):
+        self.responses = responses
+
+
+class FakeFCM(object):
+    """
+    messaging.send_all recording the batches, the messages of the
+    failing topics are rejected as unavailable
+    """
+
+    def __init__(self, failing_topics=()):
+        self.batches = []
+        self.failing_topics = failing_topics
+
+    def send_all(self, messages):
+        self.batches.append(messages)
+        return FakeBatchResponse([
+            FakeSendResponse(
+                firebase_exceptions.UnavailableError('unavailable')
+                if message.topic in self.failing_topics else None
+            ) for message in messages
+        ])
+
+
+@override_settings(NOTIFY_PUSH_BATCH_SIZE=2)
+class PushServiceTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user('push', 'push@example.com', 'push')
+        company = Company.objects.create(name='Push', slug='push', creator=user, last_modifier=user)
+        self.profiles = [
+            Profile.objects.create(
+                user=user if i == 0 else None, company=company, role='o', language='it',
+                first_name='Mario', last_name='Rossi {}'.format(i), creator=user, last_modifier=user
+            ) for i in range(3)
+        ]
+        notify_models.PushDevice.objects.create(profile=self.profiles[0], token='device-0')
+        self.body = json.dumps({'content': 'content', 'url': '/apps/chat'})
+
+    def flush(self, fcm):
+        push_service = PushService()
+        for profile in self.profiles:
+            push_service.add(profile.id, 'subject', self.body)
+        with mock.patch('apps.notify.push.messaging.send_all', fcm.send_all):
+            return push_service.flush()
+
+    def test_batches(self):
+        fcm = FakeFCM(failing_topics=[get_push_topic(self.profiles[2].id)])
+        counters = self.flush(fcm)
+
+        self.assertEqual([len(batch) for batch in fcm.batches], [2, 1])
+        messages = [message for batch in fcm.batches for message in batch]
+        self.assertEqual(messages[0].token, 'device-0')
+        self.assertEqual(messages[1].topic, get_push_topic(self.profiles[1].id))
+        self.assertEqual(counters, dict(sent=2, failed=1, retried=0, dropped=0, batches=2))
+        self.assertEqual(get_push_counters(), counters)
+
+        retry = notify_models.PushRetry.objects.get()
+        self.assertEqual(retry.recipient_id, self.profiles[2].id)
+        self.assertEqual(retry.attempts, 1)
+
+    def test_counters_are_added(self):
+        self.flush(FakeFCM())
+        self.flush(FakeFCM())
+        self.assertEqual(get_push_counters(), dict(sent=6, failed=0, retried=0, dropped=0, batches=4))
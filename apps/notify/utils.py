@@ -1,4 +1,121 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
-# Create your utils here.
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.query import QuerySet
+
+from web.core.utils import (
+    get_bell_notification_status, get_email_notification_status,
+    get_notification_profile_ids, get_notification_status
+)
+
+logger = logging.getLogger('exceptions')
+
+
+def get_profile_ids(profiles):
+    """
+    Return the ids of a list or queryset of profiles
+    """
+    if isinstance(profiles, QuerySet) and not profiles.query.combinator:
+        return list(profiles.values_list('id', flat=True))
+    return [profile.id for profile in profiles]
+
+
+def create_notify_event(sender, subject, body, content_type, object_id,
+                        recipients, event, push_body=None, exclude_sender=False):
+    """
+    Record a notification event in the current transaction.
+    Recipient resolution, Notify/NotificationRecipient creation and push
+    delivery are delegated to the notify worker once the transaction commits.
+    """
+    from . import models as notify_models
+    from .tasks import process_notify_events
+
+    recipient_ids = []
+    for recipient_id in get_profile_ids(recipients):
+        if exclude_sender and recipient_id == sender.id:
+            continue
+        if recipient_id not in recipient_ids:
+            recipient_ids.append(recipient_id)
+    if not recipient_ids:
+        return None
+
+    notify_event = notify_models.NotifyEvent.objects.create(
+        sender=sender, subject=subject, body=body,
+        push_body=push_body or '', content_type=content_type,
+        object_id=object_id, event=event, recipients=recipient_ids
+    )
+    transaction.on_commit(lambda: process_notify_events.delay())
+    return notify_event
+
+
+class NotificationRecipientBuilder(object):
+    """
+    Create the NotificationRecipient rows of a notify for a set of profiles.
+    Profiles that want the event on no channel are discarded with one
+    preference bitmap query, the preferences of the remaining set are
+    fetched up-front, the rows are written with a single
+    bulk_create and the websocket/push side-effects are emitted as a batch
+    afterwards.
+    """
+
+    def __init__(self, notify_obj, event):
+        self.notify_obj = notify_obj
+        self.event = event
+        self.creator = notify_obj.sender.user
+
+    def get_recipients(self, profile_ids):
+        from apps.profile.models import Profile
+
+        return list(
+            Profile.objects.filter(id__in=profile_ids).select_related('preference', 'company')
+        )
+
+    def build(self, recipients):
+        from . import models as notify_models
+
+        notify_recipients = []
+        for recipient in recipients:
+            bell_status = get_bell_notification_status(recipient, self.event)
+            email_status = get_email_notification_status(recipient, self.event)
+            if bell_status or email_status:
+                notify_recipients.append(notify_models.NotificationRecipient(
+                    notification=self.notify_obj, is_email=email_status,
+                    is_notify=bell_status, recipient=recipient,
+                    creator=self.creator, last_modifier=self.creator
+                ))
+        return notify_recipients
+
+    def create(self, profile_ids, push_body=None):
+        from . import models as notify_models
+        from .counters import add_notification_counters
+
+        channels = ['bell', 'email', 'push'] if push_body else ['bell', 'email']
+        recipients = self.get_recipients(
+            get_notification_profile_ids(profile_ids, self.event, channels)
+        )
+        notify_recipients = notify_models.NotificationRecipient.objects.bulk_create(
+            self.build(recipients),
+            batch_size=settings.NOTIFY_RECIPIENT_BULK_SIZE
+        )
+        add_notification_counters(self.notify_obj, notify_recipients)
+        push_recipients = [
+            recipient for recipient in recipients
+            if push_body and get_notification_status(recipient, self.event, 'push')
+        ]
+        # sent once the rows are committed, dropped with a rolled back savepoint
+        transaction.on_commit(lambda: self.send(notify_recipients, push_recipients, push_body))
+        return notify_recipients
+
+    def send(self, notify_recipients, push_recipients, push_body):
+        from .signals import send_notify_messages, send_push_notifications
+
+        try:
+            send_notify_messages(self.notify_obj, notify_recipients)
+            if push_recipients:
+                send_push_notifications(self.notify_obj, push_recipients, self.notify_obj.subject, push_body)
+        except Exception as e:
+            logger.error('notify {} send: {}'.format(self.notify_obj.id, e))
@@ -1,12 +1,9 @@
 import json
 import emoji
-from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.contenttypes.models import ContentType
-from apps.notify.signals import send_push_notification
-from apps.notify import models as notify_models
+from apps.notify.utils import create_notify_event
 from web.core.middleware.thread_local import get_current_profile
-from web.core.utils import get_bell_notification_status, get_email_notification_status
 
 
 def payment_success_notification(senders):
@@ -24,27 +21,12 @@ def payment_success_notification(senders):
         type = ContentType.objects.get(model='profile')
 
         for sender in senders:
-            notify_obj = notify_models.Notify.objects.create(
+            create_notify_event(
                 sender=profile, subject=subject, body=body,
                 content_type=type, object_id=profile.id,
-                creator=profile.user, last_modifier=profile.user
+                recipients=[sender], event='profile',
+                push_body=body
             )
-
-            bell_status = get_bell_notification_status(
-                sender, 'profile'
-            )
-            email_status = get_email_notification_status(
-                sender, 'profile'
-            )
-            translation.activate(profile.user.get_main_profile().language)
-
-            if bell_status or email_status:
-                notify_recipient = notify_models.NotificationRecipient(
-                    notification=notify_obj, is_email=email_status,
-                    is_notify=bell_status, recipient=sender,
-                    creator=profile.user, last_modifier=profile.user)
-                notify_recipient.save()
-                send_push_notification(notify_obj, sender, subject, body)
     except Exception as e:
         print(e)
 
@@ -64,26 +46,11 @@ def payment_failed_notification(senders):
         type = ContentType.objects.get(model='profile')
 
         for sender in senders:
-            notify_obj = notify_models.Notify.objects.create(
+            create_notify_event(
                 sender=profile, subject=subject, body=body,
                 content_type=type, object_id=profile.id,
-                creator=profile.user, last_modifier=profile.user
+                recipients=[sender], event='profile',
+                push_body=body
             )
-
-            bell_status = get_bell_notification_status(
-                sender, 'profile'
-            )
-            email_status = get_email_notification_status(
-                sender, 'profile'
-            )
-            translation.activate(profile.user.get_main_profile().language)
-
-            if bell_status or email_status:
-                notify_recipient = notify_models.NotificationRecipient(
-                    notification=notify_obj, is_email=email_status,
-                    is_notify=bell_status, recipient=sender,
-                    creator=profile.user, last_modifier=profile.user)
-                notify_recipient.save()
-                send_push_notification(notify_obj, sender, subject, body)
     except Exception as e:
         print(e)
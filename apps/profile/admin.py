@@ -163,6 +163,14 @@ class CompanyAdmin(UserAdminMixin, admin.ModelAdmin):
         'url', 'email',
     )
 
+    def get_queryset(self, request):
+        # the counters of list_display, one subquery each
+        return super(CompanyAdmin, self).get_queryset(request).with_counts(
+            'profiles', 'owner_profiles', 'delegate_profiles', 'level1_profiles',
+            'level2_profiles', 'internal_projects', 'shared_projects', 'boms',
+            'quotations', 'offers', 'certifications',
+        )
+
 
 class PreferenceInlineAdmin(admin.TabularInline):
     model = models.Preference
@@ -12,13 +12,13 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers, status
 
 import apps.message.api.frontend.serializers
-from apps.message.models import MessageProfileAssignment
 from web.utils import check_limitation_plan, get_media_size, info_plan, permissions_plan
 from ... import models
 from web.drf import exceptions as django_api_exception
 from web import exceptions as django_exception
 from web.api.views import JWTPayloadMixin, daterange, get_first_last_dates_of_month_and_year
 from web.api.serializers import DynamicFieldsModelSerializer
+from web.core.media_urls import get_media_url_builder
 from web.api.views import JWTPayloadMixin, ArrayFieldInMultipartMixin
 
 User = get_user_model()
@@ -77,8 +77,7 @@ class PreferenceEditSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def update(self, instance, validated_data):
         validated_data['id'] = instance.id
@@ -100,8 +99,7 @@ class TalkSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -113,15 +111,12 @@ class TalkSerializer(
         view = self.get_view
         if view:
             self.request = view.request
-            payload = view.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = view.get_profile()
             # if obj.content_type.name == 'project':
             #     project_id = obj.object_id
             # else:
             #     company_id = obj.object_id
-            counter = MessageProfileAssignment.objects.filter(profile=self.profile, read=False,
-                                                              message__talk=obj).count()
-            return counter
+            return self.profile.get_unread_messages_count(obj)
         return 0
 
 
@@ -197,10 +192,9 @@ class CompanySerializer(
             return None
 
     def get_can_access_files(self, obj):
-        payload = self.get_payload()
         # Todo: Under review
         try:
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
             if self.profile:
                 return self.profile.can_access_files
             else:
@@ -209,10 +203,9 @@ class CompanySerializer(
             return 0
 
     def get_can_access_chat(self, obj):
-        payload = self.get_payload()
         # Todo: Under review
         try:
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
             if self.profile:
                 return self.profile.can_access_chat
             else:
@@ -221,10 +214,9 @@ class CompanySerializer(
             return 0
 
     def get_followed(self, obj):
-        payload = self.get_payload()
         # Todo: Under review
         try:
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
             if self.profile:
                 follows = obj.request_favourites.filter(company=self.profile.company)
                 if follows:
@@ -239,10 +231,9 @@ class CompanySerializer(
             return 0
 
     def get_partnership(self, obj):
-        payload = self.get_payload()
         # Todo: Under review
         try:
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
             if self.profile:
                 partnerships = self.profile.company.request_partnerships.filter(inviting_company=obj)
                 if partnerships:
@@ -287,8 +278,7 @@ class PartnershipAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def to_internal_value(self, data):
         data = {
@@ -329,8 +319,7 @@ class PartnershipAcceptSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def to_internal_value(self, data):
         data = {
@@ -371,8 +360,7 @@ class PartnershipRefuseSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def to_internal_value(self, data):
         data = {
@@ -455,8 +443,7 @@ class CompanyEditSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -499,8 +486,7 @@ class CompanyEnableSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -525,8 +511,7 @@ class CompanyDisableSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -565,18 +550,7 @@ class ProfileSerializer(
         main = obj.get_main_profile()
         if main is None:
             return ""
-        request = self.context['request']
-        protocol = request.is_secure()
-        if protocol:
-            protocol = 'https://'
-        else:
-            protocol = 'http://'
-        host = request.get_host()
-        if main.photo:
-            media_url = protocol + host + main.photo.url
-        else:
-            media_url = None
-        return media_url
+        return get_media_url_builder(self.context.get('request')).file_url(main.photo)
 
     def get_subscription(self, obj):
         if obj.subscription != '':
@@ -609,8 +583,7 @@ class ProfileSerializer(
         return obj.talks.count()
 
     def get_is_external(self, obj):
-        payload = self.context['view'].get_payload()
-        profile = self.context['request'].user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.context['view'].get_profile()
         if obj in profile.company.profiles.company_invitation_approve():
             return False
         else:
@@ -631,18 +604,7 @@ class TeamProfileSerializer(ProfileSerializer):
         main = obj.get_main_profile()
         if main is None:
             return ""
-        request = self.context['request']
-        protocol = request.is_secure()
-        if protocol:
-            protocol = 'https://'
-        else:
-            protocol = 'http://'
-        host = request.get_host()
-        if main.photo:
-            media_url = protocol + host + main.photo.url
-        else:
-            media_url = None
-        return media_url
+        return get_media_url_builder(self.context.get('request')).file_url(main.photo)
 
 
 class MainProfileAddSerializer(
@@ -720,8 +682,7 @@ class ProfileAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -802,16 +763,10 @@ class ProfileEditSerializer(
 
     def get_photo(self, obj):
         try:
-            photo_url = obj.get_main_profile().photo.url
-            protocol = self.context['request'].is_secure()
-            if protocol:
-                protocol = 'https://'
-            else:
-                protocol = 'http://'
-            host = self.context['request'].get_host()
-            media_url = protocol + host + photo_url
-        except:
-            media_url = None
+            main_profile = obj.get_main_profile()
+        except django_exception.MainProfileDoesNotExist:
+            return None
+        media_url = get_media_url_builder(self.context.get('request')).file_url(main_profile.photo)
 
         return media_url
 
@@ -856,8 +811,7 @@ class ProfileEnableSerializer(
 
     def update(self, instance, validated_data):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             staff_list = profile.list_approve_profiles_inactive()
             profile_to_enable = staff_list.filter(id=instance.id)
             if profile_to_enable:
@@ -891,8 +845,7 @@ class ProfileDisableSerializer(
 
     def update(self, instance, validated_data):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             staff_list = profile.list_approve_profiles()
             profile_to_disable = staff_list.filter(id=instance.id)
             if profile_to_disable:
@@ -1129,8 +1082,7 @@ class FavouriteAcceptSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1161,8 +1113,7 @@ class SetFavouriteSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1202,8 +1153,7 @@ class SponsorAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def to_internal_value(self, data):
         if 'pk' in self.request.parser_context['kwargs'].keys():
@@ -1247,8 +1197,7 @@ class SponsorEditSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
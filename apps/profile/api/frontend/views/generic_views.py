@@ -67,7 +67,7 @@ class CompanyPhotoListView(
 
     def __init__(self, *args, **kwargs):
         self.photo_response_include_fields = ['id', 'title', 'pub_date', 'photo', 'extension',
-            'photo_64', 'note', 'tags', 'relative_path', 'folder_relative_path']
+            'renditions', 'note', 'tags', 'relative_path', 'folder_relative_path']
         super(CompanyPhotoListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
@@ -90,7 +90,7 @@ class CompanyPublicPhotoListView(
     def __init__(self, *args, **kwargs):
         self.photo_response_include_fields = [
             'id', 'title', 'pub_date', 'photo', 'extension',
-            'photo_64', 'note', 'is_public'
+            'renditions', 'note', 'is_public'
         ]
         super(CompanyPublicPhotoListView, self).__init__(*args, **kwargs)
 
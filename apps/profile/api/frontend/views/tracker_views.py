@@ -24,6 +24,7 @@ from apps.project.models import Project
 from apps.quotation.api.frontend import serializers as quotation_serializers
 from apps.document.api.frontend import serializers as document_serializers
 from web.api.permissions import RoleAccessPermission
+from web.api.pagination import KeysetPagination
 from web.api.views import (
     QuerysetMixin,
     JWTPayloadMixin,
@@ -42,8 +43,7 @@ class TrackerCompanyProfileMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            generic_profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            generic_profile = self.get_profile()
             profile = generic_profile.get_profile(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, profile)
             return profile
@@ -301,8 +301,7 @@ class TrackerProfilePreferenceMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             preference = profile.get_preference()
             self.check_object_permissions(self.request, preference)
             return preference
@@ -430,8 +429,7 @@ class TrackerCompanyProfileListView(
         super(TrackerCompanyProfileListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_profiles()
         return super(TrackerCompanyProfileListView, self).get_queryset()
 
@@ -559,8 +557,7 @@ class TrackerCompanyProfileDeleteView(
         super(TrackerCompanyProfileDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_profile(instance)
 
 
@@ -665,8 +662,7 @@ class TrackerCompanyRefuseFollowView(
         super(TrackerCompanyRefuseFollowView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        self.profile = self.get_profile()
         self.queryset = self.profile.list_received_favourites()
         return super(TrackerCompanyRefuseFollowView, self).get_queryset()
 
@@ -682,8 +678,7 @@ class TrackerCompanyMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             company = profile.get_company(profile.company_id)
             self.check_object_permissions(self.request, company)
             return company
@@ -766,8 +761,7 @@ class TrackerCompanyPartnerShipListView(
         super(TrackerCompanyPartnerShipListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         generic = 'list_' + self.kwargs.get('type') + '_partnerships'
         self.queryset = getattr(profile, generic)()
         return super(TrackerCompanyPartnerShipListView, self).get_queryset()
@@ -854,8 +848,7 @@ class TrackerCompanyPartnerShipRefuseView(
         super(TrackerCompanyPartnerShipRefuseView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        self.profile = self.get_profile()
         self.queryset = self.profile.list_created_partnerships()
         return super(TrackerCompanyPartnerShipRefuseView, self).get_queryset()
 
@@ -883,8 +876,7 @@ class TrackerCompanyDeleteView(
         super(TrackerCompanyDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_company()
 
 
@@ -1002,8 +994,7 @@ class TrackerCompanyDocumentListView(
         super(TrackerCompanyDocumentListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_documents()
         return super(TrackerCompanyDocumentListView, self).get_queryset()
 
@@ -1033,8 +1024,7 @@ class TrackerCompanyMessageListView(
         super(TrackerCompanyMessageListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_company_messages()
         messages = super(TrackerCompanyMessageListView, self).get_queryset()
         if 'type' in self.kwargs and self.kwargs['type'] == 'last':
@@ -1069,8 +1059,7 @@ class TrackerCompanyCompanyDocumentListView(
         super(TrackerCompanyCompanyDocumentListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         if 'type' in self.kwargs:
             list_method = 'list_{}_company_documents'.format(self.kwargs['type'])
             self.queryset = getattr(profile, list_method)()
@@ -1099,8 +1088,7 @@ class TrackerCompanyProjectDocumentListView(
         super(TrackerCompanyProjectDocumentListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_project_documents()
         return super(TrackerCompanyProjectDocumentListView, self).get_queryset()
 
@@ -1125,8 +1113,7 @@ class TrackerCompanyProfileDocumentListView(
         super(TrackerCompanyProfileDocumentListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_profile_documents()
         return super(TrackerCompanyProfileDocumentListView, self).get_queryset()
 
@@ -1151,8 +1138,7 @@ class TrackerCompanyBomDocumentListView(
         super(TrackerCompanyBomDocumentListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_bom_documents()
         return super(TrackerCompanyBomDocumentListView, self).get_queryset()
 
@@ -1173,8 +1159,7 @@ class TrackerCompanyTalkListView(
         super(TrackerCompanyTalkListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_talks()
         return super(TrackerCompanyTalkListView, self).get_queryset()
 
@@ -1195,8 +1180,7 @@ class TrackerCompanyCompanyTalkListView(
         super(TrackerCompanyCompanyTalkListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_company_talks()
         return super(TrackerCompanyCompanyTalkListView, self).get_queryset()
 
@@ -1217,8 +1201,7 @@ class TrackerCompanyProjectTalkListView(
         super(TrackerCompanyProjectTalkListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_project_talks()
         return super(TrackerCompanyProjectTalkListView, self).get_queryset()
 
@@ -1239,8 +1222,7 @@ class TrackerCompanyProfileTalkListView(
         super(TrackerCompanyProfileTalkListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_profile_talks()
         return super(TrackerCompanyProfileTalkListView, self).get_queryset()
 
@@ -1255,17 +1237,17 @@ class TrackerCompanyPhotoListView(
     permission_classes = (RoleAccessPermission,)
     permission_roles = settings.MEMBERS
     serializer_class = media_serializers.PhotoSerializer
+    cursor_pagination_class = KeysetPagination
 
     def __init__(self, *args, **kwargs):
         self.photo_response_include_fields = [
             'id', 'title', 'pub_date', 'photo', 'extension',
-            'photo_64'
+            'renditions'
         ]
         super(TrackerCompanyPhotoListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_photos()
         return super(TrackerCompanyPhotoListView, self).get_queryset()
 
@@ -1289,8 +1271,7 @@ class TrackerCompanyCompanyPhotoListView(
         super(TrackerCompanyCompanyPhotoListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         if 'type' in self.kwargs:
             list_method = 'list_{}_company_photos'.format(self.kwargs['type'])
             self.queryset = getattr(profile, list_method)()
@@ -1308,8 +1289,7 @@ class TrackerCompanyTotalPhotoSizeListView(JWTPayloadMixin, QuerysetMixin, gener
     serializer_class = media_serializers.PhotoSerializer
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         if 'type' in self.kwargs:
             list_method = 'list_{}_company_photos'.format(self.kwargs['type'])
             self.queryset = getattr(profile, list_method)()
@@ -1320,7 +1300,7 @@ class TrackerCompanyTotalPhotoSizeListView(JWTPayloadMixin, QuerysetMixin, gener
     def list(self, request, *args, **kwargs):
         total_size = 0
         for object in self.get_queryset():
-            total_size += object.photo.size
+            total_size += object.file_size or 0
         return Response([
             {
                 'total': total_size,
@@ -1359,8 +1339,7 @@ class TrackerCompanyProjectPhotoListView(
         super(TrackerCompanyProjectPhotoListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_project_photos()
         return super(TrackerCompanyProjectPhotoListView, self).get_queryset()
 
@@ -1379,13 +1358,12 @@ class TrackerCompanyBomPhotoListView(
     def __init__(self, *args, **kwargs):
         self.photo_response_include_fields = [
             'id', 'title', 'pub_date', 'photo', 'extension',
-            'photo_64', 'is_public'
+            'renditions', 'is_public'
         ]
         super(TrackerCompanyBomPhotoListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_bom_photos()
         return super(TrackerCompanyBomPhotoListView, self).get_queryset()
 
@@ -1409,8 +1387,7 @@ class TrackerCompanyVideoListView(
         super(TrackerCompanyVideoListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_videos()
         return super(TrackerCompanyVideoListView, self).get_queryset()
 
@@ -1434,15 +1411,14 @@ class TrackerCompanyTotalVideoSizeListView(
         super(TrackerCompanyTotalVideoSizeListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_videos()
         return super(TrackerCompanyTotalVideoSizeListView, self).get_queryset()
 
     def list(self, request, *args, **kwargs):
         total_size = 0
         for object in self.get_queryset():
-            total_size += object.video.size
+            total_size += object.file_size or 0
         return Response([
             {
                 'total': total_size,
@@ -1482,8 +1458,7 @@ class TrackerCompanyCompanyVideoListView(
         super(TrackerCompanyCompanyVideoListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         if 'type' in self.kwargs:
             list_method = 'list_{}_company_videos'.format(self.kwargs['type'])
             self.queryset = getattr(profile, list_method)()
@@ -1511,8 +1486,7 @@ class TrackerCompanyProjectVideoListView(
         super(TrackerCompanyProjectVideoListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_project_videos()
         return super(TrackerCompanyProjectVideoListView, self).get_queryset()
 
@@ -1536,8 +1510,7 @@ class TrackerCompanyBomVideoListView(
         super(TrackerCompanyBomVideoListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_bom_videos()
         return super(TrackerCompanyBomVideoListView, self).get_queryset()
 
@@ -1560,8 +1533,7 @@ class TrackerCompanyBomListView(
         super(TrackerCompanyBomListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_boms()
         return super(TrackerCompanyBomListView, self).get_queryset()
 
@@ -1588,8 +1560,7 @@ class TrackerCompanyQuotationListView(
         super(TrackerCompanyQuotationListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_quotations()
         return super(TrackerCompanyQuotationListView, self).get_queryset()
 
@@ -1621,8 +1592,7 @@ class TrackerCompanyOfferListView(
         super(TrackerCompanyOfferListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_offers()
         return super(TrackerCompanyOfferListView, self).get_queryset()
 
@@ -1654,8 +1624,7 @@ class TrackerCompanyActiveOfferListView(
         super(TrackerCompanyActiveOfferListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_active_offers().filter(is_draft=False)
         return super(TrackerCompanyActiveOfferListView, self).get_queryset()
 
@@ -1686,8 +1655,7 @@ class TrackerCompanyCertificationListView(
         super(TrackerCompanyCertificationListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_certifications()
         return super(TrackerCompanyCertificationListView, self).get_queryset()
 
@@ -1711,8 +1679,7 @@ class TrackerCompanyPhantomListView(
         super(TrackerCompanyPhantomListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_phantoms()
         return super(TrackerCompanyPhantomListView, self).get_queryset()
 
@@ -1736,8 +1703,7 @@ class TrackerCompanyGuestListView(
         super(TrackerCompanyGuestListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_guests()
         return super(TrackerCompanyGuestListView, self).get_queryset()
 
@@ -1782,8 +1748,7 @@ class TrackerCompanyStaffListView(
         return filters
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         generic = 'list_' + self.kwargs.get('type') + '_profiles'
         self.queryset = getattr(profile, generic)()
         if 'exclude__role__in' in self.request.query_params:
@@ -1832,8 +1797,7 @@ class TrackerProjectStaffListView(
         return filters
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         generic = 'list_' + self.kwargs.get('type') + '_profiles'
         self.queryset = getattr(profile, generic)()
         return super(TrackerProjectStaffListView, self).get_queryset().filter(status=1)
@@ -1879,8 +1843,7 @@ class TrackerCompanyStaffListAndExternalView(
         return filters
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         generic = 'list_' + self.kwargs.get('type') + '_profiles_and_external'
         is_creator = None
         if 'project_id' in self.request.query_params:
@@ -1933,8 +1896,7 @@ class TrackerCompanyStaffListDisabledView(
         return filters
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         generic = 'list_' + self.kwargs.get('type') + '_profiles_inactive'
         self.queryset = getattr(profile, generic)()
         return super(TrackerCompanyStaffListDisabledView, self).get_queryset().filter(status=0)
@@ -1960,8 +1922,7 @@ class TrackerCompanyPublicStaffListView(
         super(TrackerCompanyPublicStaffListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.company.get_active_public_staff()
         return super(TrackerCompanyPublicStaffListView, self).get_queryset()
 
@@ -1986,8 +1947,7 @@ class TrackerCompanyShowroomStaffListView(
         super(TrackerCompanyShowroomStaffListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.company.get_active_showroom_staff()
         return super(TrackerCompanyShowroomStaffListView, self).get_queryset()
 
@@ -2012,8 +1972,7 @@ class TrackerCompanyOwnerListView(
         super(TrackerCompanyOwnerListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_owners()
         return super(TrackerCompanyOwnerListView, self).get_queryset()
 
@@ -2037,8 +1996,7 @@ class TrackerCompanyDelegateListView(
         super(TrackerCompanyDelegateListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_delegates()
         return super(TrackerCompanyDelegateListView, self).get_queryset()
 
@@ -2062,8 +2020,7 @@ class TrackerCompanyLevel1ListView(
         super(TrackerCompanyLevel1ListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_level1s()
         return super(TrackerCompanyLevel1ListView, self).get_queryset()
 
@@ -2087,8 +2044,7 @@ class TrackerCompanyLevel2ListView(
         super(TrackerCompanyLevel2ListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_level2s()
         return super(TrackerCompanyLevel2ListView, self).get_queryset()
 
@@ -2129,8 +2085,7 @@ class TrackerCompanyProjectListView(
         super(TrackerCompanyProjectListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_projects()
         return super(TrackerCompanyProjectListView, self).get_queryset()
 
@@ -2153,8 +2108,7 @@ class TrackerCompanySimpleProjectListView(
         super(TrackerCompanySimpleProjectListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_projects()
         return super(TrackerCompanySimpleProjectListView, self).get_queryset()
 
@@ -2184,8 +2138,7 @@ class TrackerCompanyInternalProjectListView(
         super(TrackerCompanyInternalProjectListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_internal_projects()
         return super(TrackerCompanyInternalProjectListView, self).get_queryset()
 
@@ -2211,8 +2164,7 @@ class TrackerCompanySharedProjectListView(
         super(TrackerCompanySharedProjectListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_shared_projects()
         return super(TrackerCompanySharedProjectListView, self).get_queryset()
 
@@ -2243,8 +2195,7 @@ class TrackerCompanyInternalGanttListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.all_internal_tasks()
             return super(TrackerCompanyInternalGanttListView, self).get_queryset()
         except ObjectDoesNotExist as err:
@@ -2274,8 +2225,7 @@ class TrackerCompanySharedGanttListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.all_shared_tasks()
             return super(TrackerCompanySharedGanttListView, self).get_queryset()
         except ObjectDoesNotExist as err:
@@ -2292,8 +2242,7 @@ class TrackerCompanyFavouriteMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             favourite = profile.get_favourite(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, favourite)
             return favourite
@@ -2321,8 +2270,7 @@ class TrackerCompanyFavouriteListView(
         super(TrackerCompanyFavouriteListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_favourites()
         return super(TrackerCompanyFavouriteListView, self).get_queryset()
 
@@ -2345,8 +2293,7 @@ class TrackerCompanyFavouriteWaitingListView(
         super(TrackerCompanyFavouriteWaitingListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_waiting_favourites()
         return super(TrackerCompanyFavouriteWaitingListView, self).get_queryset()
 
@@ -2369,8 +2316,7 @@ class TrackerCompanyFavouriteReceivedListView(
         super(TrackerCompanyFavouriteReceivedListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_received_favourites()
         return super(TrackerCompanyFavouriteReceivedListView, self).get_queryset()
 
@@ -2391,8 +2337,7 @@ class TrackerCompanyNotFavouriteListView(
         super(TrackerCompanyNotFavouriteListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = Company.objects.filter(status=1).exclude(
             id=profile.company.id
         ).exclude(
@@ -2431,8 +2376,7 @@ class TrackerCompanyFavouriteContactListView(
         filters = self.get_filters()
         excludes = self.get_excludes()
         order_by = self.get_order_by()
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         public_contacts = profile.list_favourites_public_contact()
         owners = profile.list_favourites_owners()
         if filters:
@@ -2481,8 +2425,7 @@ class TrackerCompanyFavouriteDeleteView(
         super(TrackerCompanyFavouriteDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_favourite(instance)
 
 
@@ -2505,8 +2448,7 @@ class TrackerCompanyProjectIntervalDetailView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.all_company_projects_interval(
                 month=self.kwargs.get('month'), year=self.kwargs.get('year')
             ).order_by('date_start', 'date_end', 'id')
@@ -2543,8 +2485,7 @@ class TrackerProfileProjectIntervalDetailView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
 
             self.queryset = profile.all_projects_interval(
                 month=self.kwargs.get('month'), year=self.kwargs.get('year')
@@ -2582,8 +2523,7 @@ class TrackerProfileActivityIntervalDetailView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.all_activities_interval(
                 month=self.kwargs.get('month'), year=self.kwargs.get('year')
             ).order_by('datetime_start', 'datetime_end', 'id')
@@ -2617,8 +2557,7 @@ class TrackerCompanyStaffActivityIntervalDetailView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.all_company_staff_interval(
                 month=self.kwargs.get('month'), year=self.kwargs.get('year')
             )
@@ -2649,8 +2588,7 @@ class TrackerProfileMessageListView(
         super(TrackerProfileMessageListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_profile_messages()
         return super(TrackerProfileMessageListView, self).get_queryset()
 
@@ -2674,8 +2612,7 @@ class TrackerProfileToProfileMessageListView(
         super(TrackerProfileToProfileMessageListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         talks = profile.list_profile_to_profile_talks().filter(
             Q(object_id=self.kwargs['profile']) | Q(messages__sender_id=self.kwargs['profile'])
         )
@@ -2692,10 +2629,6 @@ class TrackerSponsorMixin(
     Sponsor Mixin
     """
 
-    def get_profile(self):
-        payload = self.get_payload()
-        return self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
-
     def set_output_serializer(self, output_serializer=None):
         if output_serializer is None:
             self.serializer_class = serializers.SponsorSerializer
@@ -2761,8 +2694,7 @@ class TrackerSponsorListView(
         super(TrackerSponsorListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         main_profile = profile.get_main_profile()
         if main_profile.is_superuser:
             self.queryset = models.Sponsor.objects.all()
@@ -2790,8 +2722,7 @@ class TrackerCompanySponsorActiveListView(
         super(TrackerCompanySponsorActiveListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.get_active_sponsor_list()
         return super(TrackerCompanySponsorActiveListView, self).get_queryset()
 
@@ -4,6 +4,41 @@ from django.conf import settings
 from django.db import models
 from django.db.models import Q
 
+from web.functions import JSONLength, subquery_count, subquery_sum
+
+
+def get_company_counters():
+    """
+    Expressions of the Company.with_counts annotations, by name
+    """
+    from apps.message.models import MessageCounter
+    from apps.project.models import Project
+    from apps.quotation.models import Bom, Certification, Offer, Quotation
+    from .models import Company, Partnership, Profile
+
+    return {
+        'profiles': subquery_count(Profile.objects.all(), 'company'),
+        'owner_profiles': subquery_count(Profile.objects.owners(), 'company'),
+        'delegate_profiles': subquery_count(Profile.objects.delegates(), 'company'),
+        'level1_profiles': subquery_count(Profile.objects.level_1s(), 'company'),
+        'level2_profiles': subquery_count(Profile.objects.level_2s(), 'company'),
+        'projects': subquery_count(Project.objects.all(), 'company'),
+        'internal_projects': subquery_count(Project.objects.internal_projects(), 'company'),
+        'shared_projects': subquery_count(Project.objects.shared_projects(), 'company'),
+        'offers': subquery_count(Offer.objects.all(), 'owner'),
+        'certifications': subquery_count(Certification.objects.all(), 'owner'),
+        'boms': subquery_count(Bom.objects.all(), 'owner'),
+        'quotations': subquery_count(Quotation.objects.all(), 'owner'),
+        'messages': MessageCounter.get_messages_count_annotation(Company),
+        'tags': subquery_sum(Project.objects.all(), 'company', JSONLength('tags'))
+        + subquery_sum(Bom.objects.all(), 'owner', JSONLength('tags'))
+        + subquery_sum(Quotation.objects.all(), 'owner', JSONLength('tags'))
+        + subquery_sum(Offer.objects.all(), 'owner', JSONLength('tags')),
+        'partnerships': subquery_count(Partnership.objects.filter(
+            invitation_date__isnull=False, approval_date__isnull=False
+        ), 'inviting_company'),
+    }
+
 
 class CompanyQuerySet(models.QuerySet):
     def active(self):
@@ -22,6 +57,16 @@ class CompanyQuerySet(models.QuerySet):
             profiles__user=user
         )
 
+    def with_counts(self, *names):
+        """
+        Annotate the <name>_count read by the get_<name>_count properties,
+        all of them by default, see get_company_counters
+        """
+        counters = get_company_counters()
+        return self.annotate(**{
+            '{}_count'.format(name): counters[name] for name in names or counters
+        })
+
 
 class CompanyManager(models.Manager):
     def get_queryset(self):
@@ -36,6 +81,9 @@ class CompanyManager(models.Manager):
     def get_companies(self, user):
         return self.get_queryset().get_companies(user=user)
 
+    def with_counts(self, *names):
+        return self.get_queryset().with_counts(*names)
+
 
 class ProfileQuerySet(models.QuerySet):
     # Todo: Review "active" function
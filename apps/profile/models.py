@@ -13,7 +13,7 @@ import stripe
 from django.db import transaction
 from django.core.mail import send_mail
 from django.db import models
-from django.db.models import Q, Count
+from django.db.models import F, Q, Count
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.contrib.contenttypes.models import ContentType
@@ -36,14 +36,16 @@ from . import managers
 # Todo: May be, use the following format: from apps.app import models as app_models
 from apps.document.models import Document
 from apps.media.models import Photo, Video, Folder
-from apps.message.models import Talk, Message, MessageFileAssignment, MessageProfileAssignment
+from apps.message.models import Talk, Message, MessageCounter, MessageFileAssignment, MessageProfileAssignment
 from apps.project.models import Project, Team, Task, Activity, \
     Post, Comment, TaskPostAssignment, MediaAssignment
+from apps.project.utils import update_task_completion
 from apps.quotation.models import Bom, BomRow, Offer, Certification, Quotation, QuotationRow, FavouriteOffer, \
     BoughtOffer, BomArchive, QuotationArchive
 from apps.user.api.frontend.views.mixin import UserMixin, TokenGenerator as UserTokenGenerator
 from web import exceptions as django_exception
 from web.core.models import UserModel, DateModel, StatusModel, OrderedModel, CleanModel
+from web.core.utils import build_notification_bitmap
 from web.functions import zerofill
 from web.token import TokenGenerator
 from web.api.views import get_first_last_dates_of_month_and_year
@@ -112,7 +114,10 @@ def create_main_profile(self, validated_data):
 
 
 def get_main_profile(self):
-    main_profiles = self.profiles.mains()
+    # filled by the list views prefetch plans
+    main_profiles = getattr(self, 'prefetched_main_profiles', None)
+    if main_profiles is None:
+        main_profiles = self.profiles.mains()
     if main_profiles:
         return main_profiles[0]
     raise django_exception.MainProfileDoesNotExist(_('Main Profile doesn\'t exit'))
@@ -152,9 +157,15 @@ def get_profile_by_id(self, profile_id, profile_status=1):
     :param profile_status: status profile
     :return: profile instance if it is exists
     """
-    profile = self.profiles.get(status=profile_status, id=profile_id)
-    translation.activate(self.get_main_profile().language)
-    return profile
+    # the user is loaded by the authentication on every request,
+    # so the resolved profiles live as long as the request
+    resolved_profiles = self.__dict__.setdefault('_resolved_profiles', {})
+    key = ('{}'.format(profile_id), profile_status)
+    if key not in resolved_profiles:
+        profile = self.profiles.get(status=profile_status, id=profile_id)
+        translation.activate(self.get_main_profile().language)
+        resolved_profiles[key] = profile
+    return resolved_profiles[key]
 
 
 def get_user_by_id(self, user_id):
@@ -532,99 +543,109 @@ class Company(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
 
     @property
     def get_profiles_count(self):
+        if 'profiles_count' in self.__dict__:
+            return self.profiles_count
         return self.profiles.count()
 
     get_profiles_count.fget.short_description = _('Profiles (All)')
 
     @property
     def get_owner_profiles_count(self):
+        if 'owner_profiles_count' in self.__dict__:
+            return self.owner_profiles_count
         return self.profiles.owners().count()
 
     get_owner_profiles_count.fget.short_description = _('Owners')
 
     @property
     def get_delegate_profiles_count(self):
+        if 'delegate_profiles_count' in self.__dict__:
+            return self.delegate_profiles_count
         return self.profiles.delegates().count()
 
     get_delegate_profiles_count.fget.short_description = _('Delegates')
 
     @property
     def get_level1_profiles_count(self):
+        if 'level1_profiles_count' in self.__dict__:
+            return self.level1_profiles_count
         return self.profiles.level_1s().count()
 
     get_level1_profiles_count.fget.short_description = _('Level1')
 
     @property
     def get_level2_profiles_count(self):
+        if 'level2_profiles_count' in self.__dict__:
+            return self.level2_profiles_count
         return self.profiles.level_2s().count()
 
     get_level2_profiles_count.fget.short_description = _('Level2')
 
     @property
     def get_internal_projects_count(self):
+        if 'internal_projects_count' in self.__dict__:
+            return self.internal_projects_count
         return self.projects.internal_projects().count()
 
     get_internal_projects_count.fget.short_description = _('Internal Projects')
 
     @property
     def get_shared_projects_count(self):
+        if 'shared_projects_count' in self.__dict__:
+            return self.shared_projects_count
         return self.projects.shared_projects().count()
 
     get_shared_projects_count.fget.short_description = _('Shared Projects')
 
     @property
     def get_offers_count(self):
+        if 'offers_count' in self.__dict__:
+            return self.offers_count
         return self.offers.count()
 
     get_offers_count.fget.short_description = _('Offers')
 
     @property
     def get_certifications_count(self):
+        if 'certifications_count' in self.__dict__:
+            return self.certifications_count
         return self.certifications.count()
 
     get_certifications_count.fget.short_description = _('Certifications')
 
     @property
     def get_boms_count(self):
+        if 'boms_count' in self.__dict__:
+            return self.boms_count
         return self.boms.count()
 
     get_boms_count.fget.short_description = _('Boms')
 
     @property
     def get_quotations_count(self):
+        if 'quotations_count' in self.__dict__:
+            return self.quotations_count
         return self.quotations.count()
 
     get_quotations_count.fget.short_description = _('Quotations')
 
     @property
     def get_projects_count(self):
+        if 'projects_count' in self.__dict__:
+            return self.projects_count
         return self.projects.count()
 
     @property
     def get_messages_count(self):
-        # Todo: Optimize the following code
-        total_messages = 0
-        for talk in self.talks.all():
-            total_messages += talk.get_messages_count
-        return total_messages
+        if 'messages_count' in self.__dict__:
+            return self.messages_count
+        return MessageCounter.get_messages_count(self)
 
     @property
     def get_tags_count(self):
-        # Todo: Optimize the following code
-        total_tags = 0
-        for project in self.projects.all():
-            total_tags += project.get_tags_count
-
-        for bom in self.boms.all():
-            total_tags += bom.get_tags_count
-
-        for quotation in self.quotations.all():
-            total_tags += quotation.get_tags_count
-
-        for offer in self.offers.all():
-            total_tags += offer.get_tags_count
-
-        return total_tags
+        if 'tags_count' in self.__dict__:
+            return self.tags_count
+        return Company.objects.with_counts('tags').values_list('tags_count', flat=True).get(pk=self.pk)
 
     @property
     def get_followers_count(self):
@@ -632,10 +653,12 @@ class Company(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
 
     @property
     def get_staff_count(self):
-        return self.profiles.count()
+        return self.get_profiles_count
 
     @property
     def get_partnerships_count(self):
+        if 'partnerships_count' in self.__dict__:
+            return self.partnerships_count
         return self.created_partnerships.filter(
             invitation_date__isnull=False,
             approval_date__isnull=False
@@ -1184,6 +1207,12 @@ class Preference(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
         default=True,
         verbose_name=_('show again')
     )
+    notification_bitmap = models.BigIntegerField(
+        blank=True, null=True,
+        editable=False,
+        verbose_name=_('notification bitmap'),
+        help_text=_('Notification preference precomputed per channel and event'),
+    )
 
     class Meta:
         verbose_name = _('preference')
@@ -1197,6 +1226,10 @@ class Preference(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
     def __str__(self):
         return "{}".format(self.profile)
 
+    def save(self, *args, **kwargs):
+        self.notification_bitmap = build_notification_bitmap(self.notification)
+        super(Preference, self).save(*args, **kwargs)
+
 
 @python_2_unicode_compatible
 class MainProfile(Profile):
@@ -1465,6 +1498,30 @@ class OwnerProfile(Profile):
         notification_receipient.save()
         return notification_receipient
 
+    def read_all_notification_receipient(self):
+        """
+        Mark all the new notifications as read with a single UPDATE,
+        move the badge counters and send one websocket event
+        :return: number of notifications read
+        """
+        from apps.notify.models import NotificationCounter
+        from apps.notify.signals import send_notify_read_all
+
+        reading_date = datetime.datetime.now()
+        with transaction.atomic():
+            # every new notification is read, so the new counters move to read.
+            # They are locked first: a notification created meanwhile counts
+            # as new after this transaction, as its row isn't updated below
+            NotificationCounter.objects.filter(profile=self, new__gt=0).update(
+                read=F('read') + F('new'), new=0
+            )
+            count = self.notification_recipient.filter(
+                reading_date__isnull=True, status=True
+            ).update(reading_date=reading_date)
+        if count:
+            send_notify_read_all(self.id, count, reading_date)
+        return count
+
     def remove_notification_receipient(self, notification_rcp):
         notification_receipient = self.list_notification_receipient().get(
             id=notification_rcp.id
@@ -1478,17 +1535,23 @@ class OwnerProfile(Profile):
         ).order_by('-date_create')
 
     def list_notification_receipient_count(self):
+        """
+        Bell notification counters, read from the denormalized NotificationCounter rows
+        """
+        counters = list(self.notification_counters.all())
         return {
-            'new': self.list_notification_receipient_new().filter(is_notify=True).count(),
-            'read': self.list_notification_receipient_read().filter(is_notify=True).count(),
-            'trash': self.list_notification_receipient_trash().filter(is_notify=True).count(),
-            'events': self.list_notification_receipient().filter(is_notify=True).values(
-                'notification__content_type__model'
-            ).annotate(count=Count('notification__content_type__model')).order_by(),
-            'events_new': self.list_notification_receipient().filter(
-                reading_date__isnull=True, status=True, is_notify=True).values(
-                'notification__content_type__model'
-            ).annotate(count=Count('notification__content_type__model')).order_by(),
+            'new': sum(counter.new for counter in counters),
+            'read': sum(counter.read for counter in counters),
+            'trash': sum(counter.trash for counter in counters),
+            'events': [
+                {'notification__content_type__model': counter.event,
+                 'count': counter.new + counter.read + counter.trash}
+                for counter in counters if counter.new + counter.read + counter.trash
+            ],
+            'events_new': [
+                {'notification__content_type__model': counter.event, 'count': counter.new}
+                for counter in counters if counter.new
+            ],
             'preferences': {
                 'closed': self.get_count_closed_preference()
             }
@@ -1928,52 +1991,42 @@ class OwnerProfile(Profile):
 
     def list_projects(self):
         """
-        Get all company projects
+        Get all company projects: the projects of the company for the
+        owners and the delegates, the projects of the active teams
         """
-        if self.role == 'o' or self.role == 'd':
-            return Project.objects.filter(
-                Q(company=self.company) | Q(members__profile__in=[self], members__status=1)).distinct()
-        else:
-            return Project.objects.filter(Q(members__profile__in=[self], members__status=1)).distinct()
+        # one row per profile and project, see ProjectAccess
+        return Project.objects.filter(access__profile=self)
 
     def list_post_alert_all_activities(self):
-        activities_list = []
-        projects = self.list_projects()
-        for project in projects:
-            tasks = self.list_tasks(project)
-            for task in tasks:
-                activities = self.list_task_activities(task)
-                for act in activities:
-                    activities_list.append(act)
-        return Post.objects.filter(alert=True, sub_task__in=activities_list)
+        return Post.objects.filter(alert=True, sub_task__task__project__access__profile=self)
 
     def list_post_alert_all_tasks(self):
-        tasks_list = []
-        projects = self.list_projects()
-        for project in projects:
-            tasks = self.list_tasks(project)
-            for task in tasks:
-                tasks_list.append(task)
-        return Post.objects.filter(alert=True, task__in=tasks_list)
+        return Post.objects.filter(alert=True, task__project__access__profile=self)
 
-    def get_generic_project(self, project_id):
-        return Project.objects.get(pk=project_id)
+    def get_generic_project(self, project_id, counts=()):
+        projects = Project.objects.with_counts(*counts) if counts else Project.objects.all()
+        return projects.get(pk=project_id)
 
-    def get_parent_project(self, project_id):
+    def get_parent_project(self, project_id, counts=()):
         """
-        Get a company parent project
+        Get a company parent project, with the counts annotated
+        (see ProjectQuerySet.with_counts)
         """
-        project = self.get_generic_project(project_id)
+        project = self.get_generic_project(project_id, counts)
         if project and project.tasks.filter(assigned_company=self.company):
             return project
         else:
             raise django_exception.ProjectClonePermissionDenied(_('You dont have permission'))
 
-    def get_project(self, project_id):
+    def get_project(self, project_id, counts=()):
         """
-        Get a company project
+        Get a company project, with the counts annotated
+        (see ProjectQuerySet.with_counts)
         """
-        project = self.list_projects().get(id=project_id)
+        projects = self.list_projects()
+        if counts:
+            projects = projects.with_counts(*counts)
+        project = projects.get(id=project_id)
         return project
 
     def edit_project(self, project_dict):
@@ -2302,19 +2355,14 @@ class OwnerProfile(Profile):
         return task
 
     def update_shared_task_progress(self, task):
-        task_list = Task.objects.filter(shared_task=task, status=1)
-        tot_days = 0;
-        completed_day = 0;
-        task_days = (task.date_end - task.date_start).days
-        for child in task_list:
-            prj_days = (child.date_end - child.date_start).days
-            completed_pry_days = (child.progress * prj_days) / 100
-            tot_days += prj_days
-            completed_day += completed_pry_days
-
-        parent_completed_days = (completed_day * task_days) / tot_days
-        parent_progress = (parent_completed_days * 100) / task_days
-        task.progress = int(parent_progress)
+        # progress of the active internal tasks weighted by their days,
+        # aggregated by the task signals
+        progress_days, days = Task.objects.filter(pk=task.pk).values_list(
+            'internal_tasks_progress_days', 'internal_tasks_days'
+        ).get()
+        if days == 0:
+            return
+        task.progress = int(progress_days / days)
         task.save()
 
     def assign_task(self, task_dict):
@@ -2328,6 +2376,11 @@ class OwnerProfile(Profile):
         task = self.list_tasks(project).filter(id=task_dict['id'])
         task.update(**task_dict)
         task_instance = task[0]
+        # the update skips the task signals
+        update_task_completion(
+            projects=Project.objects.filter(id=task_instance.project_id),
+            tasks=Task.objects.filter(id=task_instance.shared_task_id)
+        )
         if task_instance.assigned_company and self.company.id != task_instance.assigned_company.id:
             tasks = task_instance.project.tasks.filter(
                 assigned_company=task_instance.assigned_company,
@@ -3863,15 +3916,26 @@ class OwnerProfile(Profile):
         else:
             return talk.first()
 
+    def get_talks_filter(self):
+        """
+        Q of the talks of the company, of its projects and of its profiles,
+        on the (content_type, object_id) of the talk instead of the joins
+        on the generic relations
+        """
+        content_types = ContentType.objects.get_for_models(Company, Project, Profile)
+        return Q(content_type=content_types[Company], object_id=self.company_id) | Q(
+            content_type=content_types[Project],
+            object_id__in=Project.objects.filter(company_id=self.company_id).values('id')
+        ) | Q(
+            content_type=content_types[Profile],
+            object_id__in=Profile.objects.filter(company_id=self.company_id).values('id')
+        )
+
     def list_talks(self):
         """
         Get all talks linked to the company
         """
-        return Talk.objects.filter(
-            Q(companies=self.company) |
-            Q(projects__company=self.company) |
-            Q(profiles__company=self.company)
-        )
+        return Talk.objects.filter(self.get_talks_filter())
 
     def list_all_talks(self):
         received = self.list_talks()
@@ -3938,7 +4002,10 @@ class OwnerProfile(Profile):
         """
         Get all company profile talks of the company
         """
-        return Talk.objects.filter(profiles__company=self.company)
+        return Talk.objects.filter(
+            content_type=ContentType.objects.get_for_model(Profile),
+            object_id__in=Profile.objects.filter(company_id=self.company_id).values('id')
+        )
 
     def list_profile_to_profile_talks(self):
         """
@@ -4001,23 +4068,54 @@ class OwnerProfile(Profile):
     def list_sent_messages(self):
         return self.sent_messages.all()
 
-    def list_received_messages(self):
-        # Todo: Optimize the code (may be use managers)
-        talks = self.list_talks()
-        message_queryset = []
-        for talk in talks:
-            # message_queryset.append(talk.messages.exclude(sender=self))
-            message_queryset.append(talk.messages.all())
-        return list(chain(*message_queryset))
-
-    def list_profile_received_messages(self):
-        # Todo: Optimize the code (may be use managers)
-        talks = self.list_profile_talks()
-        message_queryset = []
-        for talk in talks:
-            # message_queryset.append(talk.messages.exclude(sender=self))
-            message_queryset.append(talk.messages.all())
-        return list(chain(*message_queryset))
+    def filter_talk_messages(self, talks, talk=None, read=None):
+        """
+        Messages of the talks, optionally of a single talk and read
+        or unread by the profile
+        """
+        messages = Message.objects.filter(talk__in=talks.values('id'))
+        if talk is not None:
+            messages = messages.filter(talk=talk)
+        if read is not None:
+            messages = messages.filter(id__in=MessageProfileAssignment.objects.filter(
+                profile=self, read=read
+            ).values('message_id'))
+        return messages
+
+    def list_received_messages(self, talk=None, read=None):
+        """
+        Get all messages of the company talks
+        """
+        return self.filter_talk_messages(self.list_talks(), talk, read)
+
+    def list_profile_received_messages(self, talk=None, read=None):
+        """
+        Get all messages of the company profile talks
+        """
+        return self.filter_talk_messages(self.list_profile_talks(), talk, read)
+
+    def get_unread_messages_counts(self):
+        """
+        {talk id: unread messages} of the profile, one query per request
+        (the profile lives as long as the request)
+        """
+        counts = self.__dict__.get('_unread_messages_counts')
+        if counts is None:
+            counts = self.__dict__['_unread_messages_counts'] = dict(
+                MessageProfileAssignment.objects.filter(profile=self, read=False).values(
+                    'message__talk'
+                ).annotate(count=Count('id')).values_list('message__talk', 'count').order_by()
+            )
+        return counts
+
+    def get_unread_messages_count(self, talk=None):
+        """
+        Unread messages of the profile, of all the talks or of a talk
+        """
+        counts = self.get_unread_messages_counts()
+        if talk is not None:
+            return counts.get(talk.id, 0)
+        return sum(counts.values())
 
     def get_message(self, message_id):
         return self.list_messages().get(pk=message_id)
@@ -23,6 +23,16 @@ PROFILE_PROFILE_NO_REPLY_EMAIL = settings.DEFAULT_FROM_EMAIL
 
 MAX_COMPANIES_PER_USER = 10
 
+# Notification channels and events of the preference bitmap, each channel
+# takes PROFILE_PREFERENCE_NOTIFICATION_SLOTS bits, the last one is used by
+# the events that are not listed
+PROFILE_PREFERENCE_NOTIFICATION_CHANNELS = ('bell', 'email', 'push')
+PROFILE_PREFERENCE_NOTIFICATION_EVENTS = (
+    'company', 'project', 'task', 'activity', 'post', 'comment', 'team',
+    'offer', 'bom', 'profile', 'partnership', 'favourite',
+)
+PROFILE_PREFERENCE_NOTIFICATION_SLOTS = 20
+
 PROFILE_PREFERENCE_NOTIFICATION_DEFAULT = {
     "email": {
         "status": False,
@@ -13,9 +13,9 @@ from django.contrib.contenttypes.models import ContentType
 from django.conf import settings
 
 from . import models as profile_models
-from apps.notify import models as notify_models
+from apps.notify.utils import create_notify_event
 from web.core.middleware.thread_local import get_current_profile
-from web.core.utils import get_html_message, get_bell_notification_status, get_email_notification_status
+from web.core.utils import get_html_message
 
 
 @receiver([post_save, post_delete], sender=profile_models.Profile)
@@ -153,32 +153,10 @@ def profile_notification(sender, instance, **kwargs):
             body = get_html_message(content, final_content, endpoint)
             type = ContentType.objects.get(model='profile')
 
-            notify_obj = notify_models.Notify.objects.create(
+            create_notify_event(
                 sender=profile, subject=subject, body=body,
                 content_type=type, object_id=instance.id,
-                creator=profile.user, last_modifier=profile.user
-            )
-
-            recipient_objs = []
-
-            for staff in company_staff:
-                bell_status = get_bell_notification_status(
-                    staff, 'profile'
-                )
-                email_status = get_email_notification_status(
-                    staff, 'profile'
-                )
-
-                if bell_status or email_status:
-                    recipient_objs.append(notify_models.NotificationRecipient(
-                        notification=notify_obj, is_email=email_status,
-                        is_notify=bell_status, recipient=staff,
-                        creator=profile.user, last_modifier=profile.user)
-                    )
-
-            notify_models.NotificationRecipient.objects.bulk_create(
-                recipient_objs,
-                batch_size=100
+                recipients=company_staff, event='profile'
             )
     except Exception as e:
         print(e)
@@ -224,32 +202,10 @@ def partnership_notification(sender, instance, **kwargs):
         body = get_html_message(content, final_content, os.path.join(settings.PROTOCOL+'://', settings.BASE_URL, 'imprese'))
         type = ContentType.objects.get(model=sender.__name__.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
+        create_notify_event(
             sender=profile, subject=subject, body=body,
             content_type=type, object_id=instance.id,
-            creator=profile.user, last_modifier=profile.user
-        )
-
-        recipient_objs = []
-
-        for staff in company_staff:
-            bell_status = get_bell_notification_status(
-                staff, sender.__name__.lower()
-            )
-            email_status = get_email_notification_status(
-                staff, sender.__name__.lower()
-            )
-
-            if bell_status or email_status:
-                recipient_objs.append(notify_models.NotificationRecipient(
-                    notification=notify_obj, is_email=email_status,
-                    is_notify=bell_status, recipient=staff,
-                    creator=profile.user, last_modifier=profile.user)
-                )
-
-        notify_models.NotificationRecipient.objects.bulk_create(
-            recipient_objs,
-            batch_size=100
+            recipients=company_staff, event=sender.__name__.lower()
         )
     except Exception as e:
         print(e)
@@ -282,31 +238,10 @@ def follow_notification(sender, instance, **kwargs):
         body = get_html_message(content, final_content, os.path.join(settings.PROTOCOL+'://', settings.BASE_URL, 'imprese'))
         type = ContentType.objects.get(model=sender.__name__.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
+        create_notify_event(
             sender=profile, subject=subject, body=body,
             content_type=type, object_id=instance.id,
-            creator=profile.user, last_modifier=profile.user
-        )
-
-        recipient_objs = []
-        for staff in company_staff:
-            bell_status = get_bell_notification_status(
-                staff, sender.__name__.lower()
-            )
-            email_status = get_email_notification_status(
-                staff, sender.__name__.lower()
-            )
-
-            if bell_status or email_status:
-                recipient_objs.append(notify_models.NotificationRecipient(
-                    notification=notify_obj, is_email=email_status,
-                    is_notify=bell_status, recipient=staff,
-                    creator=profile.user, last_modifier=profile.user)
-                )
-
-        notify_models.NotificationRecipient.objects.bulk_create(
-            recipient_objs,
-            batch_size=100
+            recipients=company_staff, event=sender.__name__.lower()
         )
     except Exception as e:
         print(e)
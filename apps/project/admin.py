@@ -100,6 +100,9 @@ class ProjectAdmin(UserAdminMixin, admin.ModelAdmin):
     )
     raw_id_fields = ('company', 'referent',)
 
+    def get_queryset(self, request):
+        return super(ProjectAdmin, self).get_queryset(request).with_counts('members', 'tasks')
+
 
 # class TaskAdmin(UserAdminMixin, admin.ModelAdmin):
 #     class Media:
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 from web.api.views import JWTPayloadMixin, ArrayFieldInMultipartMixin
-from ...models import ProjectCompanyColorAssignment, Comment, MediaAssignment, Task, Project, CodeTeamAssignment
+from ...models import ProjectCompanyColorAssignment, MediaAssignment, Task, Project, CodeTeamAssignment
 from web.api.serializers import DynamicFieldsModelSerializer
+from web.core.media_urls import get_media_url_builder
 from web.api.views import JWTPayloadMixin, daterange, get_first_last_dates_of_month_and_year
 from web.drf import exceptions as django_api_exception
 from web import exceptions as django_exception
@@ -16,7 +17,6 @@ import datetime
 import os
 import random
 import subprocess
-import filetype
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import Q
 from django.utils.translation import ugettext_lazy as _
@@ -337,11 +337,25 @@ palette_color2 = [
 ]
 
 
-def get_filetype(file):
-    kind = filetype.guess(file)
-    if kind is None:
-        return
-    return kind.mime
+def get_activity_company_worker_ids(activity):
+    """
+    Workers of the activity belonging to the task assigned company,
+    read from the prefetched workers when available
+    """
+    return [
+        worker.id for worker in activity.workers.all()
+        if worker.company_id == activity.task.assigned_company_id
+    ]
+
+
+def get_activity_team_members(activity):
+    """
+    Project team members of the activity task by profile id
+    """
+    team_members = {}
+    for team_member in activity.task.project.members.all():
+        team_members.setdefault(team_member.profile_id, team_member)
+    return team_members
 
 
 class FilteredListSerializer(serializers.ListSerializer):
@@ -351,7 +365,8 @@ class FilteredListSerializer(serializers.ListSerializer):
 
     def to_representation(self, data):
         if type(data) is not list:
-            data = data.filter(parent__isnull=True)
+            # filtered in python to read the prefetched comments
+            data = [comment for comment in data.all() if comment.parent_id is None]
         return super(FilteredListSerializer, self).to_representation(data)
 
 
@@ -499,8 +514,7 @@ class ProjectEditSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -535,8 +549,7 @@ class PostEditSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -563,8 +576,7 @@ class CommentEditSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -592,8 +604,7 @@ class ProjectEnableSerializer(
         if context:
             request = kwargs['context']['request']
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -619,8 +630,7 @@ class ProjectDisableSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -663,53 +673,32 @@ class CommentSerializer(DynamicFieldsModelSerializer, JWTPayloadMixin, serialize
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_media_set(self, obj):
         media_list = []
-        medias = MediaAssignment.objects.filter(comment=obj)
+        medias = obj.mediaassignment_set.all()
         for media in medias:
-            try:
-                photo_url = media.media.url
-                protocol = self.context['request'].is_secure()
-                if protocol:
-                    protocol = 'https://'
-                else:
-                    protocol = 'http://'
-                host = self.context['request'].get_host()
-                media_url = protocol + host + photo_url
-            except:
-                media_url = None
+            media_url = get_media_url_builder(self.context.get('request')).file_url(media.media)
             name, extension = os.path.splitext(media.media.name)
             media_list.append(
                 {
                     "id": media.id,
                     "media_url": media_url,
-                    "size": media.media.size,
+                    "size": media.file_size,
                     "name": name.split('/')[-1],
                     "extension": extension,
-                    "comment": media.comment.id,
-                    "type": get_filetype(media.media)
+                    "comment": media.comment_id,
+                    "type": media.file_mime_type or None
                 }
             )
         return media_list
 
     def get_replies_set(self, obj):
         comments_list = []
-        comments = Comment.objects.filter(parent=obj.id)
+        comments = obj.replies.all()
         for comment in comments:
-            try:
-                photo_url = comment.author.photo.url
-                protocol = self.context['request'].is_secure()
-                if protocol:
-                    protocol = 'https://'
-                else:
-                    protocol = 'http://'
-                host = self.context['request'].get_host()
-                author_photo = protocol + host + photo_url
-            except:
-                author_photo = None
+            author_photo = get_media_url_builder(self.context.get('request')).file_url(comment.author.photo)
             comments_list.append(
                 {
                     'id': comment.id,
@@ -729,7 +718,7 @@ class CommentSerializer(DynamicFieldsModelSerializer, JWTPayloadMixin, serialize
                     },
                     'media_set': self.get_media_set(comment),
                     'created_date': comment.created_date,
-                    'parent': comment.parent.id if comment.parent is not None else None
+                    'parent': comment.parent_id
                 }
             )
         return comments_list
@@ -765,34 +754,23 @@ class PostSerializer(DynamicFieldsModelSerializer, JWTPayloadMixin, serializers.
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_media_set(self, obj):
         media_list = []
-        medias = MediaAssignment.objects.filter(post=obj)
+        medias = obj.mediaassignment_set.all()
         for media in medias:
-            try:
-                photo_url = media.media.url
-                protocol = self.context['request'].is_secure()
-                if protocol:
-                    protocol = 'https://'
-                else:
-                    protocol = 'http://'
-                host = self.context['request'].get_host()
-                media_url = protocol + host + photo_url
-            except:
-                media_url = None
+            media_url = get_media_url_builder(self.context.get('request')).file_url(media.media)
             name, extension = os.path.splitext(media.media.name)
             media_list.append(
                 {
                     "id": media.id,
                     "media_url": media_url,
-                    "size": media.media.size,
+                    "size": media.file_size,
                     "name": name.split('/')[-1],
                     "extension": extension,
-                    "post": media.post.id,
-                    "type": get_filetype(media.media)
+                    "post": media.post_id,
+                    "type": media.file_mime_type or None
                 }
             )
         return media_list
@@ -837,8 +815,7 @@ class ActivitySerializer(DynamicFieldsModelSerializer, JWTPayloadMixin, ArrayFie
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -848,51 +825,38 @@ class ActivitySerializer(DynamicFieldsModelSerializer, JWTPayloadMixin, ArrayFie
 
     def get_workers_in_activity(self, obj):
         team_list = []
-        workers = obj.workers.filter(company=obj.task.assigned_company)
-        for worker in workers:
-            team_member = obj.task.project.members.all().get(profile__id=worker.id)
-            member = TeamBasicSerializer(team_member, context=self.context).data
-            team_list.append(member)
+        team_members = get_activity_team_members(obj)
+        for worker_id in get_activity_company_worker_ids(obj):
+            if worker_id in team_members:
+                member = TeamBasicSerializer(team_members[worker_id], context=self.context).data
+                team_list.append(member)
         return team_list
 
     def get_can_assign_in_activity(self, obj):
         list_workers = []
-        already_assigned_ids = []
-        already_assigned_workers = obj.workers.filter(company=obj.task.assigned_company)
-        for already_assigned_worker in already_assigned_workers:
-            already_assigned_ids.append(already_assigned_worker.id)
-        workers = obj.task.project.members.exclude(profile_id__in=already_assigned_ids).filter(
-            profile__company_id=obj.task.assigned_company.id)
-        for worker in workers:
-            member = TeamBasicSerializer(worker, context=self.context).data
-            list_workers.append(member)
+        already_assigned_ids = get_activity_company_worker_ids(obj)
+        for worker in obj.task.project.members.all():
+            if worker.profile_id not in already_assigned_ids \
+                    and worker.profile.company_id == obj.task.assigned_company_id:
+                member = TeamBasicSerializer(worker, context=self.context).data
+                list_workers.append(member)
         return list_workers
 
     def get_media_set(self, obj):
         media_list = []
-        medias = MediaAssignment.objects.filter(activity=obj)
+        medias = obj.mediaassignment_set.all()
         for media in medias:
-            try:
-                photo_url = media.media.url
-                protocol = self.context['request'].is_secure()
-                if protocol:
-                    protocol = 'https://'
-                else:
-                    protocol = 'http://'
-                host = self.context['request'].get_host()
-                media_url = protocol + host + photo_url
-            except:
-                media_url = None
+            media_url = get_media_url_builder(self.context.get('request')).file_url(media.media)
             name, extension = os.path.splitext(media.media.name)
             media_list.append(
                 {
                     "id": media.id,
                     "media_url": media_url,
-                    "size": media.media.size,
+                    "size": media.file_size,
                     "name": name.split('/')[-1],
                     "extension": extension,
-                    "activity": media.activity.id,
-                    "type": get_filetype(media.media)
+                    "activity": media.activity_id,
+                    "type": media.file_mime_type or None
                 }
             )
         return media_list
@@ -919,8 +883,7 @@ class TaskSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -930,36 +893,25 @@ class TaskSerializer(
 
     def get_media_set(self, obj):
         media_list = []
-        medias = MediaAssignment.objects.filter(task=obj)
+        medias = obj.mediaassignment_set.all()
         for media in medias:
-            try:
-                photo_url = media.media.url
-                protocol = self.context['request'].is_secure()
-                if protocol:
-                    protocol = 'https://'
-                else:
-                    protocol = 'http://'
-                host = self.context['request'].get_host()
-                media_url = protocol + host + photo_url
-            except:
-                media_url = None
+            media_url = get_media_url_builder(self.context.get('request')).file_url(media.media)
             name, extension = os.path.splitext(media.media.name)
             media_list.append(
                 {
                     "id": media.id,
                     "media_url": media_url,
-                    "size": media.media.size,
+                    "size": media.file_size,
                     "name": name.split('/')[-1],
                     "extension": extension,
-                    "task": media.task.id,
-                    "type": get_filetype(media.media)
+                    "task": media.task_id,
+                    "type": media.file_mime_type or None
                 }
             )
         return media_list
 
     def get_only_read(self, obj):
-        payload = self.context['view'].get_payload()
-        profile = self.context['request'].user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.context['view'].get_profile()
         if obj.project.company == profile.company or obj.assigned_company == profile.company:
             return False
         else:
@@ -986,34 +938,23 @@ class TaskAttachmentAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_media_set(self, obj):
         media_list = []
-        medias = MediaAssignment.objects.filter(task=obj)
+        medias = obj.mediaassignment_set.all()
         for media in medias:
-            try:
-                photo_url = media.media.url
-                protocol = self.context['request'].is_secure()
-                if protocol:
-                    protocol = 'https://'
-                else:
-                    protocol = 'http://'
-                host = self.context['request'].get_host()
-                media_url = protocol + host + photo_url
-            except:
-                media_url = None
+            media_url = get_media_url_builder(self.context.get('request')).file_url(media.media)
             name, extension = os.path.splitext(media.media.name)
             media_list.append(
                 {
                     "id": media.id,
                     "media_url": media_url,
-                    "size": media.media.size,
+                    "size": media.file_size,
                     "name": name.split('/')[-1],
                     "extension": extension,
-                    "task": media.task.id,
-                    "type": get_filetype(media.media)
+                    "task": media.task_id,
+                    "type": media.file_mime_type or None
                 }
             )
         return media_list
@@ -1060,34 +1001,23 @@ class TaskAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_media_set(self, obj):
         media_list = []
-        medias = MediaAssignment.objects.filter(task=obj)
+        medias = obj.mediaassignment_set.all()
         for media in medias:
-            try:
-                photo_url = media.media.url
-                protocol = self.context['request'].is_secure()
-                if protocol:
-                    protocol = 'https://'
-                else:
-                    protocol = 'http://'
-                host = self.context['request'].get_host()
-                media_url = protocol + host + photo_url
-            except:
-                media_url = None
+            media_url = get_media_url_builder(self.context.get('request')).file_url(media.media)
             name, extension = os.path.splitext(media.media.name)
             media_list.append(
                 {
                     "id": media.id,
                     "media_url": media_url,
-                    "size": media.media.size,
+                    "size": media.file_size,
                     "name": name.split('/')[-1],
                     "extension": extension,
-                    "task": media.task.id,
-                    "type": get_filetype(media.media)
+                    "task": media.task_id,
+                    "type": media.file_mime_type or None
                 }
             )
         return media_list
@@ -1130,8 +1060,7 @@ class TaskEditSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1183,8 +1112,7 @@ class TaskEnableSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1210,8 +1138,7 @@ class TaskDisableSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1240,8 +1167,7 @@ class TeamBasicSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1310,8 +1236,7 @@ class TeamGenerateCodeSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1388,8 +1313,7 @@ class TeamAddTeamByCodeSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1452,8 +1376,7 @@ class TeamAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1517,8 +1440,7 @@ class TeamEditSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1545,8 +1467,7 @@ class TeamEnableSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1574,8 +1495,7 @@ class TeamDisableSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1613,23 +1533,20 @@ class TaskActivitySerializer(
 
     def get_workers_in_activity(self, obj):
         team_list = []
-        workers = obj.workers.filter(company=obj.task.assigned_company)
-        for worker in workers:
-            team_member = obj.task.project.members.all().get(profile__id=worker.id)
-            member = TeamBasicSerializer(team_member).data
-            team_list.append(member)
+        team_members = get_activity_team_members(obj)
+        for worker_id in get_activity_company_worker_ids(obj):
+            if worker_id in team_members:
+                member = TeamBasicSerializer(team_members[worker_id]).data
+                team_list.append(member)
         return team_list
 
     def get_can_assign_in_activity(self, obj):
         list_workers = []
-        already_assigned_ids = []
-        already_assigned_workers = obj.workers.filter(company=obj.task.assigned_company)
-        for already_assigned_worker in already_assigned_workers:
-            already_assigned_ids.append(already_assigned_worker.id)
-        workers = obj.task.project.members.exclude(profile_id__in=already_assigned_ids)
-        for worker in workers:
-            member = TeamBasicSerializer(worker).data
-            list_workers.append(member)
+        already_assigned_ids = get_activity_company_worker_ids(obj)
+        for worker in obj.task.project.members.all():
+            if worker.profile_id not in already_assigned_ids:
+                member = TeamBasicSerializer(worker).data
+                list_workers.append(member)
         return list_workers
 
     def get_days_for_gantt(self, obj):
@@ -1667,34 +1584,23 @@ class TaskActivityAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_media_set(self, obj):
         media_list = []
-        medias = MediaAssignment.objects.filter(activity=obj)
+        medias = obj.mediaassignment_set.all()
         for media in medias:
-            try:
-                photo_url = media.media.url
-                protocol = self.context['request'].is_secure()
-                if protocol:
-                    protocol = 'https://'
-                else:
-                    protocol = 'http://'
-                host = self.context['request'].get_host()
-                media_url = protocol + host + photo_url
-            except:
-                media_url = None
+            media_url = get_media_url_builder(self.context.get('request')).file_url(media.media)
             name, extension = os.path.splitext(media.media.name)
             media_list.append(
                 {
                     "id": media.id,
                     "media_url": media_url,
-                    "size": media.media.size,
+                    "size": media.file_size,
                     "name": name.split('/')[-1],
                     "extension": extension,
-                    "activity": media.activity.id,
-                    "type": get_filetype(media.media)
+                    "activity": media.activity_id,
+                    "type": media.file_mime_type or None
                 }
             )
         return media_list
@@ -1743,8 +1649,7 @@ class TaskActivityEditSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.profile = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1790,8 +1695,7 @@ class TaskPostAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.author = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.author = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1830,8 +1734,7 @@ class ActivityPostAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.author = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.author = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1872,8 +1775,7 @@ class PostCommentAddSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.author = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.author = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
@@ -1883,29 +1785,19 @@ class PostCommentAddSerializer(
 
     def get_media_set(self, obj):
         media_list = []
-        medias = MediaAssignment.objects.filter(comment=obj)
+        medias = obj.mediaassignment_set.all()
         for media in medias:
-            try:
-                photo_url = media.media.url
-                protocol = self.context['request'].is_secure()
-                if protocol:
-                    protocol = 'https://'
-                else:
-                    protocol = 'http://'
-                host = self.context['request'].get_host()
-                media_url = protocol + host + photo_url
-            except:
-                media_url = None
+            media_url = get_media_url_builder(self.context.get('request')).file_url(media.media)
             name, extension = os.path.splitext(media.media.name)
             media_list.append(
                 {
                     "id": media.id,
                     "media_url": media_url,
-                    "size": media.media.size,
+                    "size": media.file_size,
                     "name": name.split('/')[-1],
                     "extension": extension,
-                    "comment": media.comment.id,
-                    "type": get_filetype(media.media)
+                    "comment": media.comment_id,
+                    "type": media.file_mime_type or None
                 }
             )
         return media_list
@@ -1949,8 +1841,7 @@ class SharePostToTaskSerializer(
         context = kwargs.get('context', None)
         if context:
             self.request = kwargs['context']['request']
-            payload = self.get_payload()
-            self.author = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            self.author = self.get_profile()
 
     def get_field_names(self, *args, **kwargs):
         view = self.get_view
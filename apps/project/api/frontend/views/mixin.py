@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db.models import Prefetch
+
+from apps.profile.models import Profile
+from apps.project.models import Activity, Comment, Post, Team
+from web.api.views import PrefetchPlanMixin
+
+# fields of the activity serializers that need the project team members
+TEAM_MEMBER_FIELDS = ('workers_in_activity', 'can_assign_in_activity')
+
+
+def get_main_profile_prefetch(lookup=None):
+    """
+    Main profiles of the users of the profiles at lookup, read by
+    User.get_main_profile (profile photos and phones)
+    """
+    return Prefetch(
+        '{}__user__profiles'.format(lookup) if lookup else 'user__profiles',
+        queryset=Profile.objects.mains(),
+        to_attr='prefetched_main_profiles'
+    )
+
+
+def get_profile_queryset():
+    return Profile.objects.select_related('company', 'user').prefetch_related(
+        get_main_profile_prefetch()
+    )
+
+
+def get_team_queryset():
+    return Team.objects.select_related('profile__company', 'profile__user').prefetch_related(
+        get_main_profile_prefetch('profile')
+    )
+
+
+def get_comment_queryset(replies=True):
+    queryset = Comment.objects.select_related('author__company', 'author__user').prefetch_related(
+        'mediaassignment_set', get_main_profile_prefetch('author')
+    )
+    if replies:
+        queryset = queryset.prefetch_related(
+            Prefetch('replies', queryset=get_comment_queryset(replies=False))
+        )
+    return queryset
+
+
+def get_post_queryset():
+    return Post.objects.select_related(
+        'author__company', 'author__user', 'task__project', 'sub_task__task__project'
+    ).prefetch_related(
+        'mediaassignment_set', get_main_profile_prefetch('author'),
+        Prefetch('comment_set', queryset=get_comment_queryset())
+    )
+
+
+def get_activity_plan(fields, nested=False):
+    """
+    Plan of the ActivitySerializer/TaskActivitySerializer fields, the task
+    of a nested activity is the (already planned) parent task
+    """
+    select_related = []
+    prefetch_related = []
+    if 'workers' in fields or any(field in fields for field in TEAM_MEMBER_FIELDS):
+        prefetch_related.append(Prefetch('workers', queryset=get_profile_queryset()))
+    if any(field in fields for field in TEAM_MEMBER_FIELDS) and not nested:
+        select_related += ['task__project', 'task__assigned_company']
+        prefetch_related.append(Prefetch('task__project__members', queryset=get_team_queryset()))
+    if 'media_set' in fields:
+        prefetch_related.append('mediaassignment_set')
+    if 'post_set' in fields:
+        prefetch_related.append(Prefetch('post_set', queryset=get_post_queryset()))
+    return select_related, prefetch_related
+
+
+def get_task_plan(fields, activity_fields=()):
+    select_related = []
+    prefetch_related = []
+    if 'project' in fields or 'only_read' in fields:
+        select_related.append('project__company')
+    if 'assigned_company' in fields or 'only_read' in fields:
+        select_related.append('assigned_company')
+    if 'shared_task' in fields:
+        select_related.append('shared_task')
+    if 'media_set' in fields:
+        prefetch_related.append('mediaassignment_set')
+    if 'post_set' in fields:
+        prefetch_related.append(Prefetch('post_set', queryset=get_post_queryset()))
+    if 'activities' in fields:
+        activity_select, activity_prefetch = get_activity_plan(activity_fields, nested=True)
+        prefetch_related.append(Prefetch(
+            'activities',
+            queryset=Activity.objects.select_related(*activity_select).prefetch_related(*activity_prefetch)
+        ))
+        if any(field in activity_fields for field in TEAM_MEMBER_FIELDS):
+            if 'project__company' not in select_related:
+                select_related.append('project__company')
+            if 'assigned_company' not in select_related:
+                select_related.append('assigned_company')
+            prefetch_related.append(Prefetch('project__members', queryset=get_team_queryset()))
+    return select_related, prefetch_related
+
+
+class TaskPrefetchMixin(PrefetchPlanMixin):
+    """
+    Prefetch plan of the TaskSerializer trees
+    """
+
+    def get_prefetch_plan(self):
+        return get_task_plan(
+            getattr(self, 'task_response_include_fields', []),
+            getattr(self, 'activity_response_include_fields', [])
+        )
+
+
+class ActivityPrefetchMixin(PrefetchPlanMixin):
+    """
+    Prefetch plan of the ActivitySerializer/TaskActivitySerializer trees
+    """
+
+    def get_prefetch_plan(self):
+        fields = getattr(self, 'activity_response_include_fields', [])
+        select_related, prefetch_related = get_activity_plan(fields)
+        if 'task' in fields:
+            task_select, task_prefetch = get_task_plan(getattr(self, 'task_response_include_fields', []))
+            select_related += ['task__{}'.format(lookup) for lookup in task_select] or ['task']
+            prefetch_related += [
+                'task__{}'.format(lookup) if isinstance(lookup, str) else Prefetch(
+                    'task__{}'.format(lookup.prefetch_through), queryset=lookup.queryset
+                ) for lookup in task_prefetch
+            ]
+        return select_related, prefetch_related
+
+
+class PostPrefetchMixin(PrefetchPlanMixin):
+    """
+    Prefetch plan of the PostSerializer trees
+    """
+
+    def get_prefetch_plan(self):
+        return (
+            ['author__company', 'author__user', 'task__project', 'sub_task__task__project'],
+            ['mediaassignment_set', get_main_profile_prefetch('author'),
+             Prefetch('comment_set', queryset=get_comment_queryset())]
+        )
+
+
+class CommentPrefetchMixin(PrefetchPlanMixin):
+    """
+    Prefetch plan of the CommentSerializer trees
+    """
+
+    def get_prefetch_plan(self):
+        return (
+            ['author__company', 'author__user'],
+            ['mediaassignment_set', get_main_profile_prefetch('author'),
+             Prefetch('replies', queryset=get_comment_queryset(replies=False))]
+        )
@@ -26,8 +26,13 @@ from weasyprint import HTML, CSS
 from apps.media.api.frontend.views.tracker_views import TrackerPhotoMixin, TrackerVideoMixin
 from apps.project.models import Team, MediaAssignment, Comment, Post, Project, Activity
 from web.api.permissions import RoleAccessPermission
+from web.api.pagination import KeysetPagination
 from web.api.views import QuerysetMixin, JWTPayloadMixin, WhistleGenericViewMixin, DownloadViewMixin
+from web.core.media_urls import get_media_url_builder
 from apps.project.api.frontend import serializers
+from apps.project.api.frontend.views.mixin import (
+    TaskPrefetchMixin, ActivityPrefetchMixin, PostPrefetchMixin, CommentPrefetchMixin
+)
 from apps.media.api.frontend import serializers as media_serializers
 from apps.document.api.frontend import serializers as document_serializers
 from apps.message.api.frontend import serializers as message_serializers
@@ -44,15 +49,13 @@ class TrackerProjectMixin(
     """
     Company Project Mixin
     """
-
-    def get_profile(self):
-        payload = self.get_payload()
-        return self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+    # counters annotated on the project, see ProjectQuerySet.with_counts
+    project_counts = ()
 
     def get_object(self):
         try:
             profile = self.get_profile()
-            project = profile.get_project(self.kwargs.get('pk', None))
+            project = profile.get_project(self.kwargs.get('pk', None), self.project_counts)
             self.check_object_permissions(self.request, project)
             return project
         except ObjectDoesNotExist as err:
@@ -72,12 +75,13 @@ class TrackerProjectParentMixin(
     """
     Company Project Mixin
     """
+    # counters annotated on the project, see ProjectQuerySet.with_counts
+    project_counts = ()
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
-            project = profile.get_parent_project(self.kwargs.get('pk', None))
+            profile = self.get_profile()
+            project = profile.get_parent_project(self.kwargs.get('pk', None), self.project_counts)
             self.check_object_permissions(self.request, project)
             return project
         except ObjectDoesNotExist as err:
@@ -99,8 +103,7 @@ class TrackerMediaAttachmentMixin(JWTPayloadMixin):
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             task = profile.get_task(self.kwargs.get('pk', None))
             document = task.mediaassignment_set.all().get(id=self.kwargs.get('pk2', None))
             self.check_object_permissions(self.request, document)
@@ -144,19 +147,21 @@ class TrackerProjectListView(
         super(TrackerProjectListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_projects()
         return super(TrackerProjectListView, self).get_queryset()
 
 
 class TrackerActivityPostListAlertView(
+    PostPrefetchMixin,
     JWTPayloadMixin,
     QuerysetMixin,
     generics.ListAPIView):
     permission_classes = (RoleAccessPermission,)
     permission_roles = settings.MEMBERS
     serializer_class = serializers.PostSerializer
+    cursor_pagination_class = KeysetPagination
+    cursor_ordering_field = 'created_date'
 
     def __init__(self, *args, **kwargs):
         self.user_response_include_fields = [
@@ -171,19 +176,21 @@ class TrackerActivityPostListAlertView(
         super(TrackerActivityPostListAlertView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_post_alert_all_activities()
         return super(TrackerActivityPostListAlertView, self).get_queryset()
 
 
 class TrackerTaskPostListAlertView(
+    PostPrefetchMixin,
     JWTPayloadMixin,
     QuerysetMixin,
     generics.ListAPIView):
     permission_classes = (RoleAccessPermission,)
     permission_roles = settings.MEMBERS
     serializer_class = serializers.PostSerializer
+    cursor_pagination_class = KeysetPagination
+    cursor_ordering_field = 'created_date'
 
     def __init__(self, *args, **kwargs):
         self.user_response_include_fields = [
@@ -198,8 +205,7 @@ class TrackerTaskPostListAlertView(
         super(TrackerTaskPostListAlertView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_post_alert_all_tasks()
         return super(TrackerTaskPostListAlertView, self).get_queryset()
 
@@ -215,6 +221,7 @@ class TrackerProjectParentDetailView(
     permission_classes = (RoleAccessPermission,)
     permission_roles = (settings.OWNER, settings.DELEGATE)
     serializer_class = serializers.ProjectSerializer
+    project_counts = ('messages',)
 
     def __init__(self, *args, **kwargs):
         self.project_response_include_fields = [
@@ -248,6 +255,7 @@ class TrackerProjectDetailView(
     permission_classes = (RoleAccessPermission,)
     permission_roles = settings.MEMBERS
     serializer_class = serializers.ProjectSerializer
+    project_counts = ('messages',)
 
     def __init__(self, *args, **kwargs):
         self.project_response_include_fields = [
@@ -397,8 +405,7 @@ class TrackerProjectDeleteView(
 
     def perform_destroy(self, instance):
         from apps.project.signals import close_project_notification
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         project = profile.get_project(instance.id)
         if project.creator == profile.user:
             close_project_notification(project._meta.model, project, **{'created': False})
@@ -431,8 +438,7 @@ class TrackerProjectShareView(
         super(TrackerProjectShareView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        self.profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        self.profile = self.get_profile()
         self.queryset = self.profile.list_projects()
         return super(TrackerProjectShareView, self).get_queryset()
 
@@ -475,8 +481,7 @@ class TrackerProjectBomSenderListView(
         super(TrackerProjectBomSenderListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_project_sender_boms(self.kwargs.get('pk', None))
         return super(TrackerProjectBomSenderListView, self).get_queryset()
 
@@ -506,8 +511,7 @@ class TrackerProjectBomDraftListView(
         super(TrackerProjectBomDraftListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_project_draft_boms(self.kwargs.get('pk', None))
         return super(TrackerProjectBomDraftListView, self).get_queryset()
 
@@ -537,8 +541,7 @@ class TrackerProjectBomReceiverListView(
         super(TrackerProjectBomReceiverListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_project_receiver_boms(self.kwargs.get('pk', None))
         return super(TrackerProjectBomReceiverListView, self).get_queryset()
 
@@ -571,8 +574,7 @@ class TrackerProjectQuotationSenderListView(
         super(TrackerProjectQuotationSenderListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_project_sender_quotations(self.kwargs.get('pk', None))
         return super(TrackerProjectQuotationSenderListView, self).get_queryset()
 
@@ -605,8 +607,7 @@ class TrackerProjectQuotationDraftListView(
         super(TrackerProjectQuotationDraftListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_project_draft_quotations(self.kwargs.get('pk', None))
         return super(TrackerProjectQuotationDraftListView, self).get_queryset()
 
@@ -639,13 +640,13 @@ class TrackerProjectQuotationReceiverListView(
         super(TrackerProjectQuotationReceiverListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_project_receiver_quotations(self.kwargs.get('pk', None))
         return super(TrackerProjectQuotationReceiverListView, self).get_queryset()
 
 
 class TrackerProjectInternalActivityListView(
+    ActivityPrefetchMixin,
     JWTPayloadMixin,
     QuerysetMixin,
     generics.ListAPIView):
@@ -674,13 +675,13 @@ class TrackerProjectInternalActivityListView(
         super(TrackerProjectInternalActivityListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_task_internal_activities(self.kwargs.get('pk', None))
         return super(TrackerProjectInternalActivityListView, self).get_queryset()
 
 
 class TrackerProjectParentActivityListView(
+    ActivityPrefetchMixin,
     JWTPayloadMixin,
     QuerysetMixin,
     generics.ListAPIView):
@@ -709,13 +710,13 @@ class TrackerProjectParentActivityListView(
         super(TrackerProjectParentActivityListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_project_parent_activities(self.kwargs.get('pk', None))
         return super(TrackerProjectParentActivityListView, self).get_queryset()
 
 
 class TrackerProjectActivityListView(
+    ActivityPrefetchMixin,
     JWTPayloadMixin,
     QuerysetMixin,
     generics.ListAPIView):
@@ -744,8 +745,7 @@ class TrackerProjectActivityListView(
         super(TrackerProjectActivityListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_project_task_activities(self.kwargs.get('pk', None))
         return super(TrackerProjectActivityListView, self).get_queryset()
 
@@ -773,8 +773,7 @@ class TrackerProjectParentTeamListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.list_parent_members(self.kwargs.get('pk'))
             return super(TrackerProjectParentTeamListView, self).get_queryset()
         except ObjectDoesNotExist as err:
@@ -819,8 +818,7 @@ class TrackerProjectTeamListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             generic = 'list_' + self.kwargs.get('type') + '_members'
             self.queryset = getattr(profile, generic)(self.kwargs.get('pk'))
             # self.queryset = profile.list_members(self.kwargs.get('pk'))
@@ -848,8 +846,7 @@ class TrackerProjectTalkListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             project = profile.list_projects().get(id=self.kwargs.get('pk'))
             self.queryset = profile.list_project_talks(project=project)
             return super(TrackerProjectTalkListView, self).get_queryset()
@@ -867,6 +864,7 @@ class TrackerProjectParentMessageListView(
     Get all project messages
     """
     serializer_class = message_serializers.MessageSerializer
+    cursor_pagination_class = KeysetPagination
 
     def __init__(self, *args, **kwargs):
         self.message_response_include_fields = [
@@ -881,8 +879,7 @@ class TrackerProjectParentMessageListView(
         super(TrackerProjectParentMessageListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         project = profile.get_parent_project(self.kwargs.get('pk'))
         self.queryset = profile.list_project_messages(project=project)
         return super(TrackerProjectParentMessageListView, self).get_queryset()
@@ -896,6 +893,7 @@ class TrackerProjectMessageListView(
     Get all project messages
     """
     serializer_class = message_serializers.MessageSerializer
+    cursor_pagination_class = KeysetPagination
 
     def __init__(self, *args, **kwargs):
         self.message_response_include_fields = [
@@ -911,8 +909,7 @@ class TrackerProjectMessageListView(
         super(TrackerProjectMessageListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         project = profile.list_projects().get(id=self.kwargs.get('pk'))
         self.queryset = profile.list_project_messages(project=project)
         return super(TrackerProjectMessageListView, self).get_queryset()
@@ -929,6 +926,7 @@ class TrackerProjectPhotoListView(
     permission_classes = (RoleAccessPermission,)
     permission_roles = settings.MEMBERS
     serializer_class = media_serializers.PhotoSerializer
+    cursor_pagination_class = KeysetPagination
 
     def __init__(self, *args, **kwargs):
         self.photo_response_include_fields = [
@@ -939,8 +937,7 @@ class TrackerProjectPhotoListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             project = profile.list_projects().get(id=self.kwargs.get('pk'))
             self.queryset = profile.list_project_photos(project=project).distinct()
             return super(TrackerProjectPhotoListView, self).get_queryset()
@@ -971,8 +968,7 @@ class TrackerProjectVideoListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             project = profile.list_projects().get(id=self.kwargs.get('pk'))
             self.queryset = profile.list_project_videos(project=project)
             return super(TrackerProjectVideoListView, self).get_queryset()
@@ -1001,8 +997,7 @@ class TrackerProjectFolderListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             project = profile.list_projects().get(id=self.kwargs.get('pk'))
             self.queryset = profile.list_project_folders(project=project)
             return super(TrackerProjectFolderListView, self).get_queryset()
@@ -1032,8 +1027,7 @@ class TrackerProjectParentDocumentListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.list_project_parent_documents(self.kwargs.get('pk'))
             return super(TrackerProjectParentDocumentListView, self).get_queryset()
         except ObjectDoesNotExist as err:
@@ -1063,8 +1057,7 @@ class TrackerProjectDocumentListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             project = profile.list_projects().get(id=self.kwargs.get('pk'))
             self.queryset = profile.list_project_documents(project=project)
             return super(TrackerProjectDocumentListView, self).get_queryset()
@@ -1085,6 +1078,7 @@ class TrackerProjectShowCaseListView(
 
 
 class TrackerProjectParentGanttIntervalDetailView(
+    TaskPrefetchMixin,
     TrackerProjectParentMixin,
     QuerysetMixin,
     generics.ListAPIView):
@@ -1110,8 +1104,7 @@ class TrackerProjectParentGanttIntervalDetailView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.list_parent_tasks_interval(
                 self.kwargs.get('pk'), self.kwargs.get('month'), self.kwargs.get('year')
             )
@@ -1123,6 +1116,7 @@ class TrackerProjectParentGanttIntervalDetailView(
 
 
 class TrackerProjectGanttIntervalDetailView(
+    TaskPrefetchMixin,
     TrackerProjectMixin,
     QuerysetMixin,
     generics.ListAPIView):
@@ -1148,8 +1142,7 @@ class TrackerProjectGanttIntervalDetailView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.list_internal_tasks_interval(
                 self.get_object(), self.kwargs.get('month'), self.kwargs.get('year')
             ).order_by('date_start', 'date_end', 'id')
@@ -1161,6 +1154,7 @@ class TrackerProjectGanttIntervalDetailView(
 
 
 class TrackerProjectInternalGanttDetailView(
+    TaskPrefetchMixin,
     TrackerProjectMixin,
     QuerysetMixin,
     generics.ListAPIView):
@@ -1186,8 +1180,7 @@ class TrackerProjectInternalGanttDetailView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.list_internal_tasks(self.get_object())
             return super(TrackerProjectInternalGanttDetailView, self).get_queryset()
         except ObjectDoesNotExist as err:
@@ -1197,6 +1190,7 @@ class TrackerProjectInternalGanttDetailView(
 
 
 class TrackerProjectGanttDetailView(
+    TaskPrefetchMixin,
     TrackerProjectMixin,
     QuerysetMixin,
     generics.ListAPIView):
@@ -1222,8 +1216,7 @@ class TrackerProjectGanttDetailView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.list_tasks(self.get_object())
             return super(TrackerProjectGanttDetailView, self).get_queryset()
         except ObjectDoesNotExist as err:
@@ -1240,8 +1233,7 @@ class TrackerTaskMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             task = profile.get_task(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, task)
             return task
@@ -1265,8 +1257,7 @@ class TrackerPostMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             task = profile.get_task(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, task)
             return task
@@ -1290,8 +1281,7 @@ class TrackerPostEditMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             post = profile.get_post(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, post)
             return post
@@ -1315,8 +1305,7 @@ class TrackerCommentEditMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             comment = profile.get_comment(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, comment)
             return comment
@@ -1340,8 +1329,7 @@ class TrackerPostObjectMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             post = profile.get_post(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, post)
             return post
@@ -1360,8 +1348,7 @@ class TrackerPostObjectMixin(
 class TrackerAttachmentMixin(JWTPayloadMixin):
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             attachment = profile.get_attachment(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, attachment)
             return attachment
@@ -1385,8 +1372,7 @@ class TrackerCommentObjectMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             comment = profile.get_comment(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, comment)
             return comment
@@ -1403,6 +1389,7 @@ class TrackerCommentObjectMixin(
 
 
 class TrackerProjectInternalTaskListView(
+    TaskPrefetchMixin,
     JWTPayloadMixin,
     QuerysetMixin,
     generics.ListAPIView):
@@ -1432,8 +1419,7 @@ class TrackerProjectInternalTaskListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             project = profile.list_projects().get(pk=self.kwargs.get('pk'))
             self.queryset = profile.list_internal_tasks(project)
             return super(TrackerProjectInternalTaskListView, self).get_queryset()
@@ -1444,6 +1430,7 @@ class TrackerProjectInternalTaskListView(
 
 
 class TrackerProjectParentTaskListView(
+    TaskPrefetchMixin,
     JWTPayloadMixin,
     QuerysetMixin,
     generics.ListAPIView):
@@ -1474,8 +1461,7 @@ class TrackerProjectParentTaskListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.list_parent_tasks(self.kwargs.get('pk'))
             return super(TrackerProjectParentTaskListView, self).get_queryset()
         except ObjectDoesNotExist as err:
@@ -1485,6 +1471,7 @@ class TrackerProjectParentTaskListView(
 
 
 class TrackerProjectTaskListView(
+    TaskPrefetchMixin,
     JWTPayloadMixin,
     QuerysetMixin,
     generics.ListAPIView):
@@ -1521,8 +1508,7 @@ class TrackerProjectTaskListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             project = profile.list_projects().get(pk=self.kwargs.get('pk'))
             self.queryset = profile.list_tasks(project)
             return super(TrackerProjectTaskListView, self).get_queryset()
@@ -1533,6 +1519,7 @@ class TrackerProjectTaskListView(
 
 
 class TrackerProjectsTasksActivitiesListView(
+    TaskPrefetchMixin,
     JWTPayloadMixin,
     QuerysetMixin,
     generics.ListAPIView):
@@ -1568,8 +1555,7 @@ class TrackerProjectsTasksActivitiesListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             projects = profile.list_projects()
             self.queryset = profile.list_projects_tasks(projects)
             return super(TrackerProjectsTasksActivitiesListView, self).get_queryset()
@@ -1580,6 +1566,7 @@ class TrackerProjectsTasksActivitiesListView(
 
 
 class TrackerGanttProjectTaskListView(
+    TaskPrefetchMixin,
     JWTPayloadMixin,
     QuerysetMixin,
     generics.ListAPIView):
@@ -1615,8 +1602,7 @@ class TrackerGanttProjectTaskListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             project = profile.list_projects().get(pk=self.kwargs.get('pk'))
             self.queryset = profile.list_tasks(project)
             return super(TrackerGanttProjectTaskListView, self).get_queryset()
@@ -1625,18 +1611,23 @@ class TrackerGanttProjectTaskListView(
                 status.HTTP_403_FORBIDDEN, self.request, _("{}".format(err.msg if hasattr(err, 'msg') else err))
             )
 
-    def list(self, request, *args, **kwargs):
-        response = super(TrackerGanttProjectTaskListView, self).list(request, *args, **kwargs)
-        data = response.data
-        mix_list = []
+    def flatten_tasks(self, data):
         for d in data:
             activities = d.pop('activities')
             for a in activities:
                 a['parent'] = 1
-                mix_list.append(a)
+                yield a
             d['parent'] = 0
-            mix_list.append(d)
-        response.data = mix_list
+            yield d
+
+    def get_no_page_items(self, queryset):
+        items = super(TrackerGanttProjectTaskListView, self).get_no_page_items(queryset)
+        return self.flatten_tasks(items)
+
+    def list(self, request, *args, **kwargs):
+        response = super(TrackerGanttProjectTaskListView, self).list(request, *args, **kwargs)
+        if not response.streaming:
+            response.data = list(self.flatten_tasks(response.data))
         return response
 
 
@@ -1758,8 +1749,7 @@ class TrackerTaskShareView(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             task = profile.get_task(self.kwargs.get('pk', None))
             profile.share_task(task)
             self.check_object_permissions(self.request, task)
@@ -1802,8 +1792,7 @@ class TrackerTaskCloneView(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             task = profile.get_generic_task(self.kwargs.get('pk', None))
             # task = profile.get_task(self.kwargs.get('pk', None))
             profile.clone_task(task)
@@ -1926,8 +1915,7 @@ class TrackerTaskDeleteView(
         super(TrackerTaskDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_task(instance)
 
 
@@ -1939,8 +1927,7 @@ class TrackerTeamCodeGenerateMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             member = profile.get_member(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, member)
             return member
@@ -1964,8 +1951,7 @@ class TrackerTeamMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             member = profile.get_member(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, member)
             return member
@@ -1999,8 +1985,7 @@ class TrackerTeamInviationListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = Team.objects.filter(profile=profile.id, status=0, invitation_refuse_date__isnull=True)
             return super(TrackerTeamInviationListView, self).get_queryset()
         except ObjectDoesNotExist as err:
@@ -2198,8 +2183,7 @@ class TrackerTeamDeleteView(
     def perform_destroy(self, instance):
         from apps.project.signals import remove_team_member_notification
 
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         activity_assigned = Activity.objects.filter(workers__in=[instance.profile.id])
         for act in activity_assigned:
             act.workers.remove(instance.profile)
@@ -2216,8 +2200,7 @@ class TrackerTaskActivityMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             task = profile.get_task_activity(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, task)
             return task
@@ -2329,6 +2312,7 @@ class TrackerTaskAttachmentDownloadView(
 
 
 class TrackerTaskActivityListView(
+    ActivityPrefetchMixin,
     QuerysetMixin,
     TrackerTaskMixin,
     generics.ListAPIView):
@@ -2360,8 +2344,7 @@ class TrackerTaskActivityListView(
         super(TrackerTaskActivityListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_task_activities(self.get_object())
         return super(TrackerTaskActivityListView, self).get_queryset()
 
@@ -2496,8 +2479,7 @@ class TrackerActivityDeleteView(
         super(TrackerActivityDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_task_activity(instance)
 
 
@@ -2628,6 +2610,7 @@ class TrackerPostNotifyView(
 
 
 class TrackerActivityPostListView(
+    PostPrefetchMixin,
     WhistleGenericViewMixin,
     QuerysetMixin,
     TrackerTaskActivityMixin,
@@ -2638,6 +2621,8 @@ class TrackerActivityPostListView(
     permission_classes = (RoleAccessPermission,)
     permission_roles = (settings.OWNER, settings.DELEGATE, settings.LEVEL_1)
     serializer_class = serializers.PostSerializer
+    cursor_pagination_class = KeysetPagination
+    cursor_ordering_field = 'created_date'
 
     def __init__(self, *args, **kwargs):
         self.user_response_include_fields = [
@@ -2652,8 +2637,7 @@ class TrackerActivityPostListView(
         super(TrackerActivityPostListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_activity_posts(self.kwargs.get('pk', None))
         return super(TrackerActivityPostListView, self).get_queryset()
 
@@ -2669,6 +2653,7 @@ class TrackerActivityPostListView(
 
 
 class TrackerTaskPostListView(
+    PostPrefetchMixin,
     WhistleGenericViewMixin,
     QuerysetMixin,
     TrackerTaskActivityMixin,
@@ -2679,6 +2664,8 @@ class TrackerTaskPostListView(
     permission_classes = (RoleAccessPermission,)
     permission_roles = (settings.OWNER, settings.DELEGATE, settings.LEVEL_1, settings.LEVEL_2)
     serializer_class = serializers.PostSerializer
+    cursor_pagination_class = KeysetPagination
+    cursor_ordering_field = 'created_date'
 
     def __init__(self, *args, **kwargs):
         self.user_response_include_fields = [
@@ -2693,8 +2680,7 @@ class TrackerTaskPostListView(
         super(TrackerTaskPostListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_task_own_posts(self.kwargs.get('pk', None))
         return super(TrackerTaskPostListView, self).get_queryset()
 
@@ -2710,6 +2696,7 @@ class TrackerTaskPostListView(
 
 
 class TrackerPostCommentListView(
+    CommentPrefetchMixin,
     WhistleGenericViewMixin,
     TrackerTaskActivityMixin,
     generics.ListAPIView):
@@ -2733,13 +2720,13 @@ class TrackerPostCommentListView(
         super(TrackerPostCommentListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_post_comments(self.kwargs.get('pk', None))
         return super(TrackerPostCommentListView, self).get_queryset()
 
 
 class TrackerCommentRepliesListView(
+    CommentPrefetchMixin,
     WhistleGenericViewMixin,
     TrackerTaskActivityMixin,
     generics.ListAPIView):
@@ -2763,8 +2750,7 @@ class TrackerCommentRepliesListView(
         super(TrackerCommentRepliesListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_comment_replies(self.kwargs.get('pk', None))
         return super(TrackerCommentRepliesListView, self).get_queryset()
 
@@ -2777,8 +2763,7 @@ class TrackerCommentMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             task = profile.get_task(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, task)
             return task
@@ -2866,8 +2851,7 @@ class TrackerAttachmentDeleteView(
     serializer_class = serializers.TaskAttachmentAddSerializer
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_attachment(instance)
 
 
@@ -2882,8 +2866,7 @@ class TrackerPostDeleteView(
     serializer_class = serializers.PostSerializer
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_post(instance)
 
 
@@ -2898,8 +2881,7 @@ class TrackerCommentDeleteView(
     serializer_class = serializers.CommentSerializer
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_comment(instance)
 
 
@@ -2911,8 +2893,7 @@ class TrackerSharePostToTaskMixin(
 
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             post = profile.get_post(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, post)
             return post
@@ -2956,7 +2937,8 @@ class TrackerSharePostToTaskView(
         return self.create(request, *args, **kwargs)
 
 
-class TrackerTaskPostsListView(WhistleGenericViewMixin,
+class TrackerTaskPostsListView(PostPrefetchMixin,
+                               WhistleGenericViewMixin,
                                TrackerPostMixin,
                                generics.ListAPIView):
     permission_classes = (RoleAccessPermission,)
@@ -2976,8 +2958,7 @@ class TrackerTaskPostsListView(WhistleGenericViewMixin,
         super(TrackerTaskPostsListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_task_posts(self.kwargs.get('pk', None))
         return super(TrackerTaskPostsListView, self).get_queryset()
 
@@ -3015,6 +2996,7 @@ class TrackerProjectExport(
     permission_classes = (RoleAccessPermission,)
     permission_roles = settings.MEMBERS
     serializer_class = serializers.ProjectExportSerializer
+    project_counts = ('messages',)
 
     def __init__(self, *args, **kwargs):
         self.project_response_include_fields = [
@@ -3135,13 +3117,7 @@ class TrackerProjectExport(
 
             html_message = render_to_string('project/project/export/ProjectReport.html', data)
             zf.close()
-            protocol = request.is_secure()
-            if protocol:
-                protocol = 'https://'
-            else:
-                protocol = 'http://'
-            host = request.get_host()
-            url = protocol + host
+            url = get_media_url_builder(request).base_url
             generate_pdf_report.delay(html_message, {'pk': self.get_profile().pk, 'email': self.get_profile().email,
                                                      'first_name': self.get_profile().first_name,
                                                      'last_name': self.get_profile().last_name,
@@ -4,6 +4,22 @@ from django.db import models
 from django.conf import settings
 from django.db.models import Q
 
+from web.functions import subquery_count
+
+
+def get_project_counters():
+    """
+    Expressions of the Project.with_counts annotations, by name
+    """
+    from apps.message.models import MessageCounter
+    from .models import Project, Task, Team
+
+    return {
+        'members': subquery_count(Team.objects.all(), 'project'),
+        'tasks': subquery_count(Task.objects.all(), 'project'),
+        'messages': MessageCounter.get_messages_count_annotation(Project),
+    }
+
 
 class ProjectQuerySet(models.QuerySet):
     def active(self):
@@ -27,6 +43,16 @@ class ProjectQuerySet(models.QuerySet):
         # Todo
         return self.all()
 
+    def with_counts(self, *names):
+        """
+        Annotate the <name>_count read by the get_<name>_count properties,
+        all of them by default, see get_project_counters
+        """
+        counters = get_project_counters()
+        return self.annotate(**{
+            '{}_count'.format(name): counters[name] for name in names or counters
+        })
+
 
 class ProjectManager(models.Manager):
     def get_queryset(self):
@@ -47,6 +73,9 @@ class ProjectManager(models.Manager):
     def generic_projects(self):
         return self.get_queryset().generic_projects()
 
+    def with_counts(self, *names):
+        return self.get_queryset().with_counts(*names)
+
 
 class InternalProjectManager(ProjectManager):
     def get_queryset(self):
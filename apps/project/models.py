@@ -21,7 +21,7 @@ from django.db.models import Q, Count
 from django.utils.text import slugify
 
 from web.api.views import get_media_root
-from web.core.models import UserModel, DateModel, StatusModel, OrderedModel, CleanModel
+from web.core.models import UserModel, DateModel, StatusModel, OrderedModel, CleanModel, FileMetadataModel
 from . import managers
 from web import exceptions as django_exception
 
@@ -31,11 +31,23 @@ from django.db.models.fields import Field
 from django.utils import timezone
 
 from ..document.models import document_limit_choices_to
+from ..message.models import MessageCounter
 from ..media.models import get_upload_photo_path
 
 import uuid
 import uuid
 
+
+def get_saved_fields(instance, excluded):
+    """
+    update_fields of a save leaving out the excluded fields
+    """
+    return [
+        field.name for field in instance._meta.concrete_fields
+        if not field.primary_key and field.name not in excluded
+    ]
+
+
 def get_upload_logo_path(instance, filename):
     media_dir = slugify(instance.name[0:2])
     ext = pathlib.Path(filename).suffix
@@ -85,6 +97,11 @@ class NotEqual(Lookup):
         return '%s <> %s' % (lhs, rhs), params
 
 
+# stored aggregates, see Project.get_completed_perc
+PROJECT_COMPLETION_AGGREGATES = ('tasks_progress_duration', 'tasks_duration')
+TASK_COMPLETION_AGGREGATES = ('internal_tasks_progress_days', 'internal_tasks_days')
+
+
 @python_2_unicode_compatible
 class Project(CleanModel, UserModel, DateModel, OrderedModel):
     objects = managers.ProjectManager()
@@ -139,6 +156,17 @@ class Project(CleanModel, UserModel, DateModel, OrderedModel):
         default=1,
         verbose_name=_('status'),
     )
+    # completion aggregates of the tasks, kept by the task signals
+    tasks_progress_duration = models.BigIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('tasks progress x duration'),
+    )
+    tasks_duration = models.IntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('tasks duration'),
+    )
     tags = JSONField(
         default={},
         blank=True, null=True,
@@ -200,12 +228,23 @@ class Project(CleanModel, UserModel, DateModel, OrderedModel):
     def __str__(self):
         return '{}: {} - {}'.format(self.company, self.referent, self.name)
 
+    def save(self, *args, **kwargs):
+        if self.pk is None:
+            # no tasks yet, a clone included
+            self.tasks_progress_duration = self.tasks_duration = 0
+        elif not self._state.adding and not kwargs.get('update_fields'):
+            # never write back the aggregates loaded with the project
+            kwargs['update_fields'] = get_saved_fields(self, PROJECT_COMPLETION_AGGREGATES)
+        return super(Project, self).save(*args, **kwargs)
+
     @property
     def get_tags_count(self):
         return len(self.tags) if self.tags else 0
 
     @property
     def get_tasks_count(self):
+        if 'tasks_count' in self.__dict__:
+            return self.tasks_count
         return self.tasks.count()
 
     get_tasks_count.fget.short_description = _('Tasks count')
@@ -225,6 +264,8 @@ class Project(CleanModel, UserModel, DateModel, OrderedModel):
 
     @property
     def get_members_count(self):
+        if 'members_count' in self.__dict__:
+            return self.members_count
         return self.members.count()
 
     get_members_count.fget.short_description = _('Members')
@@ -260,23 +301,16 @@ class Project(CleanModel, UserModel, DateModel, OrderedModel):
         return task
 
     def get_completed_perc(self):
-        # Todo: Improve percentage calculation
-        total_percentage = 0
-        total_duration = 0
-        for task in self.tasks.all():
-            total_percentage += task.progress_with_duration()
-            total_duration += task.duration()
-        if total_duration == 0 & total_percentage == 0:
+        # progress of the tasks weighted by their duration
+        if self.tasks_duration == 0:
             return 0
-        return "%.0f" % (total_percentage/total_duration)
+        return "%.0f" % (self.tasks_progress_duration / self.tasks_duration)
 
     @property
     def get_messages_count(self):
-        # Todo: Optimize the following code
-        total_messages = 0
-        for talk in self.talks.all():
-            total_messages += talk.get_messages_count
-        return total_messages
+        if 'messages_count' in self.__dict__:
+            return self.messages_count
+        return MessageCounter.get_messages_count(self)
 
     @property
     def get_project_owner(self):
@@ -392,6 +426,17 @@ class Task(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
         null=True, blank=True,
         verbose_name=_('note')
     )
+    # progress aggregates of the active internal tasks, kept by the task signals
+    internal_tasks_progress_days = models.BigIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('internal tasks progress x days'),
+    )
+    internal_tasks_days = models.IntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('internal tasks days'),
+    )
 
     class Meta:
         verbose_name = _('task')
@@ -411,6 +456,15 @@ class Task(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
             self.date_completed
         )
 
+    def save(self, *args, **kwargs):
+        if self.pk is None:
+            # no internal tasks yet, a clone included
+            self.internal_tasks_progress_days = self.internal_tasks_days = 0
+        elif not self._state.adding and not kwargs.get('update_fields'):
+            # never write back the aggregates loaded with the task
+            kwargs['update_fields'] = get_saved_fields(self, TASK_COMPLETION_AGGREGATES)
+        return super(Task, self).save(*args, **kwargs)
+
     def duration(self):
         if self.date_completed:
             days = (self.date_completed - self.date_start).days
@@ -609,6 +663,48 @@ class Team(CleanModel, UserModel, DateModel, StatusModel, OrderedModel):
             return "Worker"
         return self.role
 
+
+@python_2_unicode_compatible
+class ProjectAccess(models.Model):
+    """
+    Projects visible by a profile, denormalized from the active Team
+    members and the owners/delegates of the project company.
+    Maintained by the signals of Team, Project and Profile, see
+    apps.project.utils.sync_project_access
+    """
+    profile = models.ForeignKey(
+        'profile.Profile',
+        on_delete=models.CASCADE,
+        related_name='project_access',
+        verbose_name=_('profile'),
+    )
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='access',
+        verbose_name=_('project'),
+    )
+    # team role of the member, company role otherwise
+    role = models.CharField(
+        max_length=1,
+        choices=settings.PROJECT_TEAM_ROLE_CHOICES,
+        verbose_name=_('role'),
+    )
+    via_company = models.BooleanField(default=False, verbose_name=_('via company'))
+
+    class Meta:
+        verbose_name = _('project access')
+        verbose_name_plural = _('project accesses')
+        unique_together = (
+            ('profile', 'project',),
+        )
+
+    def __str__(self):
+        return '{} {} ({})'.format(
+            self.project_id, self.profile_id, self.role,
+        )
+
+
 @python_2_unicode_compatible
 class ProjectCompanyColorAssignment(models.Model):
     project = models.ForeignKey('project.Project', on_delete=models.CASCADE)
@@ -616,7 +712,9 @@ class ProjectCompanyColorAssignment(models.Model):
     color = models.CharField(max_length=10)
 
 @python_2_unicode_compatible
-class MediaAssignment(OrderedModel):
+class MediaAssignment(FileMetadataModel, OrderedModel):
+    metadata_file_field = 'media'
+
     post = models.ForeignKey('project.Post', on_delete=models.CASCADE, null=True, blank=True)
     comment = models.ForeignKey('project.Comment', on_delete=models.CASCADE, null=True, blank=True)
     activity = models.ForeignKey('project.Activity', on_delete=models.CASCADE, null=True, blank=True)
@@ -654,6 +752,15 @@ class Post(OrderedModel):
         verbose_name = _('post')
         verbose_name_plural = _('posts')
         ordering = ('-created_date', )
+        indexes = [
+            # KeysetPagination
+            models.Index(fields=['created_date', 'id'], name='post_date_id_idx'),
+            # alert feeds, the few alert posts only
+            models.Index(fields=['task', 'created_date', 'id'], name='post_alert_task_idx',
+                         condition=Q(alert=True)),
+            models.Index(fields=['sub_task', 'created_date', 'id'], name='post_alert_sub_task_idx',
+                         condition=Q(alert=True)),
+        ]
 
     def publish(self):
         self.published_date = timezone.now()
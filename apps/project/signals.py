@@ -3,19 +3,19 @@ import json
 import logging
 
 import emoji
-from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.contrib.contenttypes.models import ContentType
 
-from web.settings import BASE_URL, PROTOCOL
 from web.utils import build_array_message
 from . import models as project_models
-from apps.notify import models as notify_models
-from web.core.middleware.thread_local import get_current_profile
-from web.core.utils import get_bell_notification_status, get_email_notification_status
-from ..notify.signals import send_push_notification
+from .utils import (
+    TASK_COMPLETION_FIELDS, apply_task_completion, get_task_completion, sync_project_access_on_commit
+)
+from apps.notify.utils import create_notify_event
+from web.core.media_urls import get_media_url_builder
+from web.core.middleware.thread_local import get_current_profile, get_current_request
 
 # @receiver([post_save, post_delete], sender=project_models.Project)
 # def project_notification(sender, instance, **kwargs):
@@ -68,6 +68,7 @@ from ..notify.signals import send_push_notification
 #
 #     except Exception as e:
 #         print(e)
+from ..profile import models as profile_models
 from ..profile.models import Company
 
 EMOJI_UNICODES = {
@@ -121,26 +122,12 @@ def remove_team_member_notification(sender, instance, member_id):
         })
         type = ContentType.objects.get(model=sender.__name__.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
+        create_notify_event(
             sender=profile, subject=subject, body=body,
             content_type=type, object_id=member_id,
-            creator=profile.user, last_modifier=profile.user
+            recipients=[instance.profile], event=sender.__name__.lower(),
+            push_body=body
         )
-
-        bell_status = get_bell_notification_status(
-            instance.profile, sender.__name__.lower()
-        )
-        email_status = get_email_notification_status(
-            instance.profile, sender.__name__.lower()
-        )
-        translation.activate(profile.user.get_main_profile().language)
-        if bell_status or email_status:
-            notify_recipient = notify_models.NotificationRecipient(
-                notification=notify_obj, is_email=email_status,
-                is_notify=bell_status, recipient=instance.profile,
-                creator=profile.user, last_modifier=profile.user)
-            notify_recipient.save()
-            send_push_notification(notify_obj, instance.profile, subject, body)
     except Exception as e:
         print(e)
 
@@ -172,26 +159,12 @@ def team_invite_notification(sender, instance, **kwargs):
         })
         type = ContentType.objects.get(model=sender.__name__.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
+        create_notify_event(
             sender=profile, subject=subject, body=body,
             content_type=type, object_id=instance.id,
-            creator=profile.user, last_modifier=profile.user
+            recipients=[instance.profile], event=sender.__name__.lower(),
+            push_body=body
         )
-
-        bell_status = get_bell_notification_status(
-            instance.profile, sender.__name__.lower()
-        )
-        email_status = get_email_notification_status(
-            instance.profile, sender.__name__.lower()
-        )
-        translation.activate(profile.user.get_main_profile().language)
-        if bell_status or email_status:
-            notify_recipient = notify_models.NotificationRecipient(
-                notification=notify_obj, is_email=email_status,
-                is_notify=bell_status, recipient=instance.profile,
-                creator=profile.user, last_modifier=profile.user)
-            notify_recipient.save()
-            send_push_notification(notify_obj, instance.profile, subject, body)
     except Exception as e:
         print(e)
 
@@ -235,28 +208,13 @@ def team_notification(sender, instance, **kwargs):
         })
         type = ContentType.objects.get(model=sender.__name__.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
-            sender=profile, subject=subject, body=body,
-            content_type=type, object_id=instance.id,
-            creator=profile.user, last_modifier=profile.user
-        )
-
-        bell_status = get_bell_notification_status(
-            instance.profile, sender.__name__.lower()
-        )
-        email_status = get_email_notification_status(
-            instance.profile, sender.__name__.lower()
-        )
-        translation.activate(instance.profile.user.get_main_profile().language)
-        if bell_status or email_status:
-            if 'created' in kwargs:
-                if not kwargs['created']:
-                    notify_recipient = notify_models.NotificationRecipient(
-                        notification=notify_obj, is_email=email_status,
-                        is_notify=bell_status, recipient=instance.profile,
-                        creator=profile.user, last_modifier=profile.user)
-                    notify_recipient.save()
-                    send_push_notification(notify_obj, instance.profile, subject, body)
+        if 'created' in kwargs and not kwargs['created']:
+            create_notify_event(
+                sender=profile, subject=subject, body=body,
+                content_type=type, object_id=instance.id,
+                recipients=[instance.profile], event=sender.__name__.lower(),
+                push_body=body
+            )
     except Exception as e:
         print(e)
 
@@ -289,27 +247,12 @@ def close_project_notification(sender, instance, **kwargs):
         })
         type = ContentType.objects.get(model=sender.__name__.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
+        create_notify_event(
             sender=profile, subject=subject, body=body,
             content_type=type, object_id=instance.id,
-            creator=profile.user, last_modifier=profile.user
+            recipients=company_staff, event=sender.__name__.lower(),
+            push_body=body, exclude_sender=True
         )
-        for staff in company_staff:
-            bell_status = get_bell_notification_status(
-                staff, sender.__name__.lower()
-            )
-            email_status = get_email_notification_status(
-                staff, sender.__name__.lower()
-            )
-            translation.activate(profile.user.get_main_profile().language)
-            if bell_status or email_status:
-                if staff != profile:
-                    notify_recipient = notify_models.NotificationRecipient(
-                        notification=notify_obj, is_email=email_status,
-                        is_notify=bell_status, recipient=staff,
-                        creator=profile.user, last_modifier=profile.user)
-                    notify_recipient.save()
-                    send_push_notification(notify_obj, staff, subject, body)
     except Exception as e:
         print(e)
 
@@ -355,30 +298,14 @@ def task_notification(sender, instance, **kwargs):
         type = ContentType.objects.get(model=sender.__name__.lower())
         if instance.assigned_company:
             company_staff = instance.project.profiles.filter(company=instance.assigned_company)
-            notify_obj = notify_models.Notify.objects.create(
+            push_body = json.loads(body)
+            push_body['url'] = endpoint + '/{}/'.format(instance.id)
+            create_notify_event(
                 sender=profile, subject=subject, body=body,
                 content_type=type, object_id=instance.id,
-                creator=profile.user, last_modifier=profile.user
+                recipients=company_staff, event=sender.__name__.lower(),
+                push_body=json.dumps(push_body), exclude_sender=True
             )
-            for staff in company_staff:
-                bell_status = get_bell_notification_status(
-                    staff, sender.__name__.lower()
-                )
-                email_status = get_email_notification_status(
-                    staff, sender.__name__.lower()
-                )
-                translation.activate(staff.user.get_main_profile().language)
-                if bell_status or email_status:
-                    if staff != profile:
-                        notify_recipient = notify_models.NotificationRecipient(
-                            notification=notify_obj, is_email=email_status,
-                            is_notify=bell_status, recipient=staff,
-                            creator=profile.user, last_modifier=profile.user)
-                        notify_recipient.save()
-                        body = json.loads(body)
-                        body['url'] = endpoint + '/{}/'.format(instance.id)
-                        body = json.dumps(body)
-                        send_push_notification(notify_obj, staff, subject, body)
 
     except Exception as e:
         print(e)
@@ -432,33 +359,16 @@ def activity_notification(sender, instance, **kwargs):
         })
         type = ContentType.objects.get(model=sender.__name__.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
+        push_body = json.loads(body)
+        push_body['url'] = endpoint + \
+                           '/{}/activity/{}/'.format(instance.task.id, instance.id)
+        create_notify_event(
             sender=profile, subject=subject, body=body,
             content_type=type, object_id=instance.id,
-            creator=profile.user, last_modifier=profile.user
+            recipients=company_staff, event=sender.__name__.lower(),
+            push_body=json.dumps(push_body), exclude_sender=True
         )
 
-        for staff in company_staff:
-            bell_status = get_bell_notification_status(
-                staff, sender.__name__.lower()
-            )
-            email_status = get_email_notification_status(
-                staff, sender.__name__.lower()
-            )
-            translation.activate(staff.user.get_main_profile().language)
-            if bell_status or email_status:
-                if staff != profile:
-                    notify_recipient = notify_models.NotificationRecipient(
-                        notification=notify_obj, is_email=email_status,
-                        is_notify=bell_status, recipient=staff,
-                        creator=profile.user, last_modifier=profile.user)
-                    notify_recipient.save()
-                    body = json.loads(body)
-                    body['url'] = endpoint + \
-                                  '/{}/activity/{}/'.format(instance.task.id, instance.id)
-                    body = json.dumps(body)
-                    send_push_notification(notify_obj, staff, subject, body)
-
     except Exception as e:
         print(e)
 
@@ -562,42 +472,33 @@ def alert_notification(sender, instance, **kwargs):
             })
         type = ContentType.objects.get(model=sender.__name__.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
+        push_body = json.loads(body)
+        if post_for_model == 'task':
+            push_body['url'] = endpoint + \
+                               '/{}/post/{}/'.format(instance.task.id, instance.id)
+        else:
+            push_body['url'] = endpoint + '/{}/activity/{}/post/{}/'.format(
+                instance.sub_task.task.id, instance.sub_task.id, instance.id)
+        create_notify_event(
             sender=profile, subject=subject, body=body,
             content_type=type, object_id=instance.id,
-            creator=profile.user, last_modifier=profile.user
+            recipients=company_staff, event=sender.__name__.lower(),
+            push_body=json.dumps(push_body), exclude_sender=True
         )
-
-        for staff in company_staff:
-            bell_status = get_bell_notification_status(
-                staff, sender.__name__.lower()
-            )
-            email_status = get_email_notification_status(
-                staff, sender.__name__.lower()
-            )
-            translation.activate(staff.user.get_main_profile().language)
-            if bell_status or email_status:
-                if staff != profile:
-                    notify_recipient = notify_models.NotificationRecipient(
-                        notification=notify_obj, is_email=email_status,
-                        is_notify=bell_status, recipient=staff,
-                        creator=profile.user, last_modifier=profile.user)
-                    notify_recipient.save()
-                    body = json.loads(body)
-                    if post_for_model == 'task':
-                        body['url'] = endpoint + \
-                                      '/{}/post/{}/'.format(instance.task.id, instance.id)
-                        body = json.dumps(body)
-                        send_push_notification(notify_obj, staff, subject, body)
-                    else:
-                        body['url'] = endpoint + '/{}/activity/{}/post/{}/'.format(
-                            instance.sub_task.task.id, instance.sub_task.id, instance.id)
-                        body = json.dumps(body)
-                        send_push_notification(notify_obj, staff, subject, body)
     except Exception as e:
         print(e)
 
 
+def get_big_picture(instance):
+    """
+    Url of the first media of a post or comment, shown in the push
+    """
+    media = instance.mediaassignment_set.first()
+    if media is None:
+        return ''
+    return get_media_url_builder(get_current_request()).file_url(media.media) or ''
+
+
 # @receiver([post_save, post_delete], sender=project_models.Post)
 def post_notification(sender, instance, request, **kwargs):
     if not 'company_ids' in request.data:
@@ -667,7 +568,7 @@ def post_notification(sender, instance, request, **kwargs):
             body = json.dumps({
                 'content': content,
                 'url': endpoint,
-                'big_picture': PROTOCOL + '://back.edilcloud.io' + instance.mediaassignment_set.all()[0].media.url if instance.mediaassignment_set.all().count() > 0 else '',
+                'big_picture': get_big_picture(instance),
                 'activity_id': instance.sub_task.id,
                 'task_id': instance.sub_task.task.id,
                 'project_id': instance.sub_task.task.project.id
@@ -676,43 +577,23 @@ def post_notification(sender, instance, request, **kwargs):
             body = json.dumps({
                 'content': content,
                 'url': endpoint,
-                'big_picture': PROTOCOL + '://back.edilcloud.io' + instance.mediaassignment_set.all()[
-                    0].media.url if instance.mediaassignment_set.all().count() > 0 else '',
+                'big_picture': get_big_picture(instance),
                 'task_id': instance.task.id,
                 'project_id': instance.task.project.id
             })
         type = ContentType.objects.get(model=sender.__name__.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
+        push_body = json.loads(body)
+        if post_for_model == 'task':
+            push_body['url'] = endpoint + '/{}/post/{}/'.format(instance.task.id, instance.id)
+        else:
+            push_body['url'] = endpoint + '/{}/post/{}/'.format(instance.sub_task.id, instance.id)
+        create_notify_event(
             sender=profile, subject=subject, body=body,
             content_type=type, object_id=instance.id,
-            creator=profile.user, last_modifier=profile.user
+            recipients=company_staff, event=sender.__name__.lower(),
+            push_body=json.dumps(push_body), exclude_sender=True
         )
-
-        for staff in company_staff:
-            bell_status = get_bell_notification_status(
-                staff, sender.__name__.lower()
-            )
-            email_status = get_email_notification_status(
-                staff, sender.__name__.lower()
-            )
-            translation.activate(staff.user.get_main_profile().language)
-            if bell_status or email_status:
-                if staff != profile:
-                    notify_recipient = notify_models.NotificationRecipient(
-                        notification=notify_obj, is_email=email_status,
-                        is_notify=bell_status, recipient=staff,
-                        creator=profile.user, last_modifier=profile.user)
-                    notify_recipient.save()
-                    body = json.loads(body)
-                    if post_for_model == 'task':
-                        body['url'] = endpoint + '/{}/post/{}/'.format(instance.task.id, instance.id)
-                        body = json.dumps(body)
-                        send_push_notification(notify_obj, staff, subject, body)
-                    else:
-                        body['url'] = endpoint + '/{}/post/{}/'.format(instance.sub_task.id, instance.id)
-                        body = json.dumps(body)
-                        send_push_notification(notify_obj, staff, subject, body)
     except Exception as e:
         print(e)
 
@@ -786,15 +667,13 @@ def comment_notification(sender, instance, kwargs=None):
             body = {
                 'content': content,
                 'url': endpoint,
-                'big_picture': PROTOCOL + '://back.edilcloud.io' + instance.mediaassignment_set.all()[
-                    0].media.url if instance.mediaassignment_set.all().count() > 0 else '',
+                'big_picture': get_big_picture(instance),
                 'comment_id': instance.parent.id,
             }
         else:
             body = {
                 'content': content,
-                'big_picture': PROTOCOL + '://back.edilcloud.io' + instance.mediaassignment_set.all()[
-                    0].media.url if instance.mediaassignment_set.all().count() > 0 else '',
+                'big_picture': get_big_picture(instance),
                 'url': endpoint,
             }
         if instance.post.task:
@@ -808,36 +687,84 @@ def comment_notification(sender, instance, kwargs=None):
         body = json.dumps(body)
         type = ContentType.objects.get(model=sender.__name__.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
+        push_body = json.loads(body)
+        if post_for_model == 'task':
+            push_body['url'] = endpoint + '/{}/post/{}/comment/{}/'.format(instance.post.task.id, instance.post.id,
+                                                                           instance.id)
+        else:
+            push_body['url'] = endpoint + '/{}/activity/{}/post/{}/comment/{}/'.format(
+                instance.post.sub_task.task.id, instance.post.sub_task.id, instance.post.id, instance.id)
+        create_notify_event(
             sender=profile, subject=subject, body=body,
             content_type=type, object_id=instance.id,
-            creator=profile.user, last_modifier=profile.user
+            recipients=company_staff, event=sender.__name__.lower(),
+            push_body=json.dumps(push_body)
         )
-
-        for staff in company_staff:
-            bell_status = get_bell_notification_status(
-                staff, sender.__name__.lower()
-            )
-            email_status = get_email_notification_status(
-                staff, sender.__name__.lower()
-            )
-            translation.activate(staff.user.get_main_profile().language)
-            if bell_status or email_status:
-                notify_recipient = notify_models.NotificationRecipient(
-                    notification=notify_obj, is_email=email_status,
-                    is_notify=bell_status, recipient=staff,
-                    creator=profile.user, last_modifier=profile.user)
-                notify_recipient.save()
-                body = json.loads(body)
-                if post_for_model == 'task':
-                    body['url'] = endpoint + '/{}/post/{}/comment/{}/'.format(instance.post.task.id, instance.post.id,
-                                                                              instance.id)
-                    body = json.dumps(body)
-                    send_push_notification(notify_obj, staff, subject, body)
-                else:
-                    body['url'] = endpoint + '/{}/activity/{}/post/{}/comment/{}/'.format(
-                        instance.post.sub_task.task.id, instance.post.sub_task.id, instance.post.id, instance.id)
-                    body = json.dumps(body)
-                    send_push_notification(notify_obj, staff, subject, body)
     except Exception as e:
         logging.error(e.__str__())
+
+
+@receiver([post_save, post_delete], sender=project_models.Team)
+def team_project_access(sender, instance, **kwargs):
+    sync_project_access_on_commit(projects=[instance.project_id], profiles=[instance.profile_id])
+
+
+@receiver([pre_save], sender=project_models.Project)
+def project_access_pre_save(sender, instance, **kwargs):
+    instance._access_company_id = sender.objects.filter(
+        pk=instance.pk).values_list('company_id', flat=True).first() if instance.pk else None
+
+
+@receiver([post_save], sender=project_models.Project)
+def project_project_access(sender, instance, created, **kwargs):
+    if created or instance.company_id != getattr(instance, '_access_company_id', None):
+        sync_project_access_on_commit(projects=[instance.pk])
+
+
+@receiver([pre_save], sender=profile_models.Profile)
+@receiver([pre_save], sender=profile_models.MainProfile)
+@receiver([pre_save], sender=profile_models.PhantomProfile)
+@receiver([pre_save], sender=profile_models.GuestProfile)
+@receiver([pre_save], sender=profile_models.OwnerProfile)
+@receiver([pre_save], sender=profile_models.DelegateProfile)
+@receiver([pre_save], sender=profile_models.Level1Profile)
+@receiver([pre_save], sender=profile_models.Level2Profile)
+def profile_access_pre_save(sender, instance, **kwargs):
+    instance._access_role = profile_models.Profile.objects.filter(
+        pk=instance.pk).values_list('role', 'company_id').first() if instance.pk else None
+
+
+@receiver([post_save], sender=profile_models.Profile)
+@receiver([post_save], sender=profile_models.MainProfile)
+@receiver([post_save], sender=profile_models.PhantomProfile)
+@receiver([post_save], sender=profile_models.GuestProfile)
+@receiver([post_save], sender=profile_models.OwnerProfile)
+@receiver([post_save], sender=profile_models.DelegateProfile)
+@receiver([post_save], sender=profile_models.Level1Profile)
+@receiver([post_save], sender=profile_models.Level2Profile)
+def profile_project_access(sender, instance, created, **kwargs):
+    # the company role gives access to the company projects
+    if created or (instance.role, instance.company_id) != getattr(instance, '_access_role', None):
+        sync_project_access_on_commit(profiles=[instance.pk])
+
+
+@receiver([pre_save], sender=project_models.Task)
+def task_completion_pre_save(sender, instance, **kwargs):
+    instance._completion = get_task_completion(sender.objects.filter(
+        pk=instance.pk).values(*TASK_COMPLETION_FIELDS).first() if instance.pk else None)
+
+
+@receiver([post_save], sender=project_models.Task)
+def task_completion(sender, instance, **kwargs):
+    # the saved values, the instance may hold unconverted ones
+    apply_task_completion(
+        getattr(instance, '_completion', {}),
+        get_task_completion(sender.objects.filter(pk=instance.pk).values(*TASK_COMPLETION_FIELDS).first())
+    )
+
+
+@receiver([post_delete], sender=project_models.Task)
+def task_completion_delete(sender, instance, **kwargs):
+    apply_task_completion(get_task_completion({
+        field: getattr(instance, field) for field in TASK_COMPLETION_FIELDS
+    }), {})
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.profile.models import Company, Profile
+from apps.project.api.frontend.views.tracker_views import TrackerProjectTaskListView, TrackerTaskPostsListView
+from apps.project.models import Activity, Post, Project, Task, TaskPostAssignment
+
+
+class PrefetchPlanTest(TestCase):
+    """
+    The queries of the task trees and of the post lists don't grow
+    with the number of tasks, activities and posts
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user('prefetch', 'prefetch@example.com', 'prefetch')
+        self.company = Company.objects.create(
+            name='Prefetch', slug='prefetch', creator=self.user, last_modifier=self.user
+        )
+        self.profile = Profile.objects.create(
+            user=self.user, company=self.company, role='o', language='it',
+            first_name='Mario', last_name='Rossi', creator=self.user, last_modifier=self.user
+        )
+        self.project = Project.objects.create(
+            company=self.company, name='Prefetch', date_start=datetime.date(2021, 1, 1),
+            creator=self.user, last_modifier=self.user
+        )
+
+    def create_task(self, index):
+        task = Task.objects.create(
+            project=self.project, assigned_company=self.company, name='task {}'.format(index),
+            date_start=datetime.date(2021, 1, 1), date_end=datetime.date(2021, 1, 31),
+            creator=self.user, last_modifier=self.user
+        )
+        for i in range(2):
+            activity = Activity.objects.create(
+                task=task, title='activity {}'.format(i),
+                datetime_start=datetime.date(2021, 1, 1), datetime_end=datetime.date(2021, 1, 10),
+                creator=self.user, last_modifier=self.user
+            )
+            activity.workers.add(self.profile)
+        post = Post.objects.create(author=self.profile, task=task, text='post {}'.format(index))
+        TaskPostAssignment.objects.create(task=task, post=post, creator=self.user, last_modifier=self.user)
+        return task
+
+    def get_view(self, view_class, **kwargs):
+        request = Request(APIRequestFactory().get('/'))
+        request.user = self.user
+        request.profile = self.profile
+        view = view_class()
+        view.request = request
+        view.kwargs = kwargs
+        view.format_kwarg = None
+        return view
+
+    def count_queries(self, view, get_items):
+        with CaptureQueriesContext(connection) as context:
+            view.get_serializer(view.apply_prefetch_plan(get_items()), many=True).data
+        return len(context.captured_queries)
+
+    def assertBoundedQueries(self, view, get_items):
+        self.create_task(0)
+        queries = self.count_queries(view, get_items)
+        for i in range(1, 5):
+            self.create_task(i)
+        self.assertEqual(self.count_queries(view, get_items), queries)
+
+    def test_task_tree(self):
+        view = self.get_view(TrackerProjectTaskListView, pk=self.project.pk)
+        self.assertBoundedQueries(view, lambda: Task.objects.filter(project=self.project))
+
+    def test_post_list(self):
+        # a list, as returned by list_task_posts
+        view = self.get_view(TrackerTaskPostsListView)
+        self.assertBoundedQueries(view, lambda: list(Post.objects.filter(task__project=self.project)))
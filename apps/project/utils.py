@@ -1,4 +1,185 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+from web.functions import DateDiff, subquery_sum
+
 # Create your utils here.
+
+# company roles seeing all the projects of the company
+PROJECT_ACCESS_COMPANY_ROLES = (settings.OWNER, settings.DELEGATE)
+PROJECT_ACCESS_BATCH_SIZE = 1000
+
+
+def get_project_access(projects=None, profiles=None):
+    """
+    {(profile_id, project_id): (role, via_company)} of the ProjectAccess
+    rows expected for the projects and the profiles (querysets or ids),
+    all of them if None: the active team members, with their team role,
+    and the owners/delegates of the project company
+    """
+    from apps.profile.models import Profile
+    from .models import Project, Team
+
+    teams = Team.objects.filter(status=1)
+    company_projects = Project.objects.all()
+    owners = Profile.objects.filter(role__in=PROJECT_ACCESS_COMPANY_ROLES, company__isnull=False)
+    if projects is not None:
+        teams = teams.filter(project__in=projects)
+        company_projects = company_projects.filter(id__in=projects)
+    if profiles is not None:
+        teams = teams.filter(profile__in=profiles)
+        owners = owners.filter(id__in=profiles)
+
+    access = {}
+    for profile_id, project_id, role in teams.values_list('profile_id', 'project_id', 'role').iterator():
+        access[(profile_id, project_id)] = (role, False)
+
+    projects_by_company = {}
+    company_projects = company_projects.filter(company_id__in=owners.values('company_id'))
+    for project_id, company_id in company_projects.values_list('id', 'company_id').iterator():
+        projects_by_company.setdefault(company_id, []).append(project_id)
+    owners = owners.filter(company_id__in=list(projects_by_company))
+    for profile_id, company_id, role in owners.values_list('id', 'company_id', 'role').iterator():
+        for project_id in projects_by_company[company_id]:
+            key = (profile_id, project_id)
+            access[key] = (access[key][0] if key in access else role, True)
+    return access
+
+
+def sync_project_access(projects=None, profiles=None, dry_run=False):
+    """
+    Align the ProjectAccess rows of the projects and the profiles (querysets
+    or ids, all of them if None) with Team, Project and Profile.
+    Returns the (missing, stale, changed) rows, written unless dry_run
+    """
+    from .models import ProjectAccess
+
+    missing = get_project_access(projects, profiles)
+    rows = ProjectAccess.objects.all()
+    if projects is not None:
+        rows = rows.filter(project__in=projects)
+    if profiles is not None:
+        rows = rows.filter(profile__in=profiles)
+
+    stale = []
+    changed = []
+    for row in rows.values_list('id', 'profile_id', 'project_id', 'role', 'via_company').iterator():
+        expected = missing.pop((row[1], row[2]), None)
+        if expected is None:
+            stale.append(row)
+        elif expected != row[3:]:
+            changed.append(row[:3] + expected)
+
+    if not dry_run and (missing or stale or changed):
+        with transaction.atomic():
+            for i in range(0, len(stale), PROJECT_ACCESS_BATCH_SIZE):
+                ProjectAccess.objects.filter(
+                    id__in=[row[0] for row in stale[i:i + PROJECT_ACCESS_BATCH_SIZE]]
+                ).delete()
+            for row_id, profile_id, project_id, role, via_company in changed:
+                ProjectAccess.objects.filter(id=row_id).update(role=role, via_company=via_company)
+            # rows added meanwhile by a concurrent sync are skipped
+            ProjectAccess.objects.bulk_create([
+                ProjectAccess(profile_id=profile_id, project_id=project_id, role=role, via_company=via_company)
+                for (profile_id, project_id), (role, via_company) in missing.items()
+            ], batch_size=PROJECT_ACCESS_BATCH_SIZE, ignore_conflicts=True)
+    return missing, stale, changed
+
+
+def sync_project_access_on_commit(projects=None, profiles=None):
+    # after the commit the cascades are done, a deleted project or
+    # profile has no rows left to align
+    transaction.on_commit(lambda: sync_project_access(projects=projects, profiles=profiles))
+
+
+# task fields of the completion aggregates
+TASK_COMPLETION_FIELDS = ('project_id', 'shared_task_id', 'status', 'progress',
+                          'date_start', 'date_end', 'date_completed')
+
+
+def get_task_completion(task):
+    """
+    {(model name, pk): (progress x duration, duration)} added by the task
+    (dict of TASK_COMPLETION_FIELDS) to the aggregates of its project,
+    see Project.get_completed_perc, and of its active shared task,
+    see OwnerProfile.update_shared_task_progress
+    """
+    if not task:
+        return {}
+    duration = ((task['date_completed'] or task['date_end']) - task['date_start']).days + 1
+    completion = {('project', task['project_id']): (task['progress'] * duration, duration)}
+    if task['shared_task_id'] and task['status'] == 1:
+        days = (task['date_end'] - task['date_start']).days
+        completion[('task', task['shared_task_id'])] = (task['progress'] * days, days)
+    return completion
+
+
+def apply_task_completion(old, new):
+    """
+    Add the difference of two get_task_completion to the stored aggregates
+    """
+    from .models import Project, Task
+
+    for model, pk in set(old) | set(new):
+        old_values = old.get((model, pk), (0, 0))
+        new_values = new.get((model, pk), (0, 0))
+        progress_duration = new_values[0] - old_values[0]
+        duration = new_values[1] - old_values[1]
+        if not progress_duration and not duration:
+            continue
+        if model == 'project':
+            Project.objects.filter(pk=pk).update(
+                tasks_progress_duration=F('tasks_progress_duration') + progress_duration,
+                tasks_duration=F('tasks_duration') + duration,
+            )
+        else:
+            Task.objects.filter(pk=pk).update(
+                internal_tasks_progress_days=F('internal_tasks_progress_days') + progress_duration,
+                internal_tasks_days=F('internal_tasks_days') + duration,
+            )
+
+
+def get_project_completion_annotations():
+    """
+    The project completion aggregates computed in SQL from the tasks
+    """
+    from .models import Task
+
+    def duration():
+        return DateDiff(Coalesce('date_completed', 'date_end'), 'date_start') + 1
+    return {
+        'tasks_progress_duration': subquery_sum(Task.objects.all(), 'project', F('progress') * duration()),
+        'tasks_duration': subquery_sum(Task.objects.all(), 'project', duration()),
+    }
+
+
+def get_shared_task_completion_annotations():
+    """
+    The shared task completion aggregates computed in SQL from the
+    active internal tasks
+    """
+    from .models import Task
+
+    internal_tasks = Task.objects.filter(status=1)
+    return {
+        'internal_tasks_progress_days': subquery_sum(
+            internal_tasks, 'shared_task', F('progress') * DateDiff('date_end', 'date_start')
+        ),
+        'internal_tasks_days': subquery_sum(internal_tasks, 'shared_task', DateDiff('date_end', 'date_start')),
+    }
+
+
+def update_task_completion(projects=None, tasks=None):
+    """
+    Recompute in SQL the aggregates of the projects and of the shared
+    tasks (querysets), for the changes skipping the task signals
+    """
+    if projects is not None:
+        projects.update(**get_project_completion_annotations())
+    if tasks is not None:
+        tasks.update(**get_shared_task_completion_annotations())
@@ -26,8 +26,7 @@ class TrackerBomMixin(
     """
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             if 'type' in self.kwargs:
                 get_method = 'get_{}_bom'.format(self.kwargs['type'])
                 bom = getattr(profile, get_method)(self.kwargs.get('pk', None))
@@ -182,8 +181,7 @@ class TrackerBomSenderListView(
         super(TrackerBomSenderListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_sent_boms()
         self.queryset = self.queryset.exclude(archived_boms__company=profile.company)
         return super(TrackerBomSenderListView, self).get_queryset().select_related(
@@ -240,8 +238,7 @@ class TrackerBomDraftListView(
         super(TrackerBomDraftListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_draft_boms()
         return super(TrackerBomDraftListView, self).get_queryset().select_related(
             'project',
@@ -297,8 +294,7 @@ class TrackerBomReceiverListView(
         super(TrackerBomReceiverListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_received_boms()
         self.queryset = self.queryset.exclude(archived_boms__company=profile.company)
         return super(TrackerBomReceiverListView, self).get_queryset().select_related(
@@ -473,8 +469,7 @@ class TrackerBomDeleteView(
         super(TrackerBomDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_bom(instance)
 
 
@@ -496,8 +491,7 @@ class TrackerBomBomTypeDocumentListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             list_method = 'list_{}_boms'.format(self.kwargs['type'])
             bom = getattr(profile, list_method)().get(id=self.kwargs.get('pk'))
             qs_method = 'list_{}_bom_documents'.format(self.kwargs['type'])
@@ -522,13 +516,12 @@ class TrackerBomBomTypePhotoListView(
     serializer_class = media_serializers.PhotoSerializer
 
     def __init__(self, *args, **kwargs):
-        self.photo_response_include_fields = ['id', 'title', 'pub_date', 'photo', 'note', 'tags', 'extension', 'photo_64']
+        self.photo_response_include_fields = ['id', 'title', 'pub_date', 'photo', 'note', 'tags', 'extension', 'renditions']
         super(TrackerBomBomTypePhotoListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             list_method = 'list_{}_boms'.format(self.kwargs['type'])
             bom = getattr(profile, list_method)().get(id=self.kwargs.get('pk'))
             qs_method = 'list_{}_bom_photos'.format(self.kwargs['type'])
@@ -558,8 +551,7 @@ class TrackerBomBomTypeVideoListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             list_method = 'list_{}_boms'.format(self.kwargs['type'])
             bom = getattr(profile, list_method)().get(id=self.kwargs.get('pk'))
             qs_method = 'list_{}_bom_videos'.format(self.kwargs['type'])
@@ -578,8 +570,7 @@ class TrackerBomRowMixin(
     """
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             if 'bom_type' in self.kwargs:
                 get_method = 'get_{}_bomrow'.format(self.kwargs['bom_type'])
                 bomrow = getattr(profile, get_method)(self.kwargs.get('pk', None))
@@ -679,8 +670,7 @@ class TrackerBomBomRowListView(
         super(TrackerBomBomRowListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_bomrows(self.kwargs.get('pk'))
         return super(TrackerBomBomRowListView, self).get_queryset()
 
@@ -719,8 +709,7 @@ class TrackerBomBomTypeBomRowListView(
         super(TrackerBomBomTypeBomRowListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         if 'type' in self.kwargs:
             list_method = 'list_{}_bomrows'.format(self.kwargs['type'])
             self.queryset = getattr(profile, list_method)(self.kwargs.get('pk'))
@@ -857,8 +846,7 @@ class TrackerBomRowDeleteView(
         super(TrackerBomRowDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_bomrow(instance)
 
 
@@ -905,8 +893,7 @@ class TrackerQuotationMixin(
     def get_object(self):
         try:
 
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             if 'type' in self.kwargs:
                 get_method = 'get_{}_quotation'.format(self.kwargs['type'])
                 quotation = getattr(profile, get_method)(self.kwargs.get('pk', None))
@@ -954,8 +941,7 @@ class TrackerQuotationSenderListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.list_sent_quotations()
             self.queryset = self.queryset.exclude(archived_quotations__company=profile.company)
             return super(TrackerQuotationSenderListView, self).get_queryset().select_related(
@@ -999,8 +985,7 @@ class TrackerQuotationReceiverListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.list_received_quotations()
             self.queryset = self.queryset.exclude(archived_quotations__company=profile.company)
             return super(TrackerQuotationReceiverListView, self).get_queryset().select_related(
@@ -1044,8 +1029,7 @@ class TrackerQuotationDraftListView(
 
     def get_queryset(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             self.queryset = profile.list_draft_quotations()
             return super(TrackerQuotationDraftListView, self).get_queryset().select_related(
                 'bom',
@@ -1250,8 +1234,7 @@ class TrackerQuotationDeleteView(
         super(TrackerQuotationDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_quotation(instance)
 
 
@@ -1297,8 +1280,7 @@ class TrackerQuotationRowMixin(
     """
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             quotationrow = profile.get_quotationrow(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, quotationrow)
             return quotationrow
@@ -1352,8 +1334,7 @@ class TrackerQuotationQuotationRowListView(
         super(TrackerQuotationQuotationRowListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_quotationrows(self.kwargs.get('pk'))
         return super(TrackerQuotationQuotationRowListView, self).get_queryset()
 
@@ -1396,8 +1377,7 @@ class TrackerQuotationQuotationTypeQuotationRowListView(
         super(TrackerQuotationQuotationTypeQuotationRowListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         if 'type' in self.kwargs:
             list_method = 'list_{}_quotationrows'.format(self.kwargs['type'])
             self.queryset = getattr(profile, list_method)(self.kwargs.get('pk'))
@@ -1561,8 +1541,7 @@ class TrackerQuotationRowDeleteView(
         super(TrackerQuotationRowDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_quotationrow(instance)
 
 
@@ -1573,8 +1552,7 @@ class TrackerOfferMixin(
     """
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             offer = profile.get_offer(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, offer)
             return offer
@@ -1637,8 +1615,7 @@ class TrackerOfferListView(
         super(TrackerOfferListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_offers()
         return super(TrackerOfferListView, self).get_queryset()
 
@@ -1664,8 +1641,7 @@ class TrackerReceivedOffersListView(
         super(TrackerReceivedOffersListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_received_offers()
         filters = self.get_filters()
         excludes = self.get_excludes()
@@ -1718,8 +1694,7 @@ class TrackerReceivedFavouriteOffersListView(
         super(TrackerReceivedFavouriteOffersListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_received_favourite_offers()
         return super(TrackerReceivedFavouriteOffersListView, self).get_queryset()
 
@@ -1745,8 +1720,7 @@ class TrackerReceivedRequiredOffersListView(
         super(TrackerReceivedRequiredOffersListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_received_required_offers()
         return super(TrackerReceivedRequiredOffersListView, self).get_queryset()
 
@@ -1773,8 +1747,7 @@ class TrackerSentOffersListView(
         super(TrackerSentOffersListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_sent_offers()
         return super(TrackerSentOffersListView, self).get_queryset()
 
@@ -1800,8 +1773,7 @@ class TrackerDraftOffersListView(
         super(TrackerDraftOffersListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_draft_offers()
         return super(TrackerDraftOffersListView, self).get_queryset()
 
@@ -1928,8 +1900,7 @@ class TrackerOfferDeleteView(
         super(TrackerOfferDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_offer(instance)
 
 
@@ -1978,13 +1949,11 @@ class TrackerOfferUnFollowView(
     lookup_field = 'offer_id'
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.unfollow_offer(instance.offer)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         return FavouriteOffer.objects.filter(profile=profile)
 
 
@@ -2032,13 +2001,11 @@ class TrackerOfferCancelBuyView(
     lookup_field = 'offer_id'
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.cancel_buy_offer(instance.offer)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         return BoughtOffer.objects.filter(profile=profile)
 
 
@@ -2049,8 +2016,7 @@ class TrackerCertificationMixin(
     """
     def get_object(self):
         try:
-            payload = self.get_payload()
-            profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+            profile = self.get_profile()
             cert = profile.get_certification(self.kwargs.get('pk', None))
             self.check_object_permissions(self.request, cert)
             return cert
@@ -2101,8 +2067,7 @@ class TrackerCertificationListView(
         super(TrackerCertificationListView, self).__init__(*args, **kwargs)
 
     def get_queryset(self):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         self.queryset = profile.list_certifications()
         return super(TrackerCertificationListView, self).get_queryset()
 
@@ -2205,6 +2170,5 @@ class TrackerCertificationDeleteView(
         super(TrackerCertificationDeleteView, self).__init__(*args, **kwargs)
 
     def perform_destroy(self, instance):
-        payload = self.get_payload()
-        profile = self.request.user.get_profile_by_id(payload['extra']['profile']['id'])
+        profile = self.get_profile()
         profile.remove_certification(instance)
@@ -10,9 +10,9 @@ from django.contrib.contenttypes.models import ContentType
 from django.conf import settings
 
 from . import models as quotation_models
-from apps.notify import models as notify_models
+from apps.notify.utils import create_notify_event
 from web.core.middleware.thread_local import get_current_profile
-from web.core.utils import get_html_message, get_bell_notification_status, get_email_notification_status
+from web.core.utils import get_html_message
 
 
 @receiver([post_save, post_delete], sender=quotation_models.Offer)
@@ -38,32 +38,10 @@ def offer_notification(sender, instance, **kwargs):
         body = get_html_message(content, final_content, os.path.join(settings.PROTOCOL+'://', settings.BASE_URL, 'dashboard'))
         type = ContentType.objects.get(model=sender.__name__.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
+        create_notify_event(
             sender=profile, subject=subject, body=body,
             content_type=type, object_id=instance.id,
-            creator=profile.user, last_modifier=profile.user,
-        )
-
-        recipient_objs = []
-
-        for staff in company_staff:
-            bell_status = get_bell_notification_status(
-                staff, sender.__name__.lower()
-            )
-            email_status = get_email_notification_status(
-                staff, sender.__name__.lower()
-            )
-
-            if bell_status or email_status:
-                recipient_objs.append(notify_models.NotificationRecipient(
-                    notification=notify_obj, is_email=email_status,
-                    is_notify=bell_status, recipient=staff,
-                    creator=profile.user, last_modifier=profile.user)
-                )
-
-        notify_models.NotificationRecipient.objects.bulk_create(
-            recipient_objs,
-            batch_size=100
+            recipients=company_staff, event=sender.__name__.lower()
         )
     except Exception as e:
         print(e)
@@ -92,32 +70,10 @@ def bom_notification(sender, instance, **kwargs):
         body = get_html_message(content, final_content, os.path.join(settings.PROTOCOL+'://', settings.BASE_URL, 'preventivi'))
         type = ContentType.objects.get(model=sender.__name__.lower())
 
-        notify_obj = notify_models.Notify.objects.create(
+        create_notify_event(
             sender=profile, subject=subject, body=body,
             content_type=type, object_id=instance.id,
-            creator=profile.user, last_modifier=profile.user,
-        )
-
-        recipient_objs = []
-
-        for staff in company_staff:
-            bell_status = get_bell_notification_status(
-                staff, sender.__name__.lower()
-            )
-            email_status = get_email_notification_status(
-                staff, sender.__name__.lower()
-            )
-
-            if bell_status or email_status:
-                recipient_objs.append(notify_models.NotificationRecipient(
-                    notification=notify_obj, is_email=email_status,
-                    is_notify=bell_status, recipient=staff,
-                    creator=profile.user, last_modifier=profile.user)
-                )
-
-        notify_models.NotificationRecipient.objects.bulk_create(
-            recipient_objs,
-            batch_size=100
+            recipients=company_staff, event=sender.__name__.lower()
         )
     except Exception as e:
         print(e)
@@ -168,52 +124,18 @@ def bought_offer_notification(sender, instance, **kwargs):
 
                 en_recipient = company_staff.filter(~Q(language='it'))
 
-                recipient_objs = []
                 if it_recipient:
-                    notify_obj = notify_models.Notify.objects.create(
+                    create_notify_event(
                         sender=profile, subject=subject_it, body=body_it,
                         content_type=type, object_id=instance.id,
-                        creator=profile.user, last_modifier=profile.user,
+                        recipients=it_recipient, event=sender.__name__.lower()
                     )
-                    for staff in it_recipient:
-                        bell_status = get_bell_notification_status(
-                            staff, sender.__name__.lower()
-                        )
-                        email_status = get_email_notification_status(
-                            staff, sender.__name__.lower()
-                        )
-
-                        if bell_status or email_status:
-                            recipient_objs.append(notify_models.NotificationRecipient(
-                                notification=notify_obj, is_email=email_status,
-                                is_notify=bell_status, recipient=staff,
-                                creator=profile.user, last_modifier=profile.user)
-                            )
 
                 if en_recipient:
-                    notify_obj = notify_models.Notify.objects.create(
+                    create_notify_event(
                         sender=profile, subject=subject_en, body=body_en,
                         content_type=type, object_id=instance.id,
-                        creator=profile.user, last_modifier=profile.user,
+                        recipients=en_recipient, event=sender.__name__.lower()
                     )
-                    for staff in en_recipient:
-                        bell_status = get_bell_notification_status(
-                            staff, sender.__name__.lower()
-                        )
-                        email_status = get_email_notification_status(
-                            staff, sender.__name__.lower()
-                        )
-
-                        if bell_status or email_status:
-                            recipient_objs.append(notify_models.NotificationRecipient(
-                                notification=notify_obj, is_email=email_status,
-                                is_notify=bell_status, recipient=staff,
-                                creator=profile.user, last_modifier=profile.user)
-                            )
-
-                notify_models.NotificationRecipient.objects.bulk_create(
-                    recipient_objs,
-                    batch_size=100
-                )
     except Exception as e:
         print(e)
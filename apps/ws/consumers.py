@@ -2,38 +2,76 @@ import datetime
 import json
 from asgiref.sync import async_to_sync
 from channels.generic.websocket import WebsocketConsumer
+from django.db.models import Q
 
 from apps.message.models import MessageProfileAssignment
 from apps.notify.models import NotificationRecipient
+from .utils import get_chat_group_name, get_notify_group_name, get_talk_group_name
 
 
-class ChatConsumer(WebsocketConsumer):
+def get_connection_profile(scope):
+    """
+    Profile of the JWT token resolved by JWTAuthMiddleware
+    """
+    from apps.profile.models import Profile
+
+    if not scope.get('jwt_profile_id'):
+        return None
+    return Profile.objects.filter(
+        id=scope['jwt_profile_id'], user_id=scope['jwt_user_id'], status=1
+    ).first()
+
+
+def get_profile_talk(profile, code):
+    from apps.message.models import Talk
+
+    return Talk.objects.filter(code=code).filter(
+        Q(id__in=profile.list_talks().values('id'))
+        | Q(messages__sender=profile)
+        | Q(messages__messageprofileassignment__profile=profile)
+    ).distinct().first()
+
+
+class GroupsConsumerMixin(object):
+
+    def join_groups(self, group_names):
+        self.group_names = group_names
+        for group_name in self.group_names:
+            async_to_sync(self.channel_layer.group_add)(
+                group_name,
+                self.channel_name
+            )
+
+    def disconnect(self, close_code):
+        # Leave room groups
+        for group_name in getattr(self, 'group_names', []):
+            async_to_sync(self.channel_layer.group_discard)(
+                group_name,
+                self.channel_name
+            )
+
+
+class ChatConsumer(GroupsConsumerMixin, WebsocketConsumer):
     def connect(self):
         self.room_name = self.scope['url_route']['kwargs']['room_name']
-        self.room_group_name = 'chat_%s' % self.room_name
-        print(self.room_name)
-        print(self.room_group_name)
-        print(self.channel_name)
-        # Join room group
-        async_to_sync(self.channel_layer.group_add)(
-            self.room_group_name,
-            self.channel_name
-        )
+        self.profile = get_connection_profile(self.scope)
+        if not self.profile:
+            self.close()
+            return
+        # Join the profile group and, if the room is a talk code, the talk group
+        group_names = [get_chat_group_name(self.profile.id)]
+        talk = get_profile_talk(self.profile, self.room_name)
+        if talk:
+            group_names.append(get_talk_group_name(talk.id))
+        self.room_group_name = group_names[-1]
+        self.join_groups(group_names)
 
         self.accept()
 
-    def disconnect(self, close_code):
-        # Leave room group
-        async_to_sync(self.channel_layer.group_discard)(
-            self.room_group_name,
-            self.channel_name
-        )
-
     # Receive message from WebSocket
     def receive(self, text_data):
         text_data_json = json.loads(text_data)
         message = text_data_json['message']
-        print(message)
         # Send message to room group
         async_to_sync(self.channel_layer.group_send)(
             self.room_group_name,
@@ -45,9 +83,7 @@ class ChatConsumer(WebsocketConsumer):
 
     # Receive message from room group
     def chat_message(self, event):
-        print('CHAT MESSAGEEE')
         message = event['message']
-        print('read_check' in message)
         if not 'read_check' in message:
             # Send message to WebSocket
             self.send(text_data=json.dumps({
@@ -58,39 +94,31 @@ class ChatConsumer(WebsocketConsumer):
                 message = message['message']
                 message_id = message['id']
                 dest_id = message['dest']['id']
-                mpa = MessageProfileAssignment.objects.filter(message_id=message_id, profile_id=dest_id)
-                print(mpa)
-                if len(mpa) > 0:
-                    mpa[0].read = True
-                    mpa[0].save()
-                    print(mpa[0].read)
+                if dest_id != self.profile.id:
+                    return
+                MessageProfileAssignment.objects.filter(
+                    message_id=message_id, profile_id=dest_id
+                ).update(read=True)
             except Exception as e:
                 print(e.__str__())
 
-class NotifyConsumer(WebsocketConsumer):
+
+class NotifyConsumer(GroupsConsumerMixin, WebsocketConsumer):
     def connect(self):
         self.room_name = self.scope['url_route']['kwargs']['room_name']
-        self.room_group_name = 'notify_%s' % self.room_name
-        # Join room group
-        async_to_sync(self.channel_layer.group_add)(
-            self.room_group_name,
-            self.channel_name
-        )
+        self.profile = get_connection_profile(self.scope)
+        if not self.profile:
+            self.close()
+            return
+        self.room_group_name = get_notify_group_name(self.profile.id)
+        # Join profile group
+        self.join_groups([self.room_group_name])
         self.accept()
 
-    def disconnect(self, close_code):
-        # Leave room group
-        async_to_sync(self.channel_layer.group_discard)(
-            self.room_group_name,
-            self.channel_name
-        )
-
     # Receive message from WebSocket
     def receive(self, text_data):
-        print("RECEIVE NotifyConsumerNotifyConsumerNotifyConsumerNotifyConsumerNotifyConsumer")
         text_data_json = json.loads(text_data)
         message = text_data_json['message']
-        print(message)
         # Send message to room group
         async_to_sync(self.channel_layer.group_send)(
             self.room_group_name,
@@ -102,9 +130,7 @@ class NotifyConsumer(WebsocketConsumer):
 
     # Receive message from room group
     def notify_message(self, event):
-        print('NOTIFY MESSAGEEE')
         message = event['message']
-        print('read_check' in message)
         if not 'read_check' in message:
             # Send message to WebSocket
             self.send(text_data=json.dumps({
@@ -114,12 +140,10 @@ class NotifyConsumer(WebsocketConsumer):
             try:
                 message = message['message']
                 notify_id = message['id']
-                mpa = NotificationRecipient.objects.filter(id=notify_id)
-                print(mpa)
+                mpa = NotificationRecipient.objects.filter(id=notify_id, recipient_id=self.profile.id)
                 if len(mpa) > 0:
                     mpa[0].reading_date = datetime.datetime.now()
                     mpa[0].save()
-                    print(mpa[0].reading_date)
             except Exception as e:
                 print(e.__str__())
 
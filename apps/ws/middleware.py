@@ -0,0 +1,42 @@
+import logging
+from urllib.parse import parse_qs
+
+from web.api.views import jwt_decode_handler
+
+logger = logging.getLogger('exceptions')
+
+
+class JWTAuthMiddleware(object):
+    """
+    Resolve the profile of a websocket connection from the JWT token,
+    passed in the `token` query string parameter or in the Authorization header
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    def get_token(self, scope):
+        query_string = parse_qs(scope.get('query_string', b'').decode())
+        if 'token' in query_string:
+            return query_string['token'][0]
+        for name, value in scope.get('headers', []):
+            if name == b'authorization':
+                return value.decode().split()[-1]
+        return None
+
+    def __call__(self, scope):
+        user_id = profile_id = None
+        token = self.get_token(scope)
+        if token:
+            try:
+                payload = jwt_decode_handler(token)
+                user_id = payload['user_id']
+                profile_id = payload['extra']['profile']['id']
+            except Exception as e:
+                logger.warning('websocket token rejected: {}'.format(e))
+        return self.inner(dict(scope, jwt_user_id=user_id, jwt_profile_id=profile_id))
+
+
+def JWTAuthMiddlewareStack(inner):
+    from channels.auth import AuthMiddlewareStack
+    return JWTAuthMiddleware(AuthMiddlewareStack(inner))
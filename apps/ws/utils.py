@@ -0,0 +1,10 @@
+def get_notify_group_name(profile_id):
+    return 'notify_profile_{}'.format(profile_id)
+
+
+def get_chat_group_name(profile_id):
+    return 'chat_profile_{}'.format(profile_id)
+
+
+def get_talk_group_name(talk_id):
+    return 'chat_talk_{}'.format(talk_id)
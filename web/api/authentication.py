@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+import jwt
+from django.core.exceptions import ObjectDoesNotExist
+from django.utils.translation import ugettext as _
+from rest_framework import exceptions
+from rest_framework_jwt.authentication import JSONWebTokenAuthentication
+from rest_framework_jwt.settings import api_settings
+
+from web.exceptions import MainProfileDoesNotExist
+
+jwt_decode_handler = api_settings.JWT_DECODE_HANDLER
+
+logger = logging.getLogger('exceptions')
+
+
+def resolve_request_profile(request, user, payload):
+    """
+    Attach the token payload and the payload profile to the request.
+    The attributes are set on the django request, so they are read
+    from the rest framework request too.
+    """
+    request.jwt_payload = payload
+    request.profile = None
+    try:
+        profile_id = payload['extra']['profile']['id']
+    except (KeyError, TypeError):
+        return
+    try:
+        request.profile = user.get_profile_by_id(profile_id)
+    except (ObjectDoesNotExist, MainProfileDoesNotExist):
+        # the views raise their own error on the missing profile
+        pass
+
+
+class ProfileJSONWebTokenAuthentication(JSONWebTokenAuthentication):
+    """
+    JWT authentication that decodes the token and resolves the token
+    profile once per request, see JWTPayloadMixin.get_profile
+    """
+
+    def authenticate(self, request):
+        jwt_value = self.get_jwt_value(request)
+        if jwt_value is None:
+            return None
+
+        try:
+            payload = jwt_decode_handler(jwt_value)
+        except jwt.ExpiredSignature:
+            msg = _('Signature has expired.')
+            raise exceptions.AuthenticationFailed(msg)
+        except jwt.DecodeError:
+            msg = _('Error decoding signature.')
+            raise exceptions.AuthenticationFailed(msg)
+        except jwt.InvalidTokenError:
+            raise exceptions.AuthenticationFailed()
+
+        user = self.authenticate_credentials(payload)
+        resolve_request_profile(request._request, user, payload)
+        return user, jwt_value
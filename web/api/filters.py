@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+import decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.utils.dateparse import parse_date, parse_datetime
+
+TEXT_LOOKUPS = ('exact', 'iexact', 'in', 'isnull', 'icontains', 'istartswith')
+RANGE_LOOKUPS = ('exact', 'in', 'isnull', 'gt', 'gte', 'lt', 'lte')
+BOOLEAN_LOOKUPS = ('exact', 'isnull')
+OTHER_LOOKUPS = ('isnull',)
+LOOKUPS = set(TEXT_LOOKUPS + RANGE_LOOKUPS)
+# lookups matching every row with an empty value
+EMPTY_MATCH_LOOKUPS = ('icontains', 'istartswith')
+# never filtered by the derived schemas
+SECRET_FIELDS = ('password',)
+
+_model_schemas = {}
+
+
+class QueryFilterError(ValueError):
+    pass
+
+
+def coerce_boolean(value):
+    value = value.lower()
+    if value in ('true', '1'):
+        return True
+    if value in ('false', '0'):
+        return False
+    raise ValueError(value)
+
+
+def coerce_datetime(value):
+    # the string is passed as is, a date is accepted too
+    if parse_datetime(value) is None and parse_date(value) is None:
+        raise ValueError(value)
+    return value
+
+
+def coerce_date(value):
+    date = parse_date(value)
+    if date is None:
+        raise ValueError(value)
+    return date
+
+
+def get_field_coerce(field):
+    """
+    Function converting the query param to the type of the field
+    """
+    if field.is_relation and (field.many_to_one or field.one_to_one):
+        return get_field_coerce(field.target_field)
+    if field.is_relation:
+        return int
+    if isinstance(field, (models.BooleanField, models.NullBooleanField)):
+        return coerce_boolean
+    if isinstance(field, models.DateTimeField):
+        return coerce_datetime
+    if isinstance(field, models.DateField):
+        return coerce_date
+    if isinstance(field, (models.IntegerField, models.AutoField)):
+        return int
+    if isinstance(field, models.FloatField):
+        return float
+    if isinstance(field, models.DecimalField):
+        return decimal.Decimal
+    return str
+
+
+def get_field_lookups(field):
+    if field.is_relation:
+        return RANGE_LOOKUPS[:3]
+    if isinstance(field, (models.BooleanField, models.NullBooleanField)):
+        return BOOLEAN_LOOKUPS
+    if isinstance(field, (models.DateField, models.IntegerField, models.AutoField,
+                          models.FloatField, models.DecimalField)):
+        return RANGE_LOOKUPS
+    if isinstance(field, (models.CharField, models.TextField)):
+        return TEXT_LOOKUPS
+    return OTHER_LOOKUPS
+
+
+def resolve_path(model, path):
+    """
+    (field, multivalued) of the field path, multivalued if the path
+    crosses a many to many or a reverse foreign key
+    """
+    multivalued = False
+    parts = path.split('__')
+    for i, part in enumerate(parts):
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            raise QueryFilterError('Unknown field {}'.format(path))
+        if field.many_to_many or field.one_to_many:
+            multivalued = True
+        if i < len(parts) - 1:
+            if not field.is_relation:
+                raise QueryFilterError('Unknown field {}'.format(path))
+            model = field.related_model
+    return field, multivalued
+
+
+def get_indexed_fields(model):
+    """
+    Fields leading an index of the model
+    """
+    fields = {'pk', model._meta.pk.name}
+    for field in model._meta.concrete_fields:
+        if field.db_index or field.unique:
+            fields.add(field.name)
+    for index in model._meta.indexes:
+        fields.add(index.fields[0].lstrip('-'))
+    for together in list(model._meta.index_together) + list(model._meta.unique_together):
+        fields.add(together[0])
+    return fields
+
+
+class QuerySchema(object):
+    """
+    Filters and orderings accepted by a QuerysetMixin view:
+
+        query_schema = QuerySchema(
+            filters={'talk': ('exact', 'in'), 'date_create': ('gte', 'lte')},
+            ordering=('date_create', 'id'),
+        )
+
+    filters maps the field paths to their lookups, the values are
+    converted to the field type. ordering lists the field paths the
+    clients can order by, they should be backed by an index.
+    """
+
+    def __init__(self, filters=None, ordering=(), max_in_values=500):
+        self.filters = filters or {}
+        self.ordering = set(ordering)
+        self.max_in_values = max_in_values
+
+    def split_key(self, key):
+        path, sep, lookup = key.rpartition('__')
+        if sep and lookup in LOOKUPS:
+            return path, lookup
+        return key, 'exact'
+
+    def compile_filter(self, model, key, value):
+        """
+        (ORM lookup, value, multivalued) of the filter__/exclude__ param,
+        None if the filter matches every row
+        """
+        path, lookup = self.split_key(key)
+        if lookup not in self.filters.get(path, ()):
+            raise QueryFilterError('Filter {} not allowed'.format(key))
+        field, multivalued = resolve_path(model, path)
+        coerce = get_field_coerce(field)
+        try:
+            if lookup == 'isnull':
+                value = coerce_boolean(value)
+                if not value and not field.null and not multivalued:
+                    return None
+            elif lookup == 'in':
+                values = []
+                for item in value.split(','):
+                    # the lists sent with a trailing comma
+                    if item != '':
+                        item = coerce(item)
+                        if item not in values:
+                            values.append(item)
+                if len(values) > self.max_in_values:
+                    raise QueryFilterError('Too many values for {}'.format(key))
+                if len(values) == 1:
+                    lookup, value = 'exact', values[0]
+                else:
+                    value = values
+            elif lookup in EMPTY_MATCH_LOOKUPS and value == '':
+                return None
+            else:
+                value = coerce(value)
+        except (ValueError, TypeError, decimal.InvalidOperation):
+            raise QueryFilterError('Invalid value for {}'.format(key))
+        if lookup == 'exact':
+            return path, value, multivalued
+        return '{}__{}'.format(path, lookup), value, multivalued
+
+    def compile_ordering(self, model, value):
+        """
+        (ORM ordering, multivalued) of the order_by__ param
+        """
+        path = value[1:] if value.startswith('-') else value
+        if path not in self.ordering:
+            raise QueryFilterError('Ordering {} not allowed'.format(value))
+        return value, resolve_path(model, path)[1] if path != 'pk' else False
+
+
+def get_model_query_schema(model):
+    """
+    Schema of the views without query_schema: the local fields and the
+    fields of the foreign keys (one join on the primary key), ordering
+    on the indexed local fields
+    """
+    schema = _model_schemas.get(model)
+    if schema is None:
+        filters = {}
+        for field in model._meta.concrete_fields:
+            if field.name in SECRET_FIELDS:
+                continue
+            filters[field.name] = filters[field.attname] = get_field_lookups(field)
+            if field.many_to_one or field.one_to_one:
+                for related_field in field.related_model._meta.concrete_fields:
+                    if related_field.name in SECRET_FIELDS:
+                        continue
+                    path = '{}__{}'.format(field.name, related_field.name)
+                    filters[path] = get_field_lookups(related_field)
+        schema = _model_schemas[model] = QuerySchema(filters=filters, ordering=get_indexed_fields(model))
+    return schema
@@ -1,9 +1,16 @@
 # coding: utf-8
 
+import binascii
+from base64 import b64decode, b64encode
 from collections import OrderedDict
+from urllib import parse
 
 from django.conf import settings
-from rest_framework.pagination import PageNumberPagination
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.utils.urls import replace_query_param
 
@@ -44,3 +51,124 @@ class ThuxPageNumberPagination(PageNumberPagination):
         return super(ThuxPageNumberPagination, self).get_page_size(request)
 
 
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination of the append-heavy feeds, newest first, on the
+    (ordering_field, id) key: no count query and no offset, so every page
+    costs the same. The views enable it with cursor_pagination_class and
+    the clients opt in sending the cursor param (empty for the first page).
+    The view cursor_ordering_field overrides the ordering_field.
+    """
+    cursor_query_param = 'cursor'
+    ordering_field = 'date_create'
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    max_page_size = 100
+    invalid_cursor_message = _('Invalid cursor')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            query = parse.parse_qs(b64decode(encoded.encode('ascii')).decode('ascii'), keep_blank_values=True)
+            value = parse_datetime(query['v'][0])
+            pk = int(query['i'][0])
+            reverse = bool(int(query.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk, reverse
+
+    def encode_cursor(self, key, reverse):
+        """
+        (link, cursor) of the page after the (value, pk) key
+        """
+        value, pk = key
+        query = {'v': value.isoformat(), 'i': pk}
+        if reverse:
+            query['r'] = 1
+        encoded = b64encode(parse.urlencode(query, doseq=True).encode('ascii')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded), encoded
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[settings.REST_FRAMEWORK_PAGE_SIZE_QUERY_PARAM])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(min(page_size, self.max_page_size), 1)
+
+    def get_key(self, obj):
+        return getattr(obj, self.ordering_field), obj.pk
+
+    def filter_queryset(self, queryset, cursor):
+        """
+        page_size + 1 items after the cursor, in the fetch direction
+        """
+        if cursor is None:
+            value = pk = None
+            reverse = False
+        else:
+            value, pk, reverse = cursor
+        if isinstance(queryset, QuerySet):
+            field = self.ordering_field
+            if reverse:
+                queryset = queryset.order_by(field, 'pk')
+                lookup = 'gt'
+            else:
+                queryset = queryset.order_by('-{}'.format(field), '-pk')
+                lookup = 'lt'
+            if cursor is not None:
+                queryset = queryset.filter(
+                    Q(**{'{}__{}'.format(field, lookup): value}) |
+                    Q(**{field: value, 'pk__{}'.format(lookup): pk})
+                )
+            return list(queryset[:self.page_size + 1])
+        # lists built in python
+        items = sorted(queryset, key=self.get_key, reverse=not reverse)
+        if cursor is not None:
+            if reverse:
+                items = [obj for obj in items if self.get_key(obj) > (value, pk)]
+            else:
+                items = [obj for obj in items if self.get_key(obj) < (value, pk)]
+        return items[:self.page_size + 1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering_field = getattr(view, 'cursor_ordering_field', self.ordering_field)
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[2]
+
+        items = self.filter_queryset(queryset, cursor)
+        has_more = len(items) > self.page_size
+        items = items[:self.page_size]
+        if reverse:
+            items.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        self.next = self.previous = (None, None)
+        if items:
+            if has_next:
+                self.next = self.encode_cursor(self.get_key(items[-1]), False)
+            if has_previous:
+                self.previous = self.encode_cursor(self.get_key(items[0]), True)
+        elif cursor is not None:
+            # past the end, the way back starts from the cursor
+            if reverse:
+                self.next = self.encode_cursor(cursor[:2], False)
+            else:
+                self.previous = self.encode_cursor(cursor[:2], True)
+        return items
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.next[1]),
+            ('next_link', self.next[0]),
+            ('previous', self.previous[1]),
+            ('previous_link', self.previous[0]),
+            ('per_page', self.page_size),
+            ('results', data)
+        ]))
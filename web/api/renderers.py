@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+# escaped by the rest framework renderer, see JSONRenderer.render
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+_json_dumps = {}
+
+
+def get_orjson_dumps():
+    try:
+        import orjson
+    except ImportError:
+        return None
+    # Decimal, datetime, time, timedelta, lazy strings, querysets...
+    # encoded like the rest framework encoder
+    default = encoders.JSONEncoder().default
+    option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(data):
+        return orjson.dumps(data, default=default, option=option)
+    return dumps
+
+
+JSON_BACKENDS = {
+    'orjson': get_orjson_dumps,
+    'json': lambda: None,
+}
+
+
+def get_json_dumps(backend=None):
+    """
+    Encoder function (data -> bytes) of the API_JSON_BACKEND, None if
+    the backend is the rest framework one or it is not installed
+    """
+    backend = backend or settings.API_JSON_BACKEND
+    if backend not in _json_dumps:
+        _json_dumps[backend] = JSON_BACKENDS[backend]()
+    return _json_dumps[backend]
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer encoding with the API_JSON_BACKEND, same output of the
+    rest framework renderer. The indented (browsable) output and the
+    missing backend fall back to the rest framework encoder.
+    """
+    json_backend = None
+
+    def get_dumps(self, accepted_media_type, renderer_context):
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return None
+        return get_json_dumps(self.json_backend)
+
+    def encode(self, data, dumps):
+        ret = dumps(data)
+        for char, escaped in LINE_SEPARATORS:
+            if char in ret:
+                ret = ret.replace(char, escaped)
+        return ret
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        dumps = self.get_dumps(accepted_media_type, renderer_context)
+        if dumps is None:
+            return super(FastJSONRenderer, self).render(data, accepted_media_type, renderer_context)
+        return self.encode(data, dumps)
+
+
+class StreamingJSONRenderer(FastJSONRenderer):
+    """
+    Render an iterable of items as a json list, chunk by chunk,
+    for the StreamingHttpResponse of the no_page lists
+    """
+    # items encoded in each chunk
+    chunk_size = 100
+
+    def render_stream(self, items):
+        dumps = get_json_dumps(self.json_backend)
+        if dumps is None:
+            dumps = super(FastJSONRenderer, self).render
+        chunk = []
+        separator = b'['
+        for item in items:
+            chunk.append(self.encode(item, dumps))
+            if len(chunk) >= self.chunk_size:
+                yield separator + b','.join(chunk)
+                separator = b','
+                chunk = []
+        if chunk:
+            yield separator + b','.join(chunk)
+            separator = b','
+        yield b']' if separator == b',' else b'[]'
@@ -1,10 +1,35 @@
 # -*- coding: utf-8 -*-
 
+import copy
+
 from rest_framework import serializers
+from rest_framework.utils import model_meta
+
+# fields built by ModelSerializer.get_fields, by (serializer class, field names)
+_compiled_fields = {}
+
+
+class LazyFieldInfo(object):
+    """
+    Model field info read only by the get_field_names falling back
+    to the Meta fields
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.info = None
+
+    def __getattr__(self, name):
+        if self.info is None:
+            self.info = model_meta.get_field_info(self.model)
+        return getattr(self.info, name)
 
 
 class DynamicFieldsModelSerializer(
         serializers.ModelSerializer):
+    # reuse the fields built for the same class and field names
+    cache_compiled_fields = True
+
     @property
     def get_view(self):
         try:
@@ -15,3 +40,21 @@ class DynamicFieldsModelSerializer(
             return view
         except:
             return None
+
+    def get_compiled_fields_key(self):
+        # get_field_names is still called, some serializers read
+        # the view kwargs there
+        if type(self).get_field_names is serializers.ModelSerializer.get_field_names or self.get_view is None:
+            return self.__class__, None
+        field_names = self.get_field_names(self._declared_fields, LazyFieldInfo(self.Meta.model))
+        return self.__class__, tuple(field_names)
+
+    def get_fields(self):
+        if not self.cache_compiled_fields:
+            return super(DynamicFieldsModelSerializer, self).get_fields()
+        key = self.get_compiled_fields_key()
+        fields = _compiled_fields.get(key)
+        if fields is None:
+            fields = _compiled_fields[key] = super(DynamicFieldsModelSerializer, self).get_fields()
+        # the cached fields are never bound, each instance gets its copies
+        return copy.deepcopy(fields)
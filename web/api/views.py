@@ -2,12 +2,15 @@
 
 import magic
 import os
-import json
 import datetime
+import logging
+import time
 import calendar
 from datetime import timedelta
 
-from django.http import HttpResponse
+from django.conf import settings
+from django.db.models import QuerySet, prefetch_related_objects
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils.translation import ugettext_lazy as _
 
 from rest_framework import status
@@ -15,48 +18,108 @@ from rest_framework.response import Response
 
 from rest_framework_jwt.settings import api_settings
 
+from web.api.filters import QueryFilterError, get_model_query_schema
+from web.api.renderers import StreamingJSONRenderer
+from web.drf import exceptions as django_api_exception
+
 from wsgiref.util import FileWrapper
 
 jwt_decode_handler = api_settings.JWT_DECODE_HANDLER
 
+logger = logging.getLogger('file')
+
+
+def iter_queryset_chunks(queryset, chunk_size):
+    """
+    Lists of chunk_size objects read with a server side cursor, the
+    prefetch_related lookups (ignored by iterator) are run per chunk
+    """
+    if not isinstance(queryset, QuerySet):
+        for start in range(0, len(queryset), chunk_size):
+            yield list(queryset[start:start + chunk_size])
+        return
+    lookups = queryset._prefetch_related_lookups
+    chunk = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) == chunk_size:
+            prefetch_related_objects(chunk, *lookups)
+            yield chunk
+            chunk = []
+    if chunk:
+        prefetch_related_objects(chunk, *lookups)
+        yield chunk
+
 
 class QuerysetMixin(object):
+    # no_page lists serialized chunk by chunk in a streaming response
+    stream_no_page = True
+    # objects of a no_page list, None for settings.API_NO_PAGE_MAX_ITEMS
+    no_page_max_items = None
+    # pagination of the requests with the cursor param, e.g. KeysetPagination
+    cursor_pagination_class = None
+    # filter__, exclude__ and order_by__ params accepted, see QuerySchema
+    query_schema = None
+    query_multivalued = False
+
+    def get_query_schema(self):
+        """
+        QuerySchema of the filter__, exclude__ and order_by__ params,
+        the view query_schema or the one derived from the queryset model
+        """
+        if self.query_schema is not None:
+            return self.query_schema
+        return get_model_query_schema(self.queryset.model)
+
+    def query_filter_error(self, err):
+        return django_api_exception.FilterAPINotAllowed(
+            status.HTTP_400_BAD_REQUEST, self.request, _("{}".format(err))
+        )
+
+    def compile_params(self, prefix):
+        """
+        ORM lookups of the params starting with prefix, checked and
+        converted by the query schema
+        """
+        lookups = dict()
+        if not isinstance(self.queryset, QuerySet):
+            return lookups
+        schema = self.get_query_schema()
+        for key, value in self.request.GET.items():
+            if key.startswith(prefix):
+                try:
+                    compiled = schema.compile_filter(self.queryset.model, key[len(prefix):], value)
+                except QueryFilterError as err:
+                    raise self.query_filter_error(err)
+                if compiled is not None:
+                    lookup, value, multivalued = compiled
+                    lookups[lookup] = value
+                    self.query_multivalued = self.query_multivalued or multivalued
+        return lookups
 
     def get_filters(self):
-        filters = dict()
-        for key, value in self.request.GET.items():
-            if key.startswith('filter__'):
-                key = key[8:]
-                if key.endswith('__isnull'):
-                    filters[key] = json.loads(value.lower())
-                elif key.endswith('__in'):
-                    filters[key] = value.split(',')
-                else:
-                    filters[key] = value
-        return filters
+        return self.compile_params('filter__')
 
     def get_excludes(self):
-        excludes = dict()
-        for key, value in self.request.GET.items():
-            if key.startswith('exclude__'):
-                key = key[9:]
-                if key.endswith('__isnull'):
-                    excludes[key] = json.loads(value.lower())
-                elif key.endswith('__in'):
-                    excludes[key] = value.split(',')[:-1]
-                else:
-                    excludes[key] = value
-        return excludes
+        return self.compile_params('exclude__')
 
     def get_order_by(self):
         order_by = list()
+        if not isinstance(self.queryset, QuerySet):
+            return order_by
+        schema = self.get_query_schema()
         for key, value in self.request.GET.items():
             if key.startswith('order_by__'):
-                # key = key[10:]
-                order_by.append(value)
+                try:
+                    ordering, multivalued = schema.compile_ordering(self.queryset.model, value)
+                except QueryFilterError as err:
+                    raise self.query_filter_error(err)
+                order_by.append(ordering)
+                self.query_multivalued = self.query_multivalued or multivalued
         return order_by
 
     def get_queryset(self):
+        self.query_multivalued = False
         filters = self.get_filters()
         excludes = self.get_excludes()
         order_by = self.get_order_by()
@@ -69,15 +132,111 @@ class QuerysetMixin(object):
         if excludes:
             queryset = queryset.exclude(**excludes)
         if order_by:
-            queryset = queryset.order_by(*order_by).distinct()
+            queryset = queryset.order_by(*order_by)
+        # the joins on many relations repeat the rows
+        if self.query_multivalued and not queryset.query.combinator:
+            queryset = queryset.distinct()
         return queryset
 
     @property
     def paginator(self):
         if self.request.query_params.get('no_page'):
             self.pagination_class = None
+        elif self.cursor_pagination_class and \
+                self.cursor_pagination_class.cursor_query_param in self.request.query_params:
+            self.pagination_class = self.cursor_pagination_class
         return super(QuerysetMixin, self).paginator
 
+    def check_no_page_size(self, queryset):
+        max_items = self.no_page_max_items or settings.API_NO_PAGE_MAX_ITEMS
+        if isinstance(queryset, QuerySet) and not queryset.query.combinator:
+            too_many = queryset[max_items:max_items + 1].exists()
+        elif isinstance(queryset, QuerySet):
+            # exists is not supported on union querysets
+            too_many = len(queryset[max_items:max_items + 1].values_list('pk')) > 0
+        else:
+            too_many = len(queryset) > max_items
+        if too_many:
+            raise django_api_exception.NoPageAPITooManyResults(
+                status.HTTP_400_BAD_REQUEST, self.request,
+                _('More than {} results, use the paginated list').format(max_items)
+            )
+
+    def get_no_page_items(self, queryset):
+        """
+        Representations of the no_page list, serialized a chunk at a time
+        """
+        serializer = self.get_serializer(queryset, many=True)
+        for chunk in iter_queryset_chunks(queryset, settings.API_NO_PAGE_CHUNK_SIZE):
+            for item in serializer.to_representation(chunk):
+                yield item
+
+    def stream_list(self, queryset):
+        """
+        Json list of the queryset encoded while it is sent.
+        The errors raised after the first chunk can't change the response.
+        """
+        return StreamingHttpResponse(
+            StreamingJSONRenderer().render_stream(self.get_no_page_items(queryset)),
+            content_type='application/json'
+        )
+
+    def log_slow_list(self, elapsed):
+        params = sorted(
+            key for key in self.request.GET
+            if key.startswith('filter__') or key.startswith('exclude__') or key.startswith('order_by__')
+        )
+        logger.warning('slow list {} {:.0f}ms {} params: {}'.format(
+            self.__class__.__name__, elapsed * 1000, self.request.path, ', '.join(params) or '-'
+        ))
+
+    def list(self, request, *args, **kwargs):
+        start = time.time()
+        if not request.query_params.get('no_page'):
+            response = super(QuerysetMixin, self).list(request, *args, **kwargs)
+        else:
+            queryset = self.filter_queryset(self.get_queryset())
+            self.check_no_page_size(queryset)
+            if self.stream_no_page:
+                response = self.stream_list(queryset)
+            else:
+                serializer = self.get_serializer(queryset, many=True)
+                response = Response(serializer.data)
+        # the streamed lists are measured until the streaming starts
+        elapsed = time.time() - start
+        if elapsed * 1000 > settings.API_SLOW_LIST_MS:
+            self.log_slow_list(elapsed)
+        return response
+
+
+class PrefetchPlanMixin(object):
+    """
+    Apply to the view queryset the (select_related, prefetch_related) plan
+    returned by get_prefetch_plan, usually derived from the view
+    *_response_include_fields
+    """
+
+    def get_prefetch_plan(self):
+        return [], []
+
+    def apply_prefetch_plan(self, queryset):
+        select_related, prefetch_related = self.get_prefetch_plan()
+        if not isinstance(queryset, QuerySet):
+            # lists built by the profile methods, the related objects
+            # are fetched with one query per lookup
+            if select_related or prefetch_related:
+                prefetch_related_objects(queryset, *(list(select_related) + list(prefetch_related)))
+            return queryset
+        # select_related is not supported on union querysets
+        if select_related and not queryset.query.combinator:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    def get_queryset(self):
+        return self.apply_prefetch_plan(super(PrefetchPlanMixin, self).get_queryset())
+
 
 class StatusUpdateViewMixin(object):
 
@@ -98,8 +257,22 @@ class StatusUpdateViewMixin(object):
 class JWTPayloadMixin(object):
 
     def get_payload(self):
-        token = self.request.META['HTTP_AUTHORIZATION'].split()[1]
-        return jwt_decode_handler(token)
+        # decoded once per request by ProfileJSONWebTokenAuthentication
+        payload = getattr(self.request, 'jwt_payload', None)
+        if payload is None:
+            token = self.request.META['HTTP_AUTHORIZATION'].split()[1]
+            payload = jwt_decode_handler(token)
+        return payload
+
+    def get_profile(self):
+        """
+        Profile of the token payload, resolved once per request by
+        ProfileJSONWebTokenAuthentication
+        """
+        profile = getattr(self.request, 'profile', None)
+        if profile is None:
+            profile = self.request.user.get_profile_by_id(self.get_payload()['extra']['profile']['id'])
+        return profile
 
 
 class WhistleGenericViewMixin(object):
@@ -136,13 +309,15 @@ class DownloadViewMixin(object):
     file_field_name = 'file_content'
 
     def get(self, request, *args, **kwargs):
-        file = getattr(self.get_object(), self.file_field_name)
-        return self.create_download_response(file.path)
+        obj = self.get_object()
+        file = getattr(obj, self.file_field_name)
+        return self.create_download_response(file.path, getattr(obj, 'file_mime_type', None))
 
-    def create_download_response(self, path_file):
+    def create_download_response(self, path_file, content_type=None):
         if os.path.exists(path_file):
             with open(path_file, 'rb') as file:
-                content_type = magic.from_file(path_file, mime=True)
+                if not content_type:
+                    content_type = magic.from_file(path_file, mime=True)
                 response = HttpResponse(FileWrapper(file), content_type=content_type)
                 response['Content-Disposition'] = 'attachment; filename="{}"'.format(os.path.basename(file.name))
             return response
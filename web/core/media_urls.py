@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.core import signing
+from django.utils.http import urlencode
+
+MEDIA_SIGNER_SALT = 'web.core.media_urls'
+
+
+def get_media_base_url(request=None):
+    """
+    MEDIA_BASE_URL (e.g. a CDN) if configured, else the scheme and host
+    of the request, else MEDIA_DEFAULT_BASE_URL (workers and signals
+    running outside a request)
+    """
+    if settings.MEDIA_BASE_URL:
+        return settings.MEDIA_BASE_URL.rstrip('/')
+    if request is not None:
+        return '{}://{}'.format(request.scheme, request.get_host())
+    return settings.MEDIA_DEFAULT_BASE_URL.rstrip('/')
+
+
+def is_private_media_url(url):
+    return url.startswith(settings.MEDIA_PRIVATE_URL)
+
+
+def sign_media_url(url):
+    """
+    Append the expiring signature of the url path
+    """
+    signature = signing.TimestampSigner(salt=MEDIA_SIGNER_SALT).sign(url).rsplit(':', 2)
+    return '{}?{}'.format(url, urlencode({'signature': ':'.join(signature[1:])}))
+
+
+def check_media_url_signature(url, signature):
+    """
+    True if the signature of the url path is valid and not expired
+    """
+    try:
+        signing.TimestampSigner(salt=MEDIA_SIGNER_SALT).unsign(
+            '{}:{}'.format(url, signature), max_age=settings.MEDIA_SIGNED_URL_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+class MediaURLBuilder(object):
+    """
+    Build the absolute urls of the media files from a base url computed
+    once, see get_media_url_builder
+    """
+
+    def __init__(self, request=None):
+        self.base_url = get_media_base_url(request)
+
+    def build(self, url):
+        if not url:
+            return None
+        if url.startswith('http://') or url.startswith('https://'):
+            return url
+        if settings.MEDIA_SIGNED_URLS and is_private_media_url(url):
+            url = sign_media_url(url)
+        return self.base_url + url
+
+    def file_url(self, file):
+        """
+        Absolute url of a FieldFile, None if there is no file
+        """
+        if not file:
+            return None
+        try:
+            return self.build(file.url)
+        except ValueError:
+            return None
+
+
+_worker_builder = None
+
+
+def get_media_url_builder(request=None):
+    """
+    Media url builder of the request, created once and kept on the
+    request. Without a request the builder is shared by the process.
+    """
+    global _worker_builder
+    if request is None:
+        if _worker_builder is None:
+            _worker_builder = MediaURLBuilder()
+        return _worker_builder
+    # the rest framework request proxies the django one
+    request = getattr(request, '_request', request)
+    builder = getattr(request, 'media_url_builder', None)
+    if builder is None:
+        builder = request.media_url_builder = MediaURLBuilder(request)
+    return builder
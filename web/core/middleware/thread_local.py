@@ -21,12 +21,17 @@ def get_current_request():
 
 def get_profile_payload():
     request = get_current_request()
-    token = request.META['HTTP_AUTHORIZATION'].split()[1]
-    payload = jwt_decode_handler(token)
+    payload = getattr(request, 'jwt_payload', None)
+    if payload is None:
+        token = request.META['HTTP_AUTHORIZATION'].split()[1]
+        payload = jwt_decode_handler(token)
     return payload['extra']['profile']
 
 
 def get_current_profile():
+    profile = getattr(get_current_request(), 'profile', None)
+    if profile is not None:
+        return profile
     try:
         from apps.profile import models as profile_models
         profile_payload = get_profile_payload()
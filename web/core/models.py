@@ -2,12 +2,22 @@
 
 from __future__ import unicode_literals
 
+import logging
+import os
+
+import filetype
+from django.core.files.images import get_image_dimensions
 from django.db import models
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 
 from web.core.middleware.thread_local import get_current_user
 
+logger = logging.getLogger('exceptions')
+
+# bytes read to detect the mime type (see filetype)
+FILE_HEADER_SIZE = 261
+
 
 class UserModel(models.Model):
     creator = models.ForeignKey(
@@ -105,3 +115,87 @@ class CleanModel(models.Model):
     def save(self, user=None, *args, **kwargs):
         self.full_clean()
         super(CleanModel, self).save(user=user, *args, **kwargs)
+
+
+class FileMetadataModel(models.Model):
+    """
+    Mime type, size, extension and image dimensions of the file field
+    named by metadata_file_field. They are read when a new file is saved,
+    so the read paths never touch the storage.
+    """
+    metadata_file_field = None
+
+    file_mime_type = models.CharField(
+        max_length=255, blank=True, default='',
+        verbose_name=_('mime type'),
+    )
+    file_size = models.BigIntegerField(
+        blank=True, null=True,
+        verbose_name=_('file size'),
+    )
+    file_extension = models.CharField(
+        max_length=32, blank=True, default='',
+        verbose_name=_('file extension'),
+    )
+    file_width = models.PositiveIntegerField(
+        blank=True, null=True,
+        verbose_name=_('width'),
+    )
+    file_height = models.PositiveIntegerField(
+        blank=True, null=True,
+        verbose_name=_('height'),
+    )
+
+    class Meta:
+        abstract = True
+
+    def get_metadata_file(self):
+        return getattr(self, self.metadata_file_field)
+
+    def update_file_metadata(self):
+        """
+        Read the metadata from the file, return False if the file
+        can't be read
+        """
+        file = self.get_metadata_file()
+        self.file_mime_type = self.file_extension = ''
+        self.file_size = self.file_width = self.file_height = None
+        if not file:
+            return True
+        self.file_extension = os.path.splitext(file.name)[1]
+        committed = file._committed
+        try:
+            self.file_size = file.size
+            file.open('rb')
+            position = file.tell()
+            kind = filetype.guess(file.read(FILE_HEADER_SIZE))
+            file.seek(position)
+            if kind is not None:
+                self.file_mime_type = kind.mime
+            if self.file_mime_type.startswith('image/'):
+                self.file_width, self.file_height = get_image_dimensions(file)
+        except Exception as e:
+            logger.error('file metadata of {} {}: {}'.format(self._meta.label, self.pk, e))
+            return False
+        finally:
+            # uploaded files are still needed by the storage
+            if committed:
+                file.close()
+        return True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(FileMetadataModel, cls).from_db(db, field_names, values)
+        if cls.metadata_file_field in field_names:
+            instance._metadata_file_name = instance.get_metadata_file().name
+        return instance
+
+    def save(self, *args, **kwargs):
+        file = self.get_metadata_file()
+        # new uploads and files saved to the storage by FieldFile.save
+        self._metadata_file_changed = file.name != getattr(self, '_metadata_file_name', None) \
+            or not file._committed
+        if self._metadata_file_changed:
+            self.update_file_metadata()
+        super(FileMetadataModel, self).save(*args, **kwargs)
+        self._metadata_file_name = file.name
@@ -8,28 +8,93 @@ def get_setting(setting_name, default):
     return getattr(settings, setting_name, default)
 
 
-def get_bell_notification_status(profile, event):
+def get_notification_bit(event, channel):
+    """
+    Bitmap position of an event on a notification channel
+    """
+    events = settings.PROFILE_PREFERENCE_NOTIFICATION_EVENTS
+    slots = settings.PROFILE_PREFERENCE_NOTIFICATION_SLOTS
+    slot = events.index(event) if event in events else slots - 1
+    return 1 << (settings.PROFILE_PREFERENCE_NOTIFICATION_CHANNELS.index(channel) * slots + slot)
+
+
+def build_notification_bitmap(notification):
+    """
+    Precompute the notification preference JSON of a profile as a bitmap.
+    A disabled channel has no bits set, an event missing from the typology
+    or a malformed channel (e.g. push, which has no preference yet) is
+    enabled.
+    """
+    slots = settings.PROFILE_PREFERENCE_NOTIFICATION_SLOTS
+    bitmap = 0
+    for index, channel in enumerate(settings.PROFILE_PREFERENCE_NOTIFICATION_CHANNELS):
+        channel_bits = [True] * slots
+        try:
+            channel_notify = notification[channel]
+            if not channel_notify['status']:
+                channel_bits = [False] * slots
+            else:
+                typology = {}
+                for typology_event in channel_notify['typology']:
+                    if typology_event['name'] not in typology:
+                        typology[typology_event['name']] = bool(typology_event.get('status', True))
+                for slot, event in enumerate(settings.PROFILE_PREFERENCE_NOTIFICATION_EVENTS):
+                    channel_bits[slot] = typology.get(event, True)
+        except Exception:
+            pass
+        for slot, enabled in enumerate(channel_bits):
+            if enabled:
+                bitmap |= 1 << (index * slots + slot)
+    return bitmap
+
+
+def get_notification_bitmap(profile):
     try:
-        bell_notify = profile.preference.notification['bell']
-        if bell_notify['status']:
-            event = [d for d in bell_notify['typology'] if d['name'] == event][0]
-            if event['status']:
-                return True
-        return False
-    except:
-        return True
+        preference = profile.preference
+    except Exception:
+        return None
+    if preference.notification_bitmap is None:
+        return build_notification_bitmap(preference.notification)
+    return preference.notification_bitmap
+
+
+def get_notification_status(profile, event, channel):
+    bitmap = get_notification_bitmap(profile)
+    return bitmap is None or bool(bitmap & get_notification_bit(event, channel))
+
+
+def get_bell_notification_status(profile, event):
+    return get_notification_status(profile, event, 'bell')
 
 
 def get_email_notification_status(profile, event):
-    try:
-        email_notify = profile.preference.notification['email']
-        if email_notify['status']:
-            event = [d for d in email_notify['typology'] if d['name'] == event][0]
-            if event['status']:
-                return True
-        return False
-    except:
-        return True
+    return get_notification_status(profile, event, 'email')
+
+
+def get_notification_profile_ids(profile_ids, event, channels):
+    """
+    Ids of the profiles, among the given ones, that want the event
+    on at least one of the channels, read with a single query
+    """
+    from apps.profile.models import Preference
+
+    mask = 0
+    for channel in channels:
+        mask |= get_notification_bit(event, channel)
+    bitmaps = dict(
+        Preference.objects.filter(profile_id__in=profile_ids).values_list(
+            'profile_id', 'notification_bitmap'
+        )
+    )
+    missing = [profile_id for profile_id, bitmap in bitmaps.items() if bitmap is None]
+    if missing:
+        for profile_id, notification in Preference.objects.filter(
+                profile_id__in=missing).values_list('profile_id', 'notification'):
+            bitmaps[profile_id] = build_notification_bitmap(notification)
+    return [
+        profile_id for profile_id in profile_ids
+        if profile_id not in bitmaps or bitmaps[profile_id] & mask
+    ]
 
 
 def get_html_message(content, final_content, endpoint=None):
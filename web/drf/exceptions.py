@@ -243,3 +243,11 @@ class TalkAPIDoesNotExist(WhistleAPIException):
 
 class NotificationAPIDoesNotExist(WhistleAPIException):
     pass
+
+
+class NoPageAPITooManyResults(WhistleAPIException):
+    pass
+
+
+class FilterAPINotAllowed(WhistleAPIException):
+    pass
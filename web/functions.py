@@ -1,5 +1,51 @@
 # -*- coding: utf-8 -*-
 
+from django.db import models
+from django.db.models import Count, Func, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
 
 def zerofill(x, width=6):
     return "%0*d" % (width, x)
+
+
+class JSONLength(Func):
+    """
+    len() of a jsonb array or object, 0 for the other values
+    """
+    # the expression is repeated, for the columns only
+    template = "(CASE jsonb_typeof(%(expressions)s) " \
+               "WHEN 'array' THEN jsonb_array_length(%(expressions)s) " \
+               "WHEN 'object' THEN (SELECT COUNT(*) FROM jsonb_object_keys(%(expressions)s)) " \
+               "ELSE 0 END)"
+    output_field = models.IntegerField()
+
+
+class DateDiff(Func):
+    """
+    Days between two dates, the postgres date subtraction
+    """
+    arg_joiner = ' - '
+    template = '(%(expressions)s)'
+    output_field = models.IntegerField()
+
+
+def subquery_count(queryset, field):
+    """
+    Number of rows of the queryset whose field is the outer pk, for the
+    annotations counting the related rows without a join and a group by
+    """
+    queryset = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+        count=Count('*')
+    ).values('count')
+    return Coalesce(Subquery(queryset, output_field=models.IntegerField()), 0)
+
+
+def subquery_sum(queryset, field, expression):
+    """
+    Sum of the expression on the queryset rows whose field is the outer pk
+    """
+    queryset = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+        total=Sum(expression)
+    ).values('total')
+    return Coalesce(Subquery(queryset, output_field=models.IntegerField()), 0)
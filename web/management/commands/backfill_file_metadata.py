@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+
+from apps.document.models import Document
+from apps.media.models import Photo, Video
+from apps.message.models import MessageFileAssignment
+from apps.project.models import MediaAssignment
+
+METADATA_MODELS = (Photo, Video, Document, MediaAssignment, MessageFileAssignment)
+METADATA_FIELDS = ['file_mime_type', 'file_size', 'file_extension', 'file_width', 'file_height']
+
+
+class Command(BaseCommand):
+    help = 'Read mime type, size, extension and image dimensions of the stored files ' \
+           'that have no metadata yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-c', '--chunk-size', dest='chunk_size', type=int, default=500,
+                            help='Rows updated per query')
+        parser.add_argument('--all', dest='all', action='store_true', default=False,
+                            help='Read again the metadata of every file')
+
+    def backfill(self, model, chunk_size, read_all):
+        queryset = model.objects.exclude(**{model.metadata_file_field: ''}).order_by('id')
+        if not read_all:
+            queryset = queryset.filter(file_size__isnull=True)
+        updated = failed = 0
+        last_id = 0
+        while True:
+            # the id cursor skips the files that can't be read
+            chunk = list(queryset.filter(id__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            last_id = chunk[-1].id
+            instances = []
+            for instance in chunk:
+                if instance.update_file_metadata():
+                    instances.append(instance)
+                else:
+                    failed += 1
+            model.objects.bulk_update(instances, METADATA_FIELDS)
+            updated += len(instances)
+        return updated, failed
+
+    def handle(self, *args, **options):
+        for model in METADATA_MODELS:
+            updated, failed = self.backfill(model, options['chunk_size'], options['all'])
+            self.stdout.write('{}: {} updated, {} not readable'.format(model._meta.label, updated, failed))
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+
+from apps.profile.models import Preference
+from web.core.utils import build_notification_bitmap
+
+
+class Command(BaseCommand):
+    help = 'Recompute the notification preference bitmap of every profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-c', '--chunk-size', dest='chunk_size', type=int, default=1000,
+                            help='Preferences updated per query')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        preferences = []
+        updated = 0
+        for preference in Preference.objects.only('id', 'notification').iterator(chunk_size=chunk_size):
+            preference.notification_bitmap = build_notification_bitmap(preference.notification)
+            preferences.append(preference)
+            if len(preferences) >= chunk_size:
+                Preference.objects.bulk_update(preferences, ['notification_bitmap'])
+                updated += len(preferences)
+                preferences = []
+        if preferences:
+            Preference.objects.bulk_update(preferences, ['notification_bitmap'])
+            updated += len(preferences)
+        self.stdout.write('{} preferences updated'.format(updated))
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.profile.models import Company
+from apps.project.models import Project
+from apps.project.utils import sync_project_access
+
+
+class Command(BaseCommand):
+    help = 'Compare the ProjectAccess rows with the teams and the company roles ' \
+           'and fail if they differ, see rebuild_project_access'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-c', '--company', dest='companies', type=int, action='append',
+                            help='Company to check, all by default')
+        parser.add_argument('-l', '--list', dest='list', action='store_true', default=False,
+                            help='List the differing rows')
+
+    def handle(self, *args, **options):
+        companies = options['companies'] or Company.objects.values_list('id', flat=True).order_by('id')
+        errors = 0
+        for company_id in companies:
+            missing, stale, changed = sync_project_access(
+                projects=Project.objects.filter(company_id=company_id), dry_run=True
+            )
+            errors += len(missing) + len(stale) + len(changed)
+            if not options['list']:
+                continue
+            for (profile_id, project_id), (role, via_company) in missing.items():
+                self.stdout.write('missing profile {} project {} role {} via company {}'.format(
+                    profile_id, project_id, role, via_company
+                ))
+            for row_id, profile_id, project_id, role, via_company in stale:
+                self.stdout.write('stale profile {} project {} role {} via company {}'.format(
+                    profile_id, project_id, role, via_company
+                ))
+            for row_id, profile_id, project_id, role, via_company in changed:
+                self.stdout.write('changed profile {} project {}, expected role {} via company {}'.format(
+                    profile_id, project_id, role, via_company
+                ))
+        if errors:
+            raise CommandError('{} project access rows differ, run rebuild_project_access'.format(errors))
+        self.stdout.write('project access consistent')
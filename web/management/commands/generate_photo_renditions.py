@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+
+from apps.media.models import Photo
+from apps.media.renditions import create_photo_renditions
+from apps.media.tasks import generate_photo_renditions
+
+
+class Command(BaseCommand):
+    help = 'Generate the renditions of the photos that have none, ' \
+           'queued to the worker or inline with --sync'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', dest='all', action='store_true', default=False,
+                            help='Generate again the renditions of every photo')
+        parser.add_argument('--sync', dest='sync', action='store_true', default=False,
+                            help='Generate the renditions in this process')
+
+    def handle(self, *args, **options):
+        photos = Photo.objects.exclude(photo='').order_by('id')
+        if not options['all']:
+            photos = photos.filter(renditions={})
+        count = 0
+        for photo in photos.iterator():
+            if options['sync']:
+                create_photo_renditions(photo)
+            else:
+                generate_photo_renditions.delay(photo.id)
+            count += 1
+        self.stdout.write('{} photos {}'.format(count, 'processed' if options['sync'] else 'queued'))
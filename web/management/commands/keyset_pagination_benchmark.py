@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.message.models import Message, Talk
+from apps.profile.models import Profile
+from web.api.pagination import KeysetPagination
+
+
+class Command(BaseCommand):
+    help = 'Create N synthetic messages in a rolled back transaction and compare the ' \
+           'latency of the offset pages (count + offset) with the keyset pages at ' \
+           'increasing depth, then page through all the messages with the cursor'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--messages', dest='messages', type=int, default=1000000,
+                            help='Synthetic messages')
+        parser.add_argument('-p', '--per-page', dest='per_page', type=int, default=50,
+                            help='Messages per page')
+        parser.add_argument('-b', '--batch-size', dest='batch_size', type=int, default=10000,
+                            help='Messages inserted per query')
+
+    def create_messages(self, talk, sender, messages, batch_size):
+        created = 0
+        while created < messages:
+            batch = min(batch_size, messages - created)
+            Message.objects.bulk_create([
+                Message(
+                    talk=talk, sender=sender, creator=sender.user, last_modifier=sender.user,
+                    body='benchmark message {}'.format(created + i)
+                ) for i in range(batch)
+            ], batch_size=batch_size)
+            created += batch
+
+    def offset_page(self, queryset, page, per_page):
+        # queries of ThuxPageNumberPagination
+        start = time.time()
+        queryset.count()
+        offset = (page - 1) * per_page
+        list(queryset.order_by('-date_create', '-id')[offset:offset + per_page])
+        return time.time() - start
+
+    def keyset_page(self, paginator, queryset, cursor):
+        start = time.time()
+        items = paginator.filter_queryset(queryset, cursor)
+        return time.time() - start, items
+
+    def handle(self, *args, **options):
+        per_page = options['per_page']
+        talk = Talk.objects.first()
+        sender = Profile.objects.filter(user__isnull=False).first()
+        if talk is None or sender is None:
+            raise CommandError('A talk and a profile are required')
+
+        paginator = KeysetPagination()
+        paginator.page_size = per_page
+
+        with transaction.atomic():
+            start = time.time()
+            self.create_messages(talk, sender, options['messages'], options['batch_size'])
+            self.stdout.write('{} messages created in {:.1f}s'.format(options['messages'], time.time() - start))
+            queryset = Message.objects.filter(talk=talk)
+            pages = (queryset.count() + per_page - 1) // per_page
+
+            self.stdout.write('{:>8} {:>12} {:>12}'.format('page', 'offset ms', 'keyset ms'))
+            depth = 1
+            while depth <= pages:
+                # the cursor of the page, as sent by the previous page
+                cursor = None
+                if depth > 1:
+                    last = queryset.order_by('-date_create', '-id')[(depth - 1) * per_page - 1]
+                    cursor = (last.date_create, last.pk, False)
+                offset_elapsed = self.offset_page(queryset, depth, per_page)
+                keyset_elapsed = self.keyset_page(paginator, queryset, cursor)[0]
+                self.stdout.write('{:>8} {:>12.2f} {:>12.2f}'.format(
+                    depth, offset_elapsed * 1000, keyset_elapsed * 1000
+                ))
+                depth *= 10
+
+            start = time.time()
+            slowest = 0
+            cursor = None
+            walked = 0
+            while True:
+                elapsed, items = self.keyset_page(paginator, queryset, cursor)
+                slowest = max(slowest, elapsed)
+                walked += 1
+                if len(items) <= per_page:
+                    break
+                last = items[per_page - 1]
+                cursor = (last.date_create, last.pk, False)
+            elapsed = time.time() - start
+            self.stdout.write('keyset walk: {} pages in {:.1f}s, {:.2f} ms per page, slowest {:.2f} ms'.format(
+                walked, elapsed, elapsed * 1000 / walked, slowest * 1000
+            ))
+            transaction.set_rollback(True)
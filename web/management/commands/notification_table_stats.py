@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+
+from apps.notify import models as notify_models
+from apps.notify.retention import archive_notifications
+
+TABLE_MODELS = (
+    notify_models.Notify,
+    notify_models.NotificationRecipient,
+    notify_models.NotificationRecipientArchive,
+    notify_models.NotificationCounter,
+)
+
+
+class Command(BaseCommand):
+    help = 'Report notification table sizes and list/count query latencies, ' \
+           'optionally before and after the archive job'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-p', '--profiles', dest='profiles', type=int, default=20,
+                            help='Profiles sampled (the ones with most notifications)')
+        parser.add_argument('--page-size', dest='page_size', type=int, default=20,
+                            help='Rows read by the list queries')
+        parser.add_argument('--archive', dest='archive', action='store_true', default=False,
+                            help='Run the archive job and report again')
+        parser.add_argument('--days', dest='days', type=int, default=None,
+                            help='Retention window of the archive job')
+
+    def get_queries(self, profile_id, page_size):
+        notify_recipients = notify_models.NotificationRecipient.objects.filter(recipient_id=profile_id)
+        return (
+            ('new', lambda: list(notify_recipients.filter(
+                reading_date__isnull=True, status=True).order_by('-date_create')[:page_size])),
+            ('read', lambda: list(notify_recipients.filter(
+                reading_date__isnull=False, status=True).order_by('-date_create')[:page_size])),
+            ('trash', lambda: list(notify_recipients.filter(
+                status=False).order_by('-date_create')[:page_size])),
+            ('count', lambda: list(notify_models.NotificationCounter.objects.filter(
+                profile_id=profile_id))),
+        )
+
+    def report_tables(self):
+        with connection.cursor() as cursor:
+            for model in TABLE_MODELS:
+                table = model._meta.db_table
+                cursor.execute(
+                    'SELECT pg_total_relation_size(%s), reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [table, table]
+                )
+                size, rows = cursor.fetchone()
+                self.stdout.write('  {:<40} {:>12} rows {:>10.1f} MB'.format(table, rows, size / 1024.0 / 1024.0))
+
+    def report_latencies(self, profile_ids, page_size):
+        timings = {}
+        for profile_id in profile_ids:
+            for name, query in self.get_queries(profile_id, page_size):
+                start = time.time()
+                query()
+                timings.setdefault(name, []).append((time.time() - start) * 1000)
+        for name, values in timings.items():
+            self.stdout.write('  {:<10} avg {:>8.2f} ms  max {:>8.2f} ms'.format(
+                name, sum(values) / len(values), max(values)
+            ))
+
+    def report(self, title, profile_ids, page_size):
+        self.stdout.write(title)
+        self.report_tables()
+        if profile_ids:
+            self.report_latencies(profile_ids, page_size)
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        profile_ids = list(
+            notify_models.NotificationRecipient.objects.values('recipient_id').annotate(
+                count=Count('id')
+            ).order_by('-count').values_list('recipient_id', flat=True)[:options['profiles']]
+        )
+        self.report('before' if options['archive'] else 'current', profile_ids, page_size)
+        if options['archive']:
+            start = time.time()
+            archived, deleted, deleted_events = archive_notifications(days=options['days'])
+            self.stdout.write('archived {} recipients, deleted {} notifies and {} notify events in {:.1f}s'.format(
+                archived, deleted, deleted_events, time.time() - start
+            ))
+            self.report('after', profile_ids, page_size)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from apps.message.models import Message, MessageCounter
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the MessageCounter rows (messages of the talks of each company, ' \
+           'project and profile) from the messages, to run before turning on MESSAGE_COUNTER_CACHE'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-b', '--batch-size', dest='batch_size', type=int, default=1000,
+                            help='Rows inserted per query')
+
+    def handle(self, *args, **options):
+        start = time.time()
+        counts = Message.objects.order_by().values(
+            'talk__content_type_id', 'talk__object_id'
+        ).annotate(count=Count('id'))
+        with transaction.atomic():
+            MessageCounter.objects.all().delete()
+            MessageCounter.objects.bulk_create([
+                MessageCounter(
+                    content_type_id=row['talk__content_type_id'], object_id=row['talk__object_id'],
+                    messages_count=row['count']
+                ) for row in counts.iterator()
+            ], batch_size=options['batch_size'])
+        self.stdout.write('{} counters rebuilt in {:.1f}s'.format(
+            MessageCounter.objects.count(), time.time() - start
+        ))
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+
+from apps.notify.counters import rebuild_notification_counters
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the notification badge counters from the NotificationRecipient rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-p', '--profile', dest='profiles', type=int, action='append',
+                            help='Rebuild only the counters of this profile id (repeatable)')
+
+    def handle(self, *args, **options):
+        count = rebuild_notification_counters(options.get('profiles'))
+        self.stdout.write('{} notification counters rebuilt'.format(count))
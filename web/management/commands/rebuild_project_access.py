@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.profile.models import Company
+from apps.project.models import Project, ProjectAccess
+from apps.project.utils import sync_project_access
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the ProjectAccess rows from the teams and the company roles, ' \
+           'company by company'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-c', '--company', dest='companies', type=int, action='append',
+                            help='Company to rebuild, all by default')
+        parser.add_argument('-p', '--project', dest='projects', type=int, action='append',
+                            help='Project to rebuild')
+
+    def handle(self, *args, **options):
+        start = time.time()
+        if options['projects']:
+            scopes = [options['projects']]
+        else:
+            companies = options['companies'] or Company.objects.values_list('id', flat=True).order_by('id')
+            scopes = (Project.objects.filter(company_id=company_id) for company_id in companies)
+
+        missing = stale = changed = 0
+        for projects in scopes:
+            result = sync_project_access(projects=projects)
+            missing += len(result[0])
+            stale += len(result[1])
+            changed += len(result[2])
+        self.stdout.write('{} rows created, {} deleted, {} updated in {:.1f}s, {} rows'.format(
+            missing, stale, changed, time.time() - start, ProjectAccess.objects.count()
+        ))
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import time
+from itertools import chain
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.crypto import get_random_string
+
+from apps.message.models import Message, MessageProfileAssignment, Talk
+from apps.profile.models import Company, OwnerProfile
+
+
+class Command(BaseCommand):
+    help = 'Create a company with N talks and M messages in a rolled back transaction and ' \
+           'time the received messages list (first page, count, unread counts), ' \
+           'optionally against the former per-talk concatenation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-t', '--talks', dest='talks', type=int, default=10000,
+                            help='Synthetic talks of the company')
+        parser.add_argument('-m', '--messages', dest='messages', type=int, default=1000000,
+                            help='Synthetic messages, spread over the talks')
+        parser.add_argument('-u', '--unread', dest='unread', type=int, default=10,
+                            help='Percentage of the messages unread by the profile')
+        parser.add_argument('-b', '--batch-size', dest='batch_size', type=int, default=10000,
+                            help='Rows inserted per query')
+        parser.add_argument('--legacy', dest='legacy', action='store_true', default=False,
+                            help='Time the per-talk concatenation too (one query per talk)')
+
+    def create_data(self, profile, talks, messages, unread, batch_size):
+        user = profile.user
+        Talk.objects.bulk_create([
+            Talk(
+                code=get_random_string(length=32), creator=user, last_modifier=user,
+                content_type=ContentType.objects.get_for_model(Company), object_id=profile.company_id
+            ) for i in range(talks)
+        ], batch_size=batch_size)
+        talk_ids = list(Talk.objects.filter(
+            content_type=ContentType.objects.get_for_model(Company), object_id=profile.company_id
+        ).values_list('id', flat=True))
+
+        created = 0
+        while created < messages:
+            batch = min(batch_size, messages - created)
+            Message.objects.bulk_create([
+                Message(
+                    talk_id=talk_ids[(created + i) % len(talk_ids)], sender=profile,
+                    creator=user, last_modifier=user, body='benchmark message {}'.format(created + i)
+                ) for i in range(batch)
+            ], batch_size=batch_size)
+            created += batch
+
+        messages_ids = Message.objects.filter(talk_id__in=talk_ids).values_list('id', flat=True)
+        assignments = []
+        for i, message_id in enumerate(messages_ids.iterator()):
+            assignments.append(MessageProfileAssignment(
+                profile=profile, message_id=message_id, read=i % 100 >= unread
+            ))
+            if len(assignments) == batch_size:
+                MessageProfileAssignment.objects.bulk_create(assignments)
+                assignments = []
+        MessageProfileAssignment.objects.bulk_create(assignments)
+
+    def measure(self, label, function):
+        start = time.time()
+        result = function()
+        self.stdout.write('{:<40} {:>10.1f} ms'.format(label, (time.time() - start) * 1000))
+        return result
+
+    def handle(self, *args, **options):
+        profile = OwnerProfile.objects.filter(company__isnull=False, user__isnull=False).first()
+        if profile is None:
+            raise CommandError('A company profile is required')
+
+        with transaction.atomic():
+            start = time.time()
+            self.create_data(profile, options['talks'], options['messages'], options['unread'],
+                             options['batch_size'])
+            self.stdout.write('{} talks, {} messages created in {:.1f}s'.format(
+                options['talks'], options['messages'], time.time() - start
+            ))
+
+            received = profile.list_received_messages()
+            self.measure('first page (50)', lambda: list(received.order_by('-date_create')[:50]))
+            self.measure('count', received.count)
+            talk = Talk.objects.filter(messages__sender=profile).order_by('-id').first()
+            self.measure('talk first page (50)', lambda: list(
+                profile.list_received_messages(talk=talk).order_by('-date_create')[:50]
+            ))
+            self.measure('unread first page (50)', lambda: list(
+                profile.list_received_messages(read=False).order_by('-date_create')[:50]
+            ))
+            counts = self.measure('unread counts of all the talks', profile.get_unread_messages_counts)
+            self.stdout.write('{} talks with unread messages, {} unread'.format(
+                len(counts), sum(counts.values())
+            ))
+
+            if options['legacy']:
+                def legacy():
+                    return list(chain(*[talk.messages.all() for talk in profile.list_talks()]))
+                self.measure('per-talk concatenation', legacy)
+            transaction.set_rollback(True)
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import datetime
+import decimal
+import time
+import tracemalloc
+from collections import OrderedDict
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from web.api.renderers import FastJSONRenderer, StreamingJSONRenderer, get_json_dumps
+
+
+def company_payload(i):
+    return OrderedDict([
+        ('id', i % 50), ('name', 'Impresa Edile {}'.format(i % 50)), ('slug', 'impresa-edile-{}'.format(i % 50)),
+        ('email', 'info{}@impresa.it'.format(i % 50)), ('tax_code', '0123456789{}'.format(i % 10)),
+        ('logo', 'https://back.edilcloud.io/media/public/company/{}/logo.png'.format(i % 50)),
+        ('color_project', '#ffa000'),
+    ])
+
+
+def profile_payload(i):
+    return OrderedDict([
+        ('id', i % 200), ('first_name', 'Mario'), ('last_name', 'Rossi àèìòù'),
+        ('photo', 'https://back.edilcloud.io/media/public/profile/{}/photo.jpg'.format(i % 200)),
+        ('position', 'Capocantiere'), ('role', 'o'), ('company', company_payload(i)),
+    ])
+
+
+def project_payload(i):
+    return OrderedDict([
+        ('id', i), ('name', 'Cantiere via Roma {}'.format(i)),
+        ('description', 'Ristrutturazione completa dello stabile ' * 3),
+        ('date_start', '2021-01-{:02d}'.format(i % 28 + 1)), ('date_end', '2021-12-{:02d}'.format(i % 28 + 1)),
+        ('status', 1), ('completed', decimal.Decimal('42.50')), ('typology', 'residenziale'),
+        ('tags', ['edilizia', 'ristrutturazione']), ('company', company_payload(i)),
+        ('profile', profile_payload(i)), ('messages_count', i % 300),
+        ('last_message_created', datetime.datetime(2021, 6, 1, 12, 30, 15, tzinfo=datetime.timezone.utc)),
+    ])
+
+
+def task_payload(i):
+    return OrderedDict([
+        ('id', i), ('project', OrderedDict([('id', i % 20), ('name', 'Cantiere {}'.format(i % 20))])),
+        ('name', 'Getto solaio piano {}'.format(i % 10)), ('assigned_company', company_payload(i)),
+        ('date_start', '2021-03-{:02d}'.format(i % 28 + 1)), ('date_end', '2021-04-{:02d}'.format(i % 28 + 1)),
+        ('date_completed', None), ('progress', i % 100), ('status', 1), ('alert', i % 7 == 0),
+        ('starred', False), ('note', 'Verificare armature'),
+        ('activities', [OrderedDict([
+            ('id', i * 10 + j), ('title', 'Attività {}'.format(j)), ('status', 'to-do'),
+            ('datetime_start', datetime.date(2021, 3, j + 1)), ('datetime_end', datetime.date(2021, 3, j + 2)),
+            ('workers', [profile_payload(i + j)]),
+        ]) for j in range(3)]),
+    ])
+
+
+def message_payload(i):
+    return OrderedDict([
+        ('id', i), ('body', 'Messaggio di cantiere numero {}   con allegati'.format(i)),
+        ('talk', OrderedDict([('id', i % 30), ('code', 'talk-{}'.format(i % 30)),
+                              ('content_type_name', 'project'), ('object_id', i % 30)])),
+        ('sender', profile_payload(i)), ('date_create', '2021-05-01T10:{:02d}:00Z'.format(i % 60)),
+        ('files', [OrderedDict([
+            ('id', i), ('name', 'foto.jpg'), ('size', 204800), ('extension', '.jpg'),
+            ('url', 'https://back.edilcloud.io/media/private/message/{}/foto.jpg'.format(i)),
+        ])]),
+        ('unique_code', 'c0ffee{}'.format(i)),
+    ])
+
+
+PAYLOADS = OrderedDict([
+    ('project', project_payload),
+    ('task', task_payload),
+    ('message', message_payload),
+])
+
+
+class Command(BaseCommand):
+    help = 'Render representative project/task/message lists with the rest framework ' \
+           'JSONRenderer, the FastJSONRenderer and the StreamingJSONRenderer and compare ' \
+           'the throughput and the peak memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--items', dest='items', type=int, default=5000,
+                            help='Items of each list')
+        parser.add_argument('-r', '--repeat', dest='repeat', type=int, default=3,
+                            help='Renders per renderer, the best time is reported')
+        parser.add_argument('-p', '--payload', dest='payloads', action='append', choices=list(PAYLOADS),
+                            help='Payloads to render, all by default')
+
+    def measure(self, render, repeat):
+        best = None
+        for i in range(repeat):
+            start = time.time()
+            size = render()
+            elapsed = time.time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        tracemalloc.start()
+        render()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return best, size, peak
+
+    def handle(self, *args, **options):
+        items = options['items']
+        repeat = options['repeat']
+        self.stdout.write('json backend: {}'.format(
+            'orjson' if get_json_dumps() is not None else 'rest framework encoder'
+        ))
+        for name in options['payloads'] or list(PAYLOADS):
+            data = [PAYLOADS[name](i) for i in range(items)]
+            renderers = OrderedDict([
+                ('JSONRenderer', lambda: len(JSONRenderer().render(data))),
+                ('FastJSONRenderer', lambda: len(FastJSONRenderer().render(data))),
+                # the chunks are dropped once sent, as by the streaming response
+                ('StreamingJSONRenderer', lambda: sum(len(chunk) for chunk in
+                                                      StreamingJSONRenderer().render_stream(iter(data)))),
+            ])
+            same = JSONRenderer().render(data) == FastJSONRenderer().render(data) == \
+                b''.join(StreamingJSONRenderer().render_stream(iter(data)))
+            self.stdout.write('{}: {} items, identical output: {}'.format(name, items, 'yes' if same else 'NO'))
+            for label, render in renderers.items():
+                elapsed, size, peak = self.measure(render, repeat)
+                elapsed = max(elapsed, 1e-6)
+                self.stdout.write('  {:<22} {:>9.1f} ms {:>9.0f} items/s {:>8.1f} MB/s  peak {:>9.1f} KB'.format(
+                    label, elapsed * 1000, items / elapsed, size / elapsed / 1024 / 1024, peak / 1024.
+                ))
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from apps.project.models import Project, Task
+from apps.project.utils import (
+    get_project_completion_annotations, get_shared_task_completion_annotations, update_task_completion
+)
+
+
+class Command(BaseCommand):
+    help = 'Compare the stored completion aggregates of the projects and of the shared tasks ' \
+           'with the ones computed in SQL from the tasks and repair the differing rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-p', '--project', dest='projects', type=int, action='append',
+                            help='Project to repair, all by default')
+        parser.add_argument('-c', '--check', dest='check', action='store_true', default=False,
+                            help='List the differing rows without repairing them')
+
+    def get_differing(self, queryset, annotations):
+        expected = {'expected_{}'.format(name): value for name, value in annotations.items()}
+        differing = Q()
+        for name in annotations:
+            differing |= ~Q(**{name: F('expected_{}'.format(name))})
+        return queryset.annotate(**expected).filter(differing)
+
+    def handle(self, *args, **options):
+        start = time.time()
+        projects = Project.objects.all()
+        tasks = Task.objects.all()
+        if options['projects']:
+            projects = projects.filter(id__in=options['projects'])
+            tasks = tasks.filter(project__in=options['projects'])
+
+        differing_projects = list(self.get_differing(
+            projects, get_project_completion_annotations()
+        ).values_list('id', flat=True))
+        differing_tasks = list(self.get_differing(
+            tasks, get_shared_task_completion_annotations()
+        ).values_list('id', flat=True))
+        if options['check']:
+            for project_id in differing_projects:
+                self.stdout.write('project {} differs'.format(project_id))
+            for task_id in differing_tasks:
+                self.stdout.write('shared task {} differs'.format(task_id))
+        else:
+            update_task_completion(
+                projects=Project.objects.filter(id__in=differing_projects),
+                tasks=Task.objects.filter(id__in=differing_tasks),
+            )
+        self.stdout.write('{} projects, {} shared tasks {} in {:.1f}s'.format(
+            len(differing_projects), len(differing_tasks),
+            'differing' if options['check'] else 'repaired', time.time() - start
+        ))
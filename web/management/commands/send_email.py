@@ -8,7 +8,7 @@ import datetime
 
 from django.core.management.base import BaseCommand
 
-from apps.notify import models as notify_models
+from apps.notify.digest import EmailDigestSender, get_pending_emails
 
 
 class Command(BaseCommand):
@@ -17,7 +17,7 @@ class Command(BaseCommand):
     _script = os.path.basename(__file__).split('.')[0]
 
     def add_arguments(self, parser):
-        # email limit per process
+        # email (digest) limit per process
         parser.add_argument('-l', '--limit', dest='limit', default=100,
                     help='Limit Messages'),
 
@@ -61,12 +61,12 @@ class Command(BaseCommand):
         self.check_is_running()
         self.lock()
         try:
-            notify_recipients = notify_models.NotificationRecipient.objects.filter(
-                    is_email=True, is_email_sent=False
-                ).order_by('-id')[:limit]
-            for notify_recipient in notify_recipients:
-                if not dry_run:
-                    notify_recipient.send_notify_email()
+            if dry_run:
+                recipients = get_pending_emails().values('recipient_id').distinct().count()
+                self.stdout.write('{} pending digests'.format(recipients))
+            else:
+                emails, rows = EmailDigestSender().send(limit=limit)
+                self.stdout.write('sent {} digests of {} notifications'.format(emails, rows))
         except Exception as e:
             print(e)
         finally:
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.notify.digest import EmailDigestSender
+
+
+class Command(BaseCommand):
+    help = 'Send the pending notification emails as one digest per recipient'
+
+    def add_arguments(self, parser):
+        # measure the throughput without delivering anything
+        parser.add_argument('--locmem', dest='locmem', action='store_true', default=False,
+                            help='Use the locmem email backend in a rolled back transaction, '
+                                 'the rows stay pending')
+
+    def send(self, connection=None):
+        start = time.time()
+        emails, rows = EmailDigestSender(connection).send()
+        elapsed = time.time() - start
+        self.stdout.write('{} notifications sent in {} emails in {:.3f}s ({:.1f} notifications/s)'.format(
+            rows, emails, elapsed, rows / elapsed if elapsed else 0
+        ))
+
+    def handle(self, *args, **options):
+        if not options.get('locmem'):
+            self.send()
+            return
+        with transaction.atomic():
+            self.send(get_connection('django.core.mail.backends.locmem.EmailBackend'))
+            transaction.set_rollback(True)
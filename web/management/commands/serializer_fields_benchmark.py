@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import datetime
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.profile.models import Profile
+from apps.project.api.frontend.views.tracker_views import TrackerGanttProjectTaskListView
+from apps.project.models import Activity, Project, Task
+from web.api import serializers as api_serializers
+
+
+class Command(BaseCommand):
+    help = 'Create N synthetic tasks in a rolled back transaction and measure the ' \
+           'Gantt task list response (TaskSerializer many=True) with and without ' \
+           'the compiled fields cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-t', '--tasks', dest='tasks', type=int, default=500,
+                            help='Synthetic tasks of the response')
+        parser.add_argument('-a', '--activities', dest='activities', type=int, default=2,
+                            help='Activities per task, with one worker each')
+        parser.add_argument('-r', '--runs', dest='runs', type=int, default=3,
+                            help='Responses serialized per mode, the best one is reported')
+
+    def create_tasks(self, project, profile, tasks, activities):
+        user = profile.user
+        date_start = datetime.date.today()
+        date_end = date_start + datetime.timedelta(days=30)
+        created = Task.objects.bulk_create([
+            Task(
+                project=project, assigned_company=profile.company, name='benchmark task {}'.format(i),
+                date_start=date_start, date_end=date_end, creator=user, last_modifier=user
+            ) for i in range(tasks)
+        ])
+        created_activities = Activity.objects.bulk_create([
+            Activity(
+                task=task, title='benchmark activity {}'.format(i),
+                datetime_start=date_start, datetime_end=date_end, creator=user, last_modifier=user
+            ) for task in created for i in range(activities)
+        ])
+        Activity.workers.through.objects.bulk_create([
+            Activity.workers.through(activity_id=activity.id, profile_id=profile.id)
+            for activity in created_activities
+        ])
+        return [task.id for task in created]
+
+    def get_view(self, project, profile):
+        request = Request(APIRequestFactory().get('/'))
+        request.user = profile.user
+        request.profile = profile
+        view = TrackerGanttProjectTaskListView()
+        view.request = request
+        view.kwargs = {'pk': project.id}
+        view.format_kwarg = None
+        return view
+
+    def run(self, view, task_ids):
+        # the rows are read before the timing, only the serialization is measured
+        tasks = list(view.apply_prefetch_plan(Task.objects.filter(id__in=task_ids)))
+        start = time.time()
+        view.get_serializer(tasks, many=True).data
+        return (time.time() - start) * 1000
+
+    def handle(self, *args, **options):
+        profile = Profile.objects.filter(
+            user__isnull=False, company__isnull=False, role=settings.OWNER
+        ).first()
+        project = Project.objects.filter(company=profile.company).first() if profile else None
+        if project is None:
+            raise CommandError('A profile with a company project is required')
+
+        tasks = options['tasks']
+        with transaction.atomic():
+            task_ids = self.create_tasks(project, profile, tasks, options['activities'])
+            view = self.get_view(project, profile)
+            try:
+                for cache in (False, True):
+                    api_serializers.DynamicFieldsModelSerializer.cache_compiled_fields = cache
+                    api_serializers._compiled_fields.clear()
+                    elapsed = min(self.run(view, task_ids) for i in range(options['runs']))
+                    self.stdout.write('{:<8} {} tasks: {:>9.1f} ms ({:.3f} ms per task)'.format(
+                        'cached' if cache else 'uncached', tasks, elapsed, elapsed / tasks
+                    ))
+            finally:
+                api_serializers.DynamicFieldsModelSerializer.cache_compiled_fields = True
+            transaction.set_rollback(True)
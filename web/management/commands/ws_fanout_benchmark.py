@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import asyncio
+import random
+import time
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from channels.layers import InMemoryChannelLayer
+from channels.testing import WebsocketCommunicator
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework_jwt.settings import api_settings
+
+from apps.notify.signals import event_triger
+from apps.profile.models import Profile
+from apps.user.views import custom_jwt_payload_handler
+
+LEGACY_GROUP_NAME = 'notify_notify_channel'
+RECEIVE_TIMEOUT = 5
+
+jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
+
+
+class Command(BaseCommand):
+    help = 'Open N notify websockets and measure the per-event fan-out of the ' \
+           'per-profile groups, compared with a simulated global notify group'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-c', '--connections', dest='connections', type=int, default=1000,
+                            help='Websocket connections (one active profile each)')
+        parser.add_argument('-e', '--events', dest='events', type=int, default=200,
+                            help='Events to send')
+        parser.add_argument('-r', '--recipients', dest='recipients', type=int, default=5,
+                            help='Recipients per event')
+
+    def get_dests(self, profile_ids, events, recipients):
+        rnd = random.Random(0)
+        return [rnd.sample(profile_ids, min(recipients, len(profile_ids))) for i in range(events)]
+
+    async def run_legacy(self, profile_ids, dests):
+        """
+        Deliveries of the events sent to a single group joined by every
+        connection, on the bare in-memory layer
+        """
+        sent = sum(len(event_dests) for event_dests in dests)
+        layer = InMemoryChannelLayer(capacity=sent + 1)
+        channels = []
+        for profile_id in profile_ids:
+            channel_name = await layer.new_channel()
+            channels.append(channel_name)
+            await layer.group_add(LEGACY_GROUP_NAME, channel_name)
+
+        start = time.time()
+        for i, event_dests in enumerate(dests):
+            for dest in event_dests:
+                await layer.group_send(LEGACY_GROUP_NAME, {
+                    'type': 'notify_message', 'message': {'dest': {'id': dest}, 'id': i}
+                })
+        elapsed = time.time() - start
+
+        delivered = 0
+        for channel_name in channels:
+            queue = layer.channels.get(channel_name)
+            delivered += queue.qsize() if queue else 0
+        await layer.flush()
+        return delivered, delivered - sent, elapsed
+
+    async def run_consumers(self, profiles, dests):
+        """
+        Deliveries of the events sent with the notify event_triger to
+        NotifyConsumer connections authenticated by their JWT
+        """
+        from web.routing import application
+
+        communicators = {}
+        for profile in profiles:
+            token = jwt_encode_handler(custom_jwt_payload_handler(profile.user, {'profile': {'id': profile.id}}))
+            communicator = WebsocketCommunicator(
+                application, '/ws/notify/{}/?token={}'.format(profile.id, token)
+            )
+            connected, subprotocol = await communicator.connect()
+            if not connected:
+                raise RuntimeError('profile {} not connected'.format(profile.id))
+            communicators[profile.id] = communicator
+
+        send = sync_to_async(event_triger)
+        expected = Counter(dest for event_dests in dests for dest in event_dests)
+        start = time.time()
+        for i, event_dests in enumerate(dests):
+            for dest in event_dests:
+                await send({'dest': {'id': dest}, 'id': i}, dest)
+        delivered = 0
+        for profile_id, count in expected.items():
+            for i in range(count):
+                await communicators[profile_id].receive_from(timeout=RECEIVE_TIMEOUT)
+                delivered += 1
+        elapsed = time.time() - start
+
+        # events delivered to a connection that is not their recipient
+        unexpected = 0
+        for communicator in communicators.values():
+            while not await communicator.receive_nothing():
+                await communicator.receive_from()
+                unexpected += 1
+            await communicator.disconnect()
+        return delivered, unexpected, elapsed
+
+    def handle(self, *args, **options):
+        events = options['events']
+        recipients = options['recipients']
+        profiles = list(
+            Profile.objects.filter(status=1, user__isnull=False).select_related('user').order_by('id')[
+                :options['connections']
+            ]
+        )
+        if not profiles:
+            self.stdout.write('no active profiles')
+            return
+        profile_ids = [profile.id for profile in profiles]
+        dests = self.get_dests(profile_ids, events, recipients)
+
+        layers = {'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+            'CONFIG': {'capacity': events + 1},
+        }}
+        loop = asyncio.new_event_loop()
+        try:
+            with override_settings(CHANNEL_LAYERS=layers):
+                results = (
+                    ('global group (simulated)', loop.run_until_complete(self.run_legacy(profile_ids, dests))),
+                    ('per-profile groups', loop.run_until_complete(self.run_consumers(profiles, dests))),
+                )
+        finally:
+            loop.close()
+        for label, (delivered, unexpected, elapsed) in results:
+            self.stdout.write(
+                '{}: {} connections, {} events x {} recipients -> {} deliveries '
+                '({:.1f} per event, {} to other profiles) in {:.3f}s'.format(
+                    label, len(profiles), events, recipients, delivered,
+                    float(delivered) / events, unexpected, elapsed
+                )
+            )
@@ -1,10 +1,10 @@
-from channels.auth import AuthMiddlewareStack
 from channels.routing import ProtocolTypeRouter, URLRouter
 import apps.ws.routing
+from apps.ws.middleware import JWTAuthMiddlewareStack
 
 application = ProtocolTypeRouter({
     # (http->django views is added by default)
-    'websocket': AuthMiddlewareStack(
+    'websocket': JWTAuthMiddlewareStack(
         URLRouter(
             apps.ws.routing.websocket_urlpatterns
         )
@@ -90,12 +90,28 @@ CHANNEL_LAYERS = {
 }
 
 CELERY_BROKER_URL = 'redis://redis:6379/0'
-CELERY_IMPORTS = ['web.tasks', ]
+CELERY_IMPORTS = ['web.tasks', 'apps.notify.tasks', ]
 CELERY_BEAT_SCHEDULE = {
     'printHello': {
         'task': 'web.tasks.archived_projects_reminder',
         'schedule': datetime.timedelta(days=1),
     },
+    'notifyEvents': {
+        'task': 'apps.notify.tasks.process_notify_events',
+        'schedule': datetime.timedelta(minutes=1),
+    },
+    'pushRetries': {
+        'task': 'apps.notify.tasks.retry_push_notifications',
+        'schedule': datetime.timedelta(minutes=1),
+    },
+    'emailDigests': {
+        'task': 'apps.notify.tasks.send_email_digests',
+        'schedule': datetime.timedelta(minutes=15),
+    },
+    'notificationsArchive': {
+        'task': 'apps.notify.tasks.archive_notifications',
+        'schedule': datetime.timedelta(days=1),
+    },
 }
 
 MIDDLEWARE = [
@@ -171,6 +187,16 @@ STATICFILES_DIRS = [
 ]
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+# base of the absolute media urls (e.g. a CDN), the request host if empty
+MEDIA_BASE_URL = os.environ.get('MEDIA_BASE_URL', '')
+# base of the absolute media urls built outside a request (workers, signals)
+MEDIA_DEFAULT_BASE_URL = os.environ.get('MEDIA_DEFAULT_BASE_URL', 'https://back.edilcloud.io')
+MEDIA_PRIVATE_URL = '/media/private/'
+# sign the private media urls, served by web.views.protected_media
+MEDIA_SIGNED_URLS = False
+MEDIA_SIGNED_URL_MAX_AGE = 60 * 60 * 24
+# internal nginx location of the private media (X-Accel-Redirect)
+MEDIA_PRIVATE_ACCEL_REDIRECT = '/protected/'
 
 LOGGING = {
     'version': 1,
@@ -267,8 +293,12 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'web.api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_jwt.authentication.JSONWebTokenAuthentication',
+        'web.api.authentication.ProfileJSONWebTokenAuthentication',
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
@@ -276,6 +306,15 @@ REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'web.drf.exceptions.whistle_exception_handler'
 }
 REST_FRAMEWORK_PAGE_SIZE_QUERY_PARAM = 'per_page'
+# json encoder of the FastJSONRenderer: orjson (python >= 3.6) or json,
+# the rest framework encoder, also used when orjson is not installed
+API_JSON_BACKEND = os.environ.get('API_JSON_BACKEND', 'orjson')
+# no_page lists: streamed serializing API_NO_PAGE_CHUNK_SIZE objects at a time,
+# refused over API_NO_PAGE_MAX_ITEMS objects (see QuerysetMixin.no_page_max_items)
+API_NO_PAGE_CHUNK_SIZE = 200
+API_NO_PAGE_MAX_ITEMS = int(os.environ.get('API_NO_PAGE_MAX_ITEMS', 10000))
+# QuerysetMixin lists slower than this are logged with their filter params
+API_SLOW_LIST_MS = int(os.environ.get('API_SLOW_LIST_MS', 500))
 
 REST_AUTH_SERIALIZERS = {
     # "PASSWORD_RESET_SERIALIZER": "web.serializers.PasswordResetSerializer",
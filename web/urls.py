@@ -7,7 +7,8 @@ from django.contrib import admin
 from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import path
 
-from web.views import FacebookLogin, GoogleLogin, FacebookRegister, GoogleRegister, AppleLogin, AppleRegister
+from web.views import FacebookLogin, GoogleLogin, FacebookRegister, GoogleRegister, AppleLogin, AppleRegister, \
+    protected_media
 
 urlpatterns = [
     # API DOCUMENTATION
@@ -48,6 +49,12 @@ urlpatterns = [
     url('ws/', include('apps.ws.urls')),
 ]
 
+if settings.MEDIA_SIGNED_URLS:
+    # PRIVATE MEDIA
+    urlpatterns += [
+        url(r'^{}(?P<path>.*)$'.format(settings.MEDIA_PRIVATE_URL.lstrip('/')), protected_media),
+    ]
+
 if settings.DEBUG:
     # ON DEBUG
 
@@ -22,16 +22,16 @@ def get_media_size(current_profile, validated_data):
     # existing files
     all_company_photo = current_profile.list_photos()
     for photo in all_company_photo:
-        total_size += photo.photo.size
-        photo_size += photo.photo.size
+        total_size += photo.file_size or 0
+        photo_size += photo.file_size or 0
     all_company_video = current_profile.list_videos()
     for video in all_company_video:
-        total_size += video.video.size
-        video_size += video.video.size
+        total_size += video.file_size or 0
+        video_size += video.file_size or 0
     all_company_document = current_profile.list_documents()
     for document in all_company_document:
-        total_size += document.document.size
-        document_size += document.document.size
+        total_size += document.file_size or 0
+        document_size += document.file_size or 0
 
     # new file
     if 'photo' in validated_data:
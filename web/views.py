@@ -14,7 +14,10 @@ from os.path import splitext, basename
 from urllib.error import HTTPError
 from urllib.parse import urlparse
 from urllib.request import urlopen
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
 from django.utils.translation import ugettext_lazy as _
+from django.views.static import serve
 from allauth.socialaccount.models import SocialApp
 from allauth.socialaccount.helpers import complete_social_login
 from allauth.socialaccount.providers.linkedin_oauth2.views import LinkedInOAuth2Adapter
@@ -39,6 +42,7 @@ from social_django.utils import load_backend, load_strategy
 
 from apps.user.api.frontend.serializers import jwt_encode_handler, jwt_payload_handler, User
 from apps.user.views import custom_jwt_response_payload_handler
+from web.core.media_urls import check_media_url_signature
 
 
 class AppleIdAuth(BaseOAuth2):
@@ -371,4 +375,20 @@ class AppleLogin(SocialLoginView):
 
 
 class AppleRegister(SocialRegisterView):
-    adapter_class = AppleOAuth2Adapter
\ No newline at end of file
+    adapter_class = AppleOAuth2Adapter
+
+
+def protected_media(request, path):
+    """
+    Serve a private media file if the url signature is valid, through
+    nginx (X-Accel-Redirect) or directly in DEBUG
+    """
+    url = '{}{}'.format(settings.MEDIA_PRIVATE_URL, path)
+    if not check_media_url_signature(url, request.GET.get('signature', '')):
+        return HttpResponseForbidden()
+    if settings.DEBUG:
+        return serve(request, url[len(settings.MEDIA_URL):], document_root=settings.MEDIA_ROOT)
+    response = HttpResponse()
+    response['Content-Type'] = ''
+    response['X-Accel-Redirect'] = '{}{}'.format(settings.MEDIA_PRIVATE_ACCEL_REDIRECT, path)
+    return response